@@ -1,3 +1,3 @@
 #!/bin/bash
 alembic upgrade head
-exec uvicorn main.web:app --host 0.0.0.0 --port 8000 --log-level debug
+exec uvicorn main.web:app --host 0.0.0.0 --port 8000 --log-level info
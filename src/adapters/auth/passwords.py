@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+from application.common.passwords import AsyncPasswordHasher, PasswordHasher
+from domain.exceptions.auth import PasswordHashingBusyError
+
+ResultT = TypeVar("ResultT")
+
+# what application/common/passwords.py used to store: unsalted sha256 hex
+_LEGACY_SHA256 = re.compile(r"[0-9a-f]{64}")
+
+
+@dataclass(frozen=True)
+class PasswordConfig:
+    # scrypt cost: N = 2**log_n, memory is 128 * N * r bytes (16 MiB by default)
+    scrypt_log_n: int = 14
+    scrypt_r: int = 8
+    scrypt_p: int = 1
+    salt_bytes: int = 16
+    key_bytes: int = 32
+    # dedicated KDF threads and how many hashes may wait for one
+    kdf_workers: int = 2
+    kdf_max_queue: int = 8
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+@dataclass(frozen=True)
+class _ScryptHash:
+    log_n: int
+    r: int
+    p: int
+    salt: bytes
+    key: bytes
+
+
+def _parse(password_hash: str) -> _ScryptHash | None:
+    # scrypt$ln=14,r=8,p=1$<salt>$<key>
+    try:
+        scheme, params, salt, key = password_hash.split("$")
+        if scheme != "scrypt":
+            return None
+        values = dict(item.split("=", 1) for item in params.split(","))
+        return _ScryptHash(
+            log_n=int(values["ln"]),
+            r=int(values["r"]),
+            p=int(values["p"]),
+            salt=_b64decode(salt),
+            key=_b64decode(key),
+        )
+    except (ValueError, KeyError):
+        return None
+
+
+class ScryptPasswordHasher(PasswordHasher):
+    """
+    hashlib.scrypt with the parameters stored in every hash, so they can
+    be raised later without invalidating existing passwords. Legacy
+    SHA-256 hashes still verify and are reported by needs_rehash().
+    """
+
+    def __init__(self, config: PasswordConfig = PasswordConfig()):
+        self.config = config
+
+    def hash(self, password: str) -> str:
+        c = self.config
+        salt = os.urandom(c.salt_bytes)
+        key = self._derive(password, salt, c.scrypt_log_n, c.scrypt_r, c.scrypt_p, c.key_bytes)
+        return f"scrypt$ln={c.scrypt_log_n},r={c.scrypt_r},p={c.scrypt_p}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        if _LEGACY_SHA256.fullmatch(password_hash):
+            legacy = hashlib.sha256(password.encode("utf-8")).hexdigest()
+            return hmac.compare_digest(legacy, password_hash)
+
+        parsed = _parse(password_hash)
+        if parsed is None:
+            return False
+        key = self._derive(password, parsed.salt, parsed.log_n, parsed.r, parsed.p, len(parsed.key))
+        return hmac.compare_digest(key, parsed.key)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        parsed = _parse(password_hash)
+        c = self.config
+        return parsed is None or (parsed.log_n, parsed.r, parsed.p, len(parsed.key)) != (
+            c.scrypt_log_n, c.scrypt_r, c.scrypt_p, c.key_bytes,
+        )
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, log_n: int, r: int, p: int, key_bytes: int) -> bytes:
+        n = 2 ** log_n
+        return hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt, n=n, r=r, p=p, dklen=key_bytes,
+            maxmem=256 * n * r,
+        )
+
+
+class KdfExecutor:
+    """
+    A few dedicated threads for key derivation, apart from the request
+    thread pool (hashlib.scrypt releases the GIL). Work beyond
+    `max_queue` waiting hashes is refused at once instead of queueing
+    behind a login storm.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kdf")
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.rejected = 0
+
+    def submit(self, fn: Callable[..., ResultT], *args) -> Future[ResultT]:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHashingBusyError("Too many sign-ins at once, please try again.")
+            self._pending += 1
+        future = self._executor.submit(fn, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, _: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "pending": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class OffloadedPasswordHasher(PasswordHasher):
+    """Blocking facade for sync interactors: waits for the KDF thread."""
+
+    def __init__(self, hasher: PasswordHasher, executor: KdfExecutor):
+        self.hasher = hasher
+        self.executor = executor
+
+    def hash(self, password: str) -> str:
+        return self.executor.submit(self.hasher.hash, password).result()
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self.executor.submit(self.hasher.verify, password, password_hash).result()
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return self.hasher.needs_rehash(password_hash)
+
+
+class AsyncOffloadedPasswordHasher(AsyncPasswordHasher):
+    """Awaits the KDF thread without holding the event loop or a request thread."""
+
+    def __init__(self, hasher: PasswordHasher, executor: KdfExecutor):
+        self.hasher = hasher
+        self.executor = executor
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self.executor.submit(self.hasher.hash, password))
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await asyncio.wrap_future(
+            self.executor.submit(self.hasher.verify, password, password_hash),
+        )
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return self.hasher.needs_rehash(password_hash)
@@ -1,13 +1,40 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 
-from application.common.id_provider import IdProvider
-from application.common.session_gateway import SessionReader
+from application.common.id_provider import AsyncUserProvider, IdProvider, UserProvider
+from application.common.session_gateway import (
+    AsyncSessionUserReader, SessionReader, SessionUserReader,
+)
 from domain.exceptions.auth import AuthenticationError
+from domain.models.session import Session
+from domain.models.user import User
 from domain.models.user_id import UserId
 
 
+def _utcnow_like(value: datetime) -> datetime:
+    # timestamptz columns load tz-aware on Postgres and naive on SQLite;
+    # comparing an aware value with naive utcnow() raises TypeError
+    if value.tzinfo is not None:
+        return datetime.now(timezone.utc)
+    return datetime.utcnow()
+
+
+def validate_session(session: Session | None) -> Session:
+    if not session:
+        raise AuthenticationError("Session not found.")
+    if session.revoked_at is not None:
+        raise AuthenticationError("Session revoked.")
+    expires_at = session.expires_at
+    if expires_at is not None and expires_at <= _utcnow_like(expires_at):
+        raise AuthenticationError("Session expired.")
+
+    if session.user_id is None:
+        raise AuthenticationError("Session is not bound to a user.")
+
+    return session
+
+
 class SessionIdProvider(IdProvider):
     def __init__(
         self,
@@ -21,15 +48,71 @@ class SessionIdProvider(IdProvider):
         if not self.session_key:
             raise AuthenticationError("Missing session key.")
 
-        session = self.session_gateway.get_session_by_key(self.session_key)
-        if not session:
-            raise AuthenticationError("Session not found.")
-        if session.revoked_at is not None:
-            raise AuthenticationError("Session revoked.")
-        if session.expires_at is not None and session.expires_at <= datetime.utcnow():
-            raise AuthenticationError("Session expired.")
+        session = validate_session(
+            self.session_gateway.get_session_by_key(self.session_key)
+        )
+        return UserId(int(session.user_id))
+
 
-        if session.user_id is None:
-            raise AuthenticationError("Session is not bound to a user.")
+class SessionUserProvider(UserProvider):
+    """
+    Resolves session -> user + student profile with a single query.
+    The result is memoized, so one instance per request hits the DB once.
+    """
 
-        return UserId(int(session.user_id))
+    def __init__(
+        self,
+        session_gateway: SessionUserReader,
+        session_key: str | None,
+    ):
+        self.session_gateway = session_gateway
+        self.session_key = session_key
+        self._user: User | None = None
+
+    def get_current_user(self) -> User:
+        if self._user is not None:
+            return self._user
+        if not self.session_key:
+            raise AuthenticationError("Missing session key.")
+
+        session = validate_session(
+            self.session_gateway.get_session_with_user(self.session_key)
+        )
+        if session.user is None:
+            raise AuthenticationError("User not found.")
+
+        self._user = session.user
+        return self._user
+
+    def get_current_user_id(self) -> UserId:
+        return UserId(int(self.get_current_user().id))
+
+
+class AsyncSessionUserProvider(AsyncUserProvider):
+    def __init__(
+        self,
+        session_gateway: AsyncSessionUserReader,
+        session_key: str | None,
+    ):
+        self.session_gateway = session_gateway
+        self.session_key = session_key
+        self._user: User | None = None
+
+    async def get_current_user(self) -> User:
+        if self._user is not None:
+            return self._user
+        if not self.session_key:
+            raise AuthenticationError("Missing session key.")
+
+        session = validate_session(
+            await self.session_gateway.get_session_with_user(self.session_key)
+        )
+        if session.user is None:
+            raise AuthenticationError("User not found.")
+
+        self._user = session.user
+        return self._user
+
+    async def get_current_user_id(self) -> UserId:
+        user = await self.get_current_user()
+        return UserId(int(user.id))
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from anyio import to_thread
+
+from application.common.id_provider import AsyncUserProvider, UserProvider
+from domain.models.user import User
+from domain.models.user_id import UserId
+
+
+class ThreadedUserProvider(AsyncUserProvider):
+    """
+    Exposes a blocking UserProvider to async code by running it in the
+    worker thread pool. Used when the sync database stack is selected.
+    """
+
+    def __init__(self, user_provider: UserProvider):
+        self.user_provider = user_provider
+
+    async def get_current_user(self) -> User:
+        return await to_thread.run_sync(self.user_provider.get_current_user)
+
+    async def get_current_user_id(self) -> UserId:
+        return await to_thread.run_sync(self.user_provider.get_current_user_id)
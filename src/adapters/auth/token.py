@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Literal
+from typing import Callable, Literal
 
 from jose import JWTError, jwt
 
-from application.common.id_provider import IdProvider
+from application.common.access_token import AccessClaims, AccessTokenIssuer
+from application.common.id_provider import AsyncUserProvider, IdProvider
 from domain.exceptions.auth import AuthenticationError
+from domain.models.enums import UserRole
+from domain.models.user import User
 from domain.models.user_id import UserId
 
 Algorithm = Literal[
@@ -15,7 +18,7 @@ Algorithm = Literal[
 ]
 
 
-class JwtTokenProcessor:
+class JwtTokenProcessor(AccessTokenIssuer):
     def __init__(
         self,
         secret: str,
@@ -37,19 +40,47 @@ class JwtTokenProcessor:
             to_encode, self.secret, algorithm=self.algorithm,
         )
 
-    def validate_token(self, token: str) -> UserId:
+    def issue_access_token(self, claims: AccessClaims) -> str:
+        to_encode = {
+            "sub": str(int(claims.user_id)),
+            "role": claims.role.value,
+            "email": claims.email,
+            "name": claims.full_name,
+            "grade": claims.grade,
+            "exp": datetime.utcnow() + self.expires,
+        }
+        return jwt.encode(
+            to_encode, self.secret, algorithm=self.algorithm,
+        )
+
+    def _decode(self, token: str) -> dict:
         try:
-            payload = jwt.decode(
+            return jwt.decode(
                 token, self.secret, algorithms=[self.algorithm],
             )
         except JWTError as exc:
             raise AuthenticationError("Invalid token.") from exc
 
+    def validate_token(self, token: str) -> UserId:
+        payload = self._decode(token)
         try:
             return UserId(int(payload["sub"]))
         except (KeyError, ValueError) as exc:
             raise AuthenticationError("Invalid token payload.") from exc
 
+    def validate_access_token(self, token: str) -> AccessClaims:
+        payload = self._decode(token)
+        try:
+            return AccessClaims(
+                user_id=UserId(int(payload["sub"])),
+                role=UserRole(payload["role"]),
+                email=payload["email"],
+                full_name=payload["name"],
+                grade=payload["grade"],
+            )
+        except (KeyError, ValueError) as exc:
+            raise AuthenticationError("Invalid token payload.") from exc
+
 
 class TokenIdProvider(IdProvider):
     def __init__(
@@ -64,3 +95,45 @@ class TokenIdProvider(IdProvider):
         if not self.token:
             raise AuthenticationError("Missing token.")
         return self.token_processor.validate_token(self.token)
+
+
+class TokenUserProvider(AsyncUserProvider):
+    """
+    Hybrid authentication. A valid access token is trusted as is, with
+    no database access. Without one, the session provider resolves the
+    user; it checks the session row for expiry and revocation. The fresh
+    token is handed to `on_refresh` so the response can set it. A revoked
+    session therefore keeps working until its last token expires.
+    """
+
+    def __init__(
+        self,
+        token_processor: JwtTokenProcessor,
+        token: str | None,
+        session_user_provider: AsyncUserProvider,
+        on_refresh: Callable[[str], None],
+    ):
+        self.token_processor = token_processor
+        self.token = token
+        self.session_user_provider = session_user_provider
+        self.on_refresh = on_refresh
+        self._user: User | None = None
+
+    async def get_current_user(self) -> User:
+        if self._user is not None:
+            return self._user
+        if self.token:
+            try:
+                self._user = self.token_processor.validate_access_token(self.token).to_user()
+                return self._user
+            except AuthenticationError:
+                pass  # expired or forged: fall back to the session
+
+        user = await self.session_user_provider.get_current_user()
+        self.on_refresh(self.token_processor.issue_access_token(AccessClaims.of(user)))
+        self._user = user
+        return user
+
+    async def get_current_user_id(self) -> UserId:
+        user = await self.get_current_user()
+        return UserId(int(user.id))
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import math
+import threading
+from abc import abstractmethod
+from typing import Protocol
+
+from adapters.cache.lru import CacheStats, LruTtlCache
+from application.common.compiled_test import CompiledTest, CompiledTestReader
+
+
+class CompiledTestCache:
+    """
+    Process-local store of compiled published tests keyed by
+    (test_id, version).
+
+    Entries never expire: a published test only changes by getting a
+    new version, and storing the new version drops the old one. The LRU
+    bound keeps rarely used tests from piling up.
+    """
+
+    def __init__(self, max_size: int):
+        self._entries: LruTtlCache[tuple[int, int], CompiledTest] = LruTtlCache(
+            max_size=max_size,
+            ttl_seconds=math.inf,
+        )
+        # newest version seen per test
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, test_id: int, version: int) -> CompiledTest | None:
+        return self._entries.get((test_id, version))
+
+    def put(self, test: CompiledTest) -> None:
+        with self._lock:
+            current = self._versions.get(test.test_id)
+            if current is not None and current > test.version:
+                # loaded by a reader that raced a version bump
+                return
+            if current is not None and current != test.version:
+                self._entries.invalidate((test.test_id, current))
+            self._versions[test.test_id] = test.version
+            self._entries.set((test.test_id, test.version), test)
+
+    def invalidate(self, test_id: int) -> None:
+        with self._lock:
+            current = self._versions.pop(test_id, None)
+            if current is not None:
+                self._entries.invalidate((test_id, current))
+
+    def stats(self) -> CacheStats:
+        return self._entries.stats()
+
+
+class TestDbGateway(CompiledTestReader, Protocol):
+    @abstractmethod
+    def get_test_version(self, test_id: int) -> int | None:
+        raise NotImplementedError
+
+
+class CachedCompiledTestGateway(CompiledTestReader):
+    """
+    Read-through cache in front of the published test gateway. A hit
+    costs one primary-key lookup of the test's current version; the
+    question tables are only read on a miss.
+    """
+
+    def __init__(
+            self,
+            test_gateway: TestDbGateway,
+            cache: CompiledTestCache,
+    ):
+        self.test_gateway = test_gateway
+        self.cache = cache
+
+    def get_compiled_test(self, test_id: int) -> CompiledTest | None:
+        version = self.test_gateway.get_test_version(test_id)
+        if version is None:
+            self.cache.invalidate(test_id)
+            return None
+
+        test = self.cache.get(test_id, version)
+        if test is None:
+            test = self.test_gateway.get_compiled_test(test_id)
+            if test is not None:
+                self.cache.put(test)
+        return test
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+from adapters.cache.lru import CacheStats, LruTtlCache
+
+# (template name, user id, ..., content version)
+FragmentKey = tuple[Hashable, ...]
+
+
+@dataclass(frozen=True)
+class RenderStats:
+    renders: int
+    render_seconds: float
+    # hits times the mean render time of their template
+    saved_seconds: float
+
+
+class FragmentCache:
+    """
+    Rendered HTML fragments keyed by template, user and the version of
+    the content they show. A version bump makes the old key unreachable,
+    so entries never need invalidating; the LRU bound drops them.
+    """
+
+    def __init__(self, max_size: int):
+        self._entries: LruTtlCache[FragmentKey, str] = LruTtlCache(
+            max_size=max_size,
+            ttl_seconds=math.inf,
+        )
+        # template -> (renders, seconds spent rendering)
+        self._renders: dict[Hashable, tuple[int, float]] = {}
+        self._saved_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, key: FragmentKey) -> str | None:
+        html = self._entries.get(key)
+        if html is not None:
+            with self._lock:
+                renders, seconds = self._renders.get(key[0], (0, 0.0))
+                if renders:
+                    self._saved_seconds += seconds / renders
+        return html
+
+    def render(self, key: FragmentKey, render: Callable[[], str]) -> str:
+        started = time.perf_counter()
+        html = render()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            renders, seconds = self._renders.get(key[0], (0, 0.0))
+            self._renders[key[0]] = (renders + 1, seconds + elapsed)
+        self._entries.set(key, html)
+        return html
+
+    def stats(self) -> CacheStats:
+        return self._entries.stats()
+
+    def render_stats(self) -> RenderStats:
+        with self._lock:
+            return RenderStats(
+                renders=sum(n for n, _ in self._renders.values()),
+                render_seconds=sum(s for _, s in self._renders.values()),
+                saved_seconds=self._saved_seconds,
+            )
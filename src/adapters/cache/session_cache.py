@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Protocol
+
+from adapters.cache.lru import LruTtlCache
+from application.common.session_gateway import (
+    AsyncSessionReader, AsyncSessionRevoker, AsyncSessionUserReader,
+    SessionReader, SessionRevoker, SessionSaver, SessionUserReader,
+)
+from domain.models.session import Session
+
+SessionCache = LruTtlCache[str, Session]
+
+
+class SessionDbGateway(
+    SessionReader, SessionUserReader, SessionSaver, SessionRevoker, Protocol,
+):
+    pass
+
+
+class AsyncSessionDbGateway(
+    AsyncSessionReader, AsyncSessionUserReader, SessionSaver, AsyncSessionRevoker, Protocol,
+):
+    pass
+
+
+class CachedSessionGateway(SessionReader, SessionUserReader, SessionSaver, SessionRevoker):
+    """
+    Read-through cache in front of a session gateway.
+
+    Cached entries are sessions resolved with their user and profile,
+    so `expires_at`/`revoked_at` are still checked by the id provider on
+    every hit. Revocation through this gateway drops the entry; other
+    processes see it once their own entry's TTL runs out.
+    """
+
+    def __init__(
+            self,
+            session_gateway: SessionDbGateway,
+            cache: SessionCache,
+    ):
+        self.session_gateway = session_gateway
+        self.cache = cache
+
+    def get_session_by_key(self, session_key: str) -> Session | None:
+        return self.get_session_with_user(session_key)
+
+    def get_session_with_user(self, session_key: str) -> Session | None:
+        session = self.cache.get(session_key)
+        if session is not None:
+            return session
+
+        session = self.session_gateway.get_session_with_user(session_key)
+        if session is not None:
+            self.cache.set(session_key, session)
+        return session
+
+    def save_session(self, session: Session) -> None:
+        self.session_gateway.save_session(session)
+
+    def revoke_session(self, session_key: str, revoked_at: datetime) -> None:
+        self.cache.invalidate(session_key)
+        self.session_gateway.revoke_session(session_key, revoked_at)
+
+
+class AsyncCachedSessionGateway(
+    AsyncSessionReader, AsyncSessionUserReader, SessionSaver, AsyncSessionRevoker,
+):
+    def __init__(
+            self,
+            session_gateway: AsyncSessionDbGateway,
+            cache: SessionCache,
+    ):
+        self.session_gateway = session_gateway
+        self.cache = cache
+
+    async def get_session_by_key(self, session_key: str) -> Session | None:
+        return await self.get_session_with_user(session_key)
+
+    async def get_session_with_user(self, session_key: str) -> Session | None:
+        session = self.cache.get(session_key)
+        if session is not None:
+            return session
+
+        session = await self.session_gateway.get_session_with_user(session_key)
+        if session is not None:
+            self.cache.set(session_key, session)
+        return session
+
+    def save_session(self, session: Session) -> None:
+        self.session_gateway.save_session(session)
+
+    async def revoke_session(self, session_key: str, revoked_at: datetime) -> None:
+        self.cache.invalidate(session_key)
+        await self.session_gateway.revoke_session(session_key, revoked_at)
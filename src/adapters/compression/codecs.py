@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import gzip
+from dataclasses import dataclass
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+BROTLI_AVAILABLE = brotli is not None
+
+
+@dataclass(frozen=True)
+class CompressionLevels:
+    gzip_level: int = 6
+    # 4-5 is the usual sweet spot for per-response work; 11 is for build time
+    brotli_quality: int = 4
+
+
+def accepted_encodings(accept_encoding: str | None) -> set[str]:
+    """Content codings the client accepts; q=0 means refused."""
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.lower())
+    return accepted
+
+
+def preferred_encoding(accepted: set[str]) -> str | None:
+    if "br" in accepted and BROTLI_AVAILABLE:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(data: bytes, encoding: str, levels: CompressionLevels) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=levels.brotli_quality)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=levels.gzip_level, mtime=0)
+    raise ValueError(f"Unsupported encoding: {encoding}")
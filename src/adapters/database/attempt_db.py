@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import Sequence
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from adapters.database.loading import LoadProfile, loader_options
+from adapters.database.mappings import (
+    attempt_answers_table as answers_t,
+    attempt_selected_options_table as selected_t,
+    test_attempts_table as attempts_t,
+)
+from application.common.attempt_gateway import AttemptReader, GradeSaver, SubmittedAttemptReader
+from application.common.grading import GradingResult, SubmittedAnswer
+from domain.models.attempt import AttemptAnswer, TestAttempt
+from domain.models.enums import AttemptStatus
+
+
+class AttemptGateway(AttemptReader, SubmittedAttemptReader, GradeSaver):
+    """
+    Batch grading reads plain rows through Core. Single attempts come back
+    as ORM graphs loaded by a fixed loader profile.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_attempt_for_grading(self, attempt_id: int) -> TestAttempt | None:
+        return self._get_attempt(attempt_id, LoadProfile.GRADE_ATTEMPT)
+
+    def get_attempt_for_review(self, attempt_id: int) -> TestAttempt | None:
+        return self._get_attempt(attempt_id, LoadProfile.REVIEW_ATTEMPT)
+
+    def _get_attempt(self, attempt_id: int, profile: LoadProfile) -> TestAttempt | None:
+        return self.session.scalar(
+            select(TestAttempt)
+            .options(*loader_options(profile))
+            .where(TestAttempt.id == attempt_id)
+        )
+
+    def lock_submitted_attempts(
+            self,
+            test_id: int,
+            attempt_ids: Sequence[int] | None,
+            limit: int,
+    ) -> list[int]:
+        stmt = (
+            select(attempts_t.c.id)
+            .where(
+                attempts_t.c.test_id == test_id,
+                attempts_t.c.status == AttemptStatus.SUBMITTED,
+            )
+            .order_by(attempts_t.c.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if attempt_ids is not None:
+            stmt = stmt.where(attempts_t.c.id.in_(attempt_ids))
+        return list(self.session.scalars(stmt))
+
+    def get_submitted_answers(self, attempt_ids: Sequence[int]) -> list[SubmittedAnswer]:
+        rows = self.session.execute(
+            select(
+                answers_t.c.id, answers_t.c.attempt_id, answers_t.c.question_id,
+                answers_t.c.answer_text, selected_t.c.option_id,
+            )
+            .outerjoin(selected_t, selected_t.c.attempt_answer_id == answers_t.c.id)
+            .where(answers_t.c.attempt_id.in_(attempt_ids))
+            .order_by(answers_t.c.id)
+        )
+
+        # one row per selected option: fold them back into answers
+        grouped: dict[int, tuple[int, int, str | None, list[int]]] = {}
+        for answer_id, attempt_id, question_id, answer_text, option_id in rows:
+            entry = grouped.get(answer_id)
+            if entry is None:
+                entry = grouped[answer_id] = (attempt_id, question_id, answer_text, [])
+            if option_id is not None:
+                entry[3].append(option_id)
+
+        return [
+            SubmittedAnswer(
+                answer_id=answer_id,
+                attempt_id=attempt_id,
+                question_id=question_id,
+                option_ids=tuple(option_ids),
+                answer_text=answer_text,
+            )
+            for answer_id, (attempt_id, question_id, answer_text, option_ids) in grouped.items()
+        ]
+
+    def save_grades(self, result: GradingResult, graded_at: datetime) -> None:
+        # ORM bulk UPDATE by primary key: one executemany per table
+        if result.answers:
+            self.session.execute(
+                update(AttemptAnswer),
+                [
+                    {
+                        "id": grade.answer_id,
+                        "is_correct": grade.is_correct,
+                        "points_awarded": grade.points_awarded,
+                    }
+                    for grade in result.answers
+                ],
+            )
+        if result.attempts:
+            self.session.execute(
+                update(TestAttempt),
+                [
+                    {
+                        "id": grade.attempt_id,
+                        "status": AttemptStatus.GRADED,
+                        "score": grade.score,
+                        "max_score": grade.max_score,
+                        "graded_at": graded_at,
+                    }
+                    for grade in result.attempts
+                ],
+            )
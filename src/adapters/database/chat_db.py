@@ -0,0 +1,71 @@
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session, noload
+
+from application.common.chat_gateway import (
+    ChatMessageReader, ChatMessageSaver, ChatReader, ChatSaver, MessageCursor,
+)
+from domain.models.chat import ChatMessage, ChatSession
+from domain.models.user_id import UserId
+
+
+class ChatGateway(ChatReader, ChatSaver, ChatMessageReader, ChatMessageSaver):
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_chat(self, chat_id: int, for_update: bool = False) -> ChatSession | None:
+        stmt = (
+            select(ChatSession)
+            .options(noload(ChatSession.messages))
+            .where(ChatSession.id == chat_id)
+        )
+        if for_update:
+            stmt = stmt.with_for_update()
+        return self.session.scalar(stmt)
+
+    def list_chats(self, user_id: UserId, limit: int) -> list[ChatSession]:
+        stmt = (
+            select(ChatSession)
+            .options(noload(ChatSession.messages))
+            .where(ChatSession.user_id == user_id)
+            .order_by(ChatSession.created_at.desc(), ChatSession.id.desc())
+            .limit(limit)
+        )
+        return list(self.session.scalars(stmt))
+
+    def count_chats(self, user_id: UserId) -> int:
+        stmt = (
+            select(func.count())
+            .select_from(ChatSession)
+            .where(ChatSession.user_id == user_id)
+        )
+        return self.session.scalar(stmt) or 0
+
+    def save_chat(self, chat: ChatSession) -> None:
+        self.session.add(chat)
+
+    def get_messages(
+            self,
+            chat_id: int,
+            limit: int,
+            before: MessageCursor | None = None,
+    ) -> list[ChatMessage]:
+        # newest-first walk of ix_chat_messages_session_id_created_at,
+        # flipped back to chronological order for rendering
+        stmt = (
+            select(ChatMessage)
+            .where(ChatMessage.session_id == chat_id)
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .limit(limit)
+        )
+        if before is not None:
+            stmt = stmt.where(
+                tuple_(ChatMessage.created_at, ChatMessage.id)
+                < tuple_(before.created_at, before.id)
+            )
+        messages = list(self.session.scalars(stmt))
+        messages.reverse()
+        return messages
+
+    def save_messages(self, messages: list[ChatMessage]) -> None:
+        self.session.add_all(messages)
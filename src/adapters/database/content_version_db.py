@@ -0,0 +1,48 @@
+from typing import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from adapters.database.mappings import chat_sessions_table as chats_t, content_versions_table as t
+from application.common.content_version import (
+    ContentVersionBumper, ContentVersionReader, chat_version_key,
+)
+from domain.models.user_id import UserId
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class ContentVersionGateway(ContentVersionBumper, ContentVersionReader):
+    def __init__(self, session: Session):
+        self.session = session
+
+    def bump_versions(self, keys: Sequence[str]) -> None:
+        # sorted: two transactions bumping the same keys lock them in one order
+        dialect = self.session.get_bind().dialect.name
+        for key in sorted(set(keys)):
+            stmt = _INSERTS[dialect](t).values(key=key, version=1)
+            self.session.execute(stmt.on_conflict_do_update(
+                index_elements=[t.c.key],
+                set_={"version": t.c.version + 1},
+            ))
+
+    def get_versions(self, keys: Sequence[str]) -> dict[str, int]:
+        versions = dict.fromkeys(keys, 0)
+        rows = self.session.execute(select(t.c.key, t.c.version).where(t.c.key.in_(keys)))
+        versions.update({key: version for key, version in rows})
+        return versions
+
+    def get_chat_version(self, user_id: UserId, chat_id: int) -> int | None:
+        row = self.session.execute(
+            select(t.c.version)
+            .select_from(chats_t)
+            .outerjoin(t, t.c.key == chat_version_key(chat_id))
+            .where(chats_t.c.id == chat_id, chats_t.c.user_id == user_id)
+        ).first()
+        if row is None:
+            return None
+        return row.version or 0
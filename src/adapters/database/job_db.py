@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from application.common.job_gateway import JobClaimer, JobReader, JobSaver
+from domain.models.enums import JobStatus
+from domain.models.job import Job
+
+
+class JobGateway(JobReader, JobSaver, JobClaimer):
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def save_job(self, job: Job) -> None:
+        self.session.add(job)
+        self.session.flush()
+
+    def get_job(self, job_id: int, for_update: bool = False) -> Job | None:
+        stmt = select(Job).where(Job.id == job_id)
+        if for_update:
+            stmt = stmt.with_for_update()
+        return self.session.scalar(stmt)
+
+    def claim_jobs(self, kind: str, now: datetime, limit: int) -> list[Job]:
+        # SKIP LOCKED lets any number of workers poll the same table without
+        # blocking on (or double-claiming) each other's rows
+        stmt = (
+            select(Job)
+            .where(
+                Job.kind == kind,
+                or_(
+                    and_(Job.status == JobStatus.QUEUED, Job.run_after <= now),
+                    and_(Job.status == JobStatus.RUNNING, Job.locked_until < now),
+                ),
+            )
+            .order_by(Job.run_after, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(self.session.scalars(stmt))
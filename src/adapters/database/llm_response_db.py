@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from adapters.database.mappings import llm_responses_table as t
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _get_stmt(key: str, now: datetime):
+    return select(t.c.response).where(t.c.key == key, t.c.expires_at > now)
+
+
+def _put_stmt(dialect: str, key: str, model: str, response: str, expires_at: datetime):
+    values = dict(
+        key=key,
+        model=model,
+        response=response,
+        created_at=datetime.utcnow(),
+        expires_at=expires_at,
+    )
+    # concurrent misses for the same prompt race to store it; last one wins
+    stmt = _INSERTS[dialect](t).values(**values)
+    return stmt.on_conflict_do_update(
+        index_elements=[t.c.key],
+        set_={
+            "response": stmt.excluded.response,
+            "created_at": stmt.excluded.created_at,
+            "expires_at": stmt.excluded.expires_at,
+        },
+    )
+
+
+class LlmResponseStore:
+    """
+    Shared tier of the LLM response cache. Called outside interactors, so
+    it opens a short transaction of its own per call.
+    """
+
+    def __init__(self, session_factory: sessionmaker):
+        self.session_factory = session_factory
+
+    def get(self, key: str, now: datetime) -> str | None:
+        with self.session_factory() as session:
+            return session.scalar(_get_stmt(key, now))
+
+    def put(self, key: str, model: str, response: str, expires_at: datetime) -> None:
+        with self.session_factory() as session:
+            dialect = session.get_bind().dialect.name
+            session.execute(_put_stmt(dialect, key, model, response, expires_at))
+            session.commit()
+
+    def delete_expired(self, now: datetime) -> int:
+        with self.session_factory() as session:
+            result = session.execute(delete(t).where(t.c.expires_at <= now))
+            session.commit()
+            return result.rowcount
+
+
+class AsyncLlmResponseStore:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def get(self, key: str, now: datetime) -> str | None:
+        async with self.session_factory() as session:
+            return await session.scalar(_get_stmt(key, now))
+
+    async def put(self, key: str, model: str, response: str, expires_at: datetime) -> None:
+        async with self.session_factory() as session:
+            dialect = session.get_bind().dialect.name
+            await session.execute(_put_stmt(dialect, key, model, response, expires_at))
+            await session.commit()
+
+    async def delete_expired(self, now: datetime) -> int:
+        async with self.session_factory() as session:
+            result = await session.execute(delete(t).where(t.c.expires_at <= now))
+            await session.commit()
+            return result.rowcount
@@ -0,0 +1,99 @@
+from enum import Enum
+from typing import Callable
+
+from sqlalchemy.orm import joinedload, noload, raiseload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from domain.models.attempt import AttemptAnswer, TestAttempt
+from domain.models.chat import ChatSession
+from domain.models.test import Test, TestQuestion, TestSpec
+
+
+class LoadProfile(str, Enum):
+    """
+    Eager-loading plans for the test/attempt graph, one per use case.
+
+    Every relationship a use case walks is loaded up front (selectinload
+    for collections, joinedload for to-one), so the statement count does
+    not grow with the number of questions or answers. Anything else
+    raises instead of lazy loading, which turns a forgotten relationship
+    into an error rather than an N+1. Relationships resolvable from the
+    identity map (e.g. `answer.question` once the questions are loaded)
+    stay allowed.
+    """
+
+    # Test -> questions -> options; no answer keys
+    TAKE_TEST = "take_test"
+    # TestAttempt -> answers -> selected options, test -> questions -> options, open keys
+    GRADE_ATTEMPT = "grade_attempt"
+    # GRADE_ATTEMPT + the review chat
+    REVIEW_ATTEMPT = "review_attempt"
+    # TestSpec -> questions -> options, open keys; the published test
+    SPEC_EDITOR = "spec_editor"
+
+
+def _no_lazy() -> LoaderOption:
+    return raiseload("*", sql_only=True)
+
+
+def _live(questions):
+    return questions.and_(TestQuestion.is_deleted.is_(False))
+
+
+def _questions(questions, with_keys: bool) -> LoaderOption:
+    children = [selectinload(TestQuestion.options).options(_no_lazy()), _no_lazy()]
+    if with_keys:
+        children.append(joinedload(TestQuestion.open_key).options(_no_lazy()))
+    return selectinload(_live(questions)).options(*children)
+
+
+def _take_test() -> tuple[LoaderOption, ...]:
+    return (
+        _questions(Test.questions, with_keys=False),
+        _no_lazy(),
+    )
+
+
+def _grade_attempt() -> tuple[LoaderOption, ...]:
+    return (
+        selectinload(TestAttempt.answers).options(
+            selectinload(AttemptAnswer.selected_options).options(_no_lazy()),
+            _no_lazy(),
+        ),
+        joinedload(TestAttempt.test, innerjoin=True).options(
+            _questions(Test.questions, with_keys=True),
+            _no_lazy(),
+        ),
+        _no_lazy(),
+    )
+
+
+def _review_attempt() -> tuple[LoaderOption, ...]:
+    return (
+        *_grade_attempt(),
+        joinedload(TestAttempt.review_chat_session).options(
+            noload(ChatSession.messages),
+            _no_lazy(),
+        ),
+    )
+
+
+def _spec_editor() -> tuple[LoaderOption, ...]:
+    return (
+        _questions(TestSpec.questions, with_keys=True),
+        joinedload(TestSpec.test).options(_no_lazy()),
+        _no_lazy(),
+    )
+
+
+# built on demand: the attributes only exist once start_mappers() ran
+_PROFILES: dict[LoadProfile, Callable[[], tuple[LoaderOption, ...]]] = {
+    LoadProfile.TAKE_TEST: _take_test,
+    LoadProfile.GRADE_ATTEMPT: _grade_attempt,
+    LoadProfile.REVIEW_ATTEMPT: _review_attempt,
+    LoadProfile.SPEC_EDITOR: _spec_editor,
+}
+
+
+def loader_options(profile: LoadProfile) -> tuple[LoaderOption, ...]:
+    return _PROFILES[profile]()
@@ -4,7 +4,7 @@ from datetime import datetime
 
 from sqlalchemy import (
     Table, Column, Integer, String, DateTime, Boolean, Float, Text,
-    ForeignKey, UniqueConstraint, CheckConstraint
+    ForeignKey, UniqueConstraint, CheckConstraint, Index, text
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import registry, relationship
@@ -17,9 +17,10 @@ from domain.models.test import (
 )
 from domain.models.attempt import TestAttempt, AttemptAnswer, AttemptSelectedOption
 from domain.models.chat import ChatSession, ChatMessage
+from domain.models.job import Job
 from domain.models.enums import (
     UserRole, Difficulty, TestSpecStatus, QuestionType,
-    AttemptStatus, ChatKind, MessageRole
+    AttemptStatus, ChatKind, MessageRole, JobStatus
 )
 
 mapper_registry = registry()
@@ -59,6 +60,14 @@ sessions_table = Table(
     Column("created_at", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
     Column("expires_at", DateTime(timezone=True), nullable=True),
     Column("revoked_at", DateTime(timezone=True), nullable=True),
+    Index("ix_user_sessions_user_id", "user_id"),
+    # for the sweeper; only revoked rows are worth indexing by revoked_at
+    Index("ix_user_sessions_expires_at", "expires_at"),
+    Index(
+        "ix_user_sessions_revoked_at", "revoked_at",
+        postgresql_where=text("revoked_at IS NOT NULL"),
+        sqlite_where=text("revoked_at IS NOT NULL"),
+    ),
 )
 
 # ----------------------------
@@ -83,6 +92,7 @@ test_specs_table = Table(
     CheckConstraint("single_choice_count >= 0", name="ck_test_spec_sc_nonneg"),
     CheckConstraint("multi_choice_count >= 0", name="ck_test_spec_mc_nonneg"),
     CheckConstraint("open_count >= 0", name="ck_test_spec_open_nonneg"),
+    Index("ix_test_specs_teacher_id", "teacher_id"),
 )
 
 tests_table = Table(
@@ -119,6 +129,9 @@ test_questions_table = Table(
 
     CheckConstraint("points >= 0", name="ck_question_points_nonneg"),
     CheckConstraint("position >= 1", name="ck_question_position_min1"),
+    # ordered question lists of a draft spec / published test
+    Index("ix_test_questions_spec_id_position", "spec_id", "position"),
+    Index("ix_test_questions_test_id_position", "test_id", "position"),
 )
 
 question_options_table = Table(
@@ -130,6 +143,7 @@ question_options_table = Table(
     Column("is_correct", Boolean, nullable=False),
     Column("position", Integer, nullable=False, default=1),
     CheckConstraint("position >= 1", name="ck_option_position_min1"),
+    Index("ix_question_options_question_id_position", "question_id", "position"),
 )
 
 open_answer_keys_table = Table(
@@ -162,6 +176,15 @@ test_attempts_table = Table(
     Column("review_chat_session_id", ForeignKey("chat_sessions.id", ondelete="SET NULL"), nullable=True),
 )
 
+# attempt history of a student, newest first
+Index(
+    "ix_test_attempts_student_id_started_at",
+    test_attempts_table.c.student_id,
+    test_attempts_table.c.started_at.desc(),
+)
+Index("ix_test_attempts_test_id", test_attempts_table.c.test_id)
+Index("ix_test_attempts_review_chat_session_id", test_attempts_table.c.review_chat_session_id)
+
 attempt_answers_table = Table(
     "attempt_answers",
     metadata,
@@ -173,7 +196,9 @@ attempt_answers_table = Table(
     Column("is_correct", Boolean, nullable=True),
     Column("points_awarded", Float, nullable=True),
 
+    # (attempt_id, question_id) is covered by the unique constraint
     UniqueConstraint("attempt_id", "question_id", name="uq_attempt_question_once"),
+    Index("ix_attempt_answers_question_id", "question_id"),
 )
 
 attempt_selected_options_table = Table(
@@ -181,6 +206,7 @@ attempt_selected_options_table = Table(
     metadata,
     Column("attempt_answer_id", ForeignKey("attempt_answers.id", ondelete="CASCADE"), primary_key=True),
     Column("option_id", ForeignKey("question_options.id", ondelete="RESTRICT"), primary_key=True),
+    Index("ix_attempt_selected_options_option_id", "option_id"),
 )
 
 # ----------------------------
@@ -192,7 +218,10 @@ chat_sessions_table = Table(
     Column("id", Integer, primary_key=True),
     Column("user_id", ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
     Column("kind", SAEnum(ChatKind, name="chat_kind"), nullable=False, default=ChatKind.ASSISTANT_CHAT),
+    Column("title", String(255), nullable=True),
+    Column("flow_step", String(64), nullable=True),
     Column("created_at", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+    Index("ix_chat_sessions_user_id_created_at", "user_id", "created_at"),
 )
 
 chat_messages_table = Table(
@@ -202,7 +231,76 @@ chat_messages_table = Table(
     Column("session_id", ForeignKey("chat_sessions.id", ondelete="CASCADE"), nullable=False),
     Column("role", SAEnum(MessageRole, name="message_role"), nullable=False),
     Column("content", Text, nullable=False),
+    Column("kind", String(32), nullable=True),
+    Column("created_at", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+    # ordered chat history
+    Index("ix_chat_messages_session_id_created_at", "session_id", "created_at"),
+)
+
+# ----------------------------
+# BACKGROUND JOBS
+# ----------------------------
+jobs_table = Table(
+    "jobs",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("kind", String(64), nullable=False),
+    Column("payload", JSONB, nullable=False),
+    Column("status", SAEnum(JobStatus, name="job_status"), nullable=False, default=JobStatus.QUEUED),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("max_attempts", Integer, nullable=False, default=5),
+    Column("run_after", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+    Column("locked_by", String(64), nullable=True),
+    Column("locked_until", DateTime(timezone=True), nullable=True),
+    Column("last_error", Text, nullable=True),
     Column("created_at", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+    Column("updated_at", DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False),
+    Column("finished_at", DateTime(timezone=True), nullable=True),
+    CheckConstraint("attempts >= 0", name="ck_job_attempts_nonneg"),
+    # claim scan: due queued jobs and expired leases of one kind
+    Index("ix_jobs_kind_status_run_after", "kind", "status", "run_after"),
+)
+
+# ----------------------------
+# LLM RESPONSE CACHE (no domain model, used through Core)
+# ----------------------------
+llm_responses_table = Table(
+    "llm_responses",
+    metadata,
+    # sha256 of the normalized model + prompt + parameters
+    Column("key", String(64), primary_key=True),
+    Column("model", String(255), nullable=False),
+    Column("response", Text, nullable=False),
+    Column("created_at", DateTime(timezone=True), default=datetime.utcnow, nullable=False),
+    Column("expires_at", DateTime(timezone=True), nullable=False),
+    Index("ix_llm_responses_expires_at", "expires_at"),
+)
+
+# ----------------------------
+# CONTENT VERSIONS (no domain model, used through Core)
+# ----------------------------
+content_versions_table = Table(
+    "content_versions",
+    metadata,
+    # e.g. "chats:<user_id>", "chat:<chat_id>"
+    Column("key", String(64), primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+# ----------------------------
+# RATE LIMIT BUCKETS (no domain model, used through Core)
+# ----------------------------
+rate_limit_buckets_table = Table(
+    "rate_limit_buckets",
+    metadata,
+    # "<bucket>:<ip or normalized email>"
+    Column("key", String(320), primary_key=True),
+    Column("tokens", Float, nullable=False),
+    # epoch seconds of the last refill, so refills are plain arithmetic
+    Column("refilled_at", Float, nullable=False),
+    # outcome of the last take, read back with RETURNING
+    Column("allowed", Boolean, nullable=False),
+    Index("ix_rate_limit_buckets_refilled_at", "refilled_at"),
 )
 
 # ============================================================
@@ -253,6 +351,7 @@ def start_mappers() -> None:
             "questions": relationship(
                 TestQuestion,
                 primaryjoin=test_specs_table.c.id == test_questions_table.c.spec_id,
+                order_by=test_questions_table.c.position,
                 back_populates="spec",
                 cascade="all, delete-orphan",
             ),
@@ -273,6 +372,7 @@ def start_mappers() -> None:
             "questions": relationship(
                 TestQuestion,
                 primaryjoin=tests_table.c.id == test_questions_table.c.test_id,
+                order_by=test_questions_table.c.position,
                 back_populates="test",
             ),
             "attempts": relationship(
@@ -367,7 +467,9 @@ def start_mappers() -> None:
         ChatSession,
         chat_sessions_table,
         properties={
-            "user": relationship(User),
+            # chats are created by user_id; the dataclass default user=None
+            # must not overwrite the foreign key on flush
+            "user": relationship(User, viewonly=True),
             "messages": relationship(
                 ChatMessage,
                 back_populates="session",
@@ -384,3 +486,6 @@ def start_mappers() -> None:
             "session": relationship(ChatSession, back_populates="messages"),
         },
     )
+
+    # Jobs
+    mapper_registry.map_imperatively(Job, jobs_table)
@@ -1,11 +1,13 @@
+import asyncio
 from logging.config import fileConfig
 
 from sqlalchemy import pool, create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
 
 from alembic import context
 
 from adapters.database.mappings import mapper_registry
-from main.config import load_web_config
+from main.config import is_async_db_uri, load_web_config
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -55,18 +57,38 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def do_run_migrations(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    connectable = create_async_engine(
+        db_uri,
+        poolclass=pool.NullPool,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
+    if is_async_db_uri(db_uri):
+        asyncio.run(run_async_migrations())
+        return
+
     connectable = create_engine(
         db_uri,
         poolclass=pool.NullPool,
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-
-        with context.begin_transaction():
-            context.run_migrations()
+        do_run_migrations(connection)
 
 
 if context.is_offline_mode():
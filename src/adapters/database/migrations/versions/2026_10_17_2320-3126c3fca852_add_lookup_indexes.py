@@ -0,0 +1,57 @@
+"""add-lookup-indexes
+
+Revision ID: 3126c3fca852
+Revises: 11826cc3428d
+Create Date: 2026-10-17 23:20:11.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3126c3fca852'
+down_revision: Union[str, None] = '11826cc3428d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_user_sessions_user_id', 'user_sessions', ['user_id']),
+    ('ix_test_specs_teacher_id', 'test_specs', ['teacher_id']),
+    ('ix_test_questions_spec_id_position', 'test_questions', ['spec_id', 'position']),
+    ('ix_test_questions_test_id_position', 'test_questions', ['test_id', 'position']),
+    ('ix_question_options_question_id_position', 'question_options', ['question_id', 'position']),
+    ('ix_test_attempts_student_id_started_at', 'test_attempts', ['student_id', sa.text('started_at DESC')]),
+    ('ix_test_attempts_test_id', 'test_attempts', ['test_id']),
+    ('ix_test_attempts_review_chat_session_id', 'test_attempts', ['review_chat_session_id']),
+    ('ix_attempt_answers_question_id', 'attempt_answers', ['question_id']),
+    ('ix_attempt_selected_options_option_id', 'attempt_selected_options', ['option_id']),
+    ('ix_chat_sessions_user_id_created_at', 'chat_sessions', ['user_id', 'created_at']),
+    ('ix_chat_messages_session_id_created_at', 'chat_messages', ['session_id', 'created_at']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes build;
+    # it cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
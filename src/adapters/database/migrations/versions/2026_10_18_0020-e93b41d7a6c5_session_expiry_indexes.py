@@ -0,0 +1,64 @@
+"""session-expiry-indexes
+
+Revision ID: e93b41d7a6c5
+Revises: 7d2e5c9a3b14
+Create Date: 2026-10-18 00:20:52.604113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e93b41d7a6c5'
+down_revision: Union[str, None] = '7d2e5c9a3b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL_BATCH = 5000
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # sessions created before expiry was assigned: give them the default
+        # REFRESH_TOKEN_EXPIRE_DAYS so the sweeper can reach them through the
+        # index. Primary-key ranges, each its own short transaction, so no
+        # batch locks many rows or scans the whole table.
+        bind = op.get_bind()
+        max_id = bind.execute(sa.text("SELECT max(id) FROM user_sessions")).scalar() or 0
+        for low in range(0, max_id, BACKFILL_BATCH):
+            bind.execute(
+                sa.text(
+                    "UPDATE user_sessions SET expires_at = created_at + interval '30 days' "
+                    "WHERE id > :low AND id <= :high AND expires_at IS NULL"
+                ),
+                {"low": low, "high": low + BACKFILL_BATCH},
+            )
+
+        # CONCURRENTLY keeps user_sessions writable while the indexes build
+        op.create_index(
+            'ix_user_sessions_expires_at', 'user_sessions', ['expires_at'],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_user_sessions_revoked_at', 'user_sessions', ['revoked_at'],
+            unique=False,
+            postgresql_where=sa.text('revoked_at IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in ('ix_user_sessions_revoked_at', 'ix_user_sessions_expires_at'):
+            op.drop_index(
+                name, table_name='user_sessions',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
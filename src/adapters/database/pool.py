@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from adapters.metrics.histogram import Histogram
+
+CHECKOUT_WAIT_BUCKETS = (
+    0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    size: int = 5
+    max_overflow: int = 10
+    timeout: float = 30.0
+    recycle: int = -1
+    pre_ping: bool = False
+    statement_timeout_ms: int = 0
+
+
+class PoolMonitor:
+    """Checkout wait histogram plus in-use / overflow gauges for one pool."""
+
+    def __init__(self):
+        self.pool: Pool | None = None
+        self.checkout_wait = Histogram(CHECKOUT_WAIT_BUCKETS)
+        self.checkout_timeouts = 0
+        self.overflow_checkouts = 0
+        self.overflow_peak = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, pool: QueuePool, waited: float) -> None:
+        self.pool = pool
+        self.checkout_wait.observe(waited)
+        overflow = pool.overflow()
+        if overflow > 0:
+            with self._lock:
+                self.overflow_checkouts += 1
+                self.overflow_peak = max(self.overflow_peak, overflow)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        stats = {
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "checkout_timeouts": self.checkout_timeouts,
+            "overflow_checkouts": self.overflow_checkouts,
+            "overflow_peak": self.overflow_peak,
+        }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                in_use=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return stats
+
+
+class _InstrumentedPoolMixin:
+    monitor: PoolMonitor
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.monitor.record_timeout()
+            raise
+        self.monitor.record_checkout(self, time.perf_counter() - started)
+        return conn
+
+
+def instrumented_pool_class(monitor: PoolMonitor, is_async: bool) -> type[QueuePool]:
+    # A class per engine keeps the monitor attached across Pool.recreate().
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return type(
+        f"Instrumented{base.__name__}",
+        (_InstrumentedPoolMixin, base),
+        {"monitor": monitor},
+    )
@@ -0,0 +1,84 @@
+from sqlalchemy import Float, case, delete, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from adapters.database.mappings import rate_limit_buckets_table as t
+from adapters.ratelimit.token_bucket import BucketPolicy, wait_seconds
+
+_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _take_stmt(dialect: str, key: str, policy: BucketPolicy, now: float):
+    """
+    Refill and take in one upsert, so concurrent workers never read a
+    bucket and write it back over each other. SET expressions see the
+    row as it was before the update.
+    """
+    now_ = literal(now, Float)
+    elapsed = case((now_ > t.c.refilled_at, now_ - t.c.refilled_at), else_=0.0)
+    refilled = case(
+        (t.c.tokens + elapsed * policy.per_second > policy.burst, literal(policy.burst, Float)),
+        else_=t.c.tokens + elapsed * policy.per_second,
+    )
+    stmt = _INSERTS[dialect](t).values(
+        key=key, tokens=policy.burst - 1, refilled_at=now, allowed=True,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[t.c.key],
+        set_={
+            "tokens": case((refilled >= 1, refilled - 1), else_=refilled),
+            "refilled_at": now_,
+            "allowed": refilled >= 1,
+        },
+    ).returning(t.c.tokens, t.c.allowed)
+
+
+def _wait(row, policy: BucketPolicy) -> float:
+    tokens, allowed = row
+    return 0.0 if allowed else wait_seconds(tokens, policy)
+
+
+class DbTokenBucketStore:
+    """
+    Buckets shared by all workers through the database. Called outside
+    interactors, so it opens a short transaction of its own per call.
+    """
+
+    def __init__(self, session_factory: sessionmaker):
+        self.session_factory = session_factory
+
+    def take(self, key: str, policy: BucketPolicy, now: float) -> float:
+        with self.session_factory() as session:
+            dialect = session.get_bind().dialect.name
+            row = session.execute(_take_stmt(dialect, key, policy, now)).one()
+            session.commit()
+            return _wait(row, policy)
+
+    def delete_idle(self, before: float) -> int:
+        """Drop buckets untouched since `before`; they would be full anyway."""
+        with self.session_factory() as session:
+            result = session.execute(delete(t).where(t.c.refilled_at < before))
+            session.commit()
+            return result.rowcount
+
+
+class AsyncDbTokenBucketStore:
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+
+    async def take(self, key: str, policy: BucketPolicy, now: float) -> float:
+        async with self.session_factory() as session:
+            dialect = session.get_bind().dialect.name
+            row = (await session.execute(_take_stmt(dialect, key, policy, now))).one()
+            await session.commit()
+            return _wait(row, policy)
+
+    async def delete_idle(self, before: float) -> int:
+        async with self.session_factory() as session:
+            result = await session.execute(delete(t).where(t.c.refilled_at < before))
+            await session.commit()
+            return result.rowcount
@@ -1,10 +1,18 @@
-from sqlalchemy.orm import Session as OrmSession
+from datetime import datetime
 
-from application.common.session_gateway import SessionReader, SessionSaver
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as OrmSession, joinedload
+
+from application.common.session_gateway import (
+    AsyncSessionReader, AsyncSessionRevoker, AsyncSessionUserReader,
+    SessionPurger, SessionReader, SessionRevoker, SessionSaver, SessionUserReader,
+)
 from domain.models.session import Session
+from domain.models.user import User
 
 
-class SessionGateway(SessionReader, SessionSaver):
+class SessionGateway(SessionReader, SessionUserReader, SessionSaver, SessionRevoker, SessionPurger):
     def __init__(self, session: OrmSession):
         self.session = session
 
@@ -15,5 +23,80 @@ class SessionGateway(SessionReader, SessionSaver):
             .one_or_none()
         )
 
+    def get_session_with_user(self, session_key: str) -> Session | None:
+        return (
+            self.session.query(Session)
+            .options(
+                joinedload(Session.user, innerjoin=True)
+                .joinedload(User.student_profile),
+            )
+            .filter(Session.session_key == session_key)
+            .one_or_none()
+        )
+
+    def save_session(self, session: Session) -> None:
+        self.session.add(session)
+
+    def revoke_session(self, session_key: str, revoked_at: datetime) -> None:
+        self.session.execute(
+            update(Session)
+            .where(
+                Session.session_key == session_key,
+                Session.revoked_at.is_(None),
+            )
+            .values(revoked_at=revoked_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    def delete_expired_sessions(self, now: datetime, limit: int) -> int:
+        # DELETE has no LIMIT on Postgres: pick the batch by id; both
+        # branches of the OR have their own index
+        batch = (
+            select(Session.id)
+            .where(or_(Session.expires_at <= now, Session.revoked_at.is_not(None)))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = self.session.execute(
+            delete(Session)
+            .where(Session.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+
+class AsyncSessionGateway(
+    AsyncSessionReader, AsyncSessionUserReader, SessionSaver, AsyncSessionRevoker,
+):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_session_by_key(self, session_key: str) -> Session | None:
+        return await self.session.scalar(
+            select(Session).where(Session.session_key == session_key)
+        )
+
+    async def get_session_with_user(self, session_key: str) -> Session | None:
+        return await self.session.scalar(
+            select(Session)
+            .options(
+                joinedload(Session.user, innerjoin=True)
+                .joinedload(User.student_profile),
+            )
+            .where(Session.session_key == session_key)
+        )
+
     def save_session(self, session: Session) -> None:
         self.session.add(session)
+
+    async def revoke_session(self, session_key: str, revoked_at: datetime) -> None:
+        await self.session.execute(
+            update(Session)
+            .where(
+                Session.session_key == session_key,
+                Session.revoked_at.is_(None),
+            )
+            .values(revoked_at=revoked_at)
+            .execution_options(synchronize_session=False)
+        )
@@ -1,12 +1,217 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from logging import getLogger
+
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine,
+)
+from sqlalchemy.orm import sessionmaker
 
 from adapters.database.mappings import start_mappers
+from adapters.database.pool import PoolConfig, PoolMonitor, instrumented_pool_class
+
+logger = getLogger(__name__)
+
+_mappers_started = False
+
+
+def _ensure_mappers() -> None:
+    global _mappers_started
+    if not _mappers_started:
+        start_mappers()
+        _mappers_started = True
+
+
+def _engine_kwargs(database_url: str, pool: PoolConfig, monitor: PoolMonitor, is_async: bool) -> dict:
+    url = make_url(database_url)
+    kwargs: dict = {"pool_pre_ping": pool.pre_ping}
+    if url.get_backend_name() == "sqlite":
+        # sqlite has its own pooling rules; only pre-ping applies
+        return kwargs
+
+    kwargs.update(
+        poolclass=instrumented_pool_class(monitor, is_async),
+        pool_size=pool.size,
+        max_overflow=pool.max_overflow,
+        pool_timeout=pool.timeout,
+        pool_recycle=pool.recycle,
+    )
+    if pool.statement_timeout_ms and url.get_backend_name() == "postgresql":
+        timeout = str(pool.statement_timeout_ms)
+        if url.get_driver_name() == "asyncpg":
+            kwargs["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            kwargs["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return kwargs
+
+
+# ----------------------------
+# statement tracing
+# ----------------------------
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+# IN (?, ?, ?) -> IN (?, ...): the list length is not part of the shape
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    return _PLACEHOLDER_LIST.sub("(?, ...)", shape)
+
+
+def parameters_shape(parameters, executemany: bool) -> str:
+    """Types of the bound parameters, never their values."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {parameters_shape(rows[0], False)}" if rows else "0 x ()"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(v).__name__ for v in parameters) + ")"
+    return type(parameters).__name__
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    statement: str
+    parameters: str
+    duration_ms: float
+
+
+class QueryTrace:
+    """Statements issued on behalf of one unit of work, e.g. a web request."""
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.shapes: Counter[str] = Counter()
+        self.slow: list[SlowQuery] = []
+
+    def record(self, shape: str, duration: float) -> None:
+        self.statements += 1
+        self.db_time += duration
+        self.shapes[shape] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run at least `threshold` times: the N+1 signature."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+# Set per request by the web layer; visible from worker threads (anyio
+# copies the context) and from greenlets run by AsyncSession.run_sync.
+current_query_trace: ContextVar[QueryTrace | None] = ContextVar("current_query_trace", default=None)
+
+
+class QueryMonitor:
+    """
+    Engine event hooks: time every statement, add it to the current
+    QueryTrace and keep a sample of slow ones.
+    """
 
+    def __init__(self, slow_query_ms: float = 200.0, slow_sample_size: int = 50):
+        self.slow_query_ms = slow_query_ms
+        self.slow_queries: deque[SlowQuery] = deque(maxlen=slow_sample_size)
+        self.statements = 0
+        self.slow_count = 0
+        self._lock = threading.Lock()
 
-def make_session_factory(database_url: str):
-    engine = create_engine(database_url, future=True)
+    def install(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
 
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info["query_started_at"].pop()
+        shape = statement_shape(statement)
+
+        trace = current_query_trace.get()
+        if trace is not None:
+            trace.record(shape, duration)
+
+        slow = duration * 1000 >= self.slow_query_ms
+        with self._lock:
+            self.statements += 1
+            if slow:
+                self.slow_count += 1
+        if not slow:
+            return
+
+        sample = SlowQuery(
+            statement=shape,
+            parameters=parameters_shape(parameters, executemany),
+            duration_ms=round(duration * 1000, 3),
+        )
+        self.slow_queries.append(sample)
+        if trace is not None:
+            trace.slow.append(sample)
+        logger.warning(
+            "Slow query (%.1f ms): %s params=%s",
+            sample.duration_ms, sample.statement, sample.parameters,
+        )
+
+    def _handle_error(self, exception_context) -> None:
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            conn.info["query_started_at"].pop()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            statements, slow_count = self.statements, self.slow_count
+        return {
+            "statements": statements,
+            "slow_query_ms": self.slow_query_ms,
+            "slow_queries": slow_count,
+            "slow_samples": [asdict(q) for q in list(self.slow_queries)],
+        }
+
+
+def make_engine(
+        database_url: str,
+        pool: PoolConfig = PoolConfig(),
+        monitor: PoolMonitor | None = None,
+        query_monitor: QueryMonitor | None = None,
+) -> Engine:
+    monitor = monitor or PoolMonitor()
+    engine = create_engine(
+        database_url,
+        future=True,
+        **_engine_kwargs(database_url, pool, monitor, is_async=False),
+    )
+    monitor.pool = engine.pool
+    if query_monitor is not None:
+        query_monitor.install(engine)
+    return engine
+
+
+def make_async_engine(
+        database_url: str,
+        pool: PoolConfig = PoolConfig(),
+        monitor: PoolMonitor | None = None,
+        query_monitor: QueryMonitor | None = None,
+) -> AsyncEngine:
+    monitor = monitor or PoolMonitor()
+    engine = create_async_engine(
+        database_url,
+        **_engine_kwargs(database_url, pool, monitor, is_async=True),
+    )
+    monitor.pool = engine.sync_engine.pool
+    if query_monitor is not None:
+        query_monitor.install(engine.sync_engine)
+    return engine
+
+
+def make_session_factory(engine: Engine) -> sessionmaker:
     session_factory = sessionmaker(
         bind=engine,
         autoflush=False,
@@ -15,6 +220,39 @@ def make_session_factory(database_url: str):
         future=True,
     )
 
-    start_mappers()
+    _ensure_mappers()
+
+    return session_factory
+
+
+def make_async_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    session_factory = async_sessionmaker(
+        bind=engine,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+    _ensure_mappers()
+
+    return session_factory
+
+
+def prewarm_pool(engine: Engine, connections: int) -> None:
+    """Open `connections` connections up front and return them to the pool."""
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for conn in opened:
+            conn.close()
+
 
-    return scoped_session(session_factory)
+async def prewarm_async_pool(engine: AsyncEngine, connections: int) -> None:
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(await engine.connect())
+    finally:
+        for conn in opened:
+            await conn.close()
@@ -1,6 +1,7 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from application.common.uow import UoW
+from application.common.uow import AsyncUoW, UoW
 
 
 class SqlAlchemyUoW(UoW):
@@ -35,6 +36,15 @@ class SqlAlchemyUoW(UoW):
         finally:
             self._is_active = False
 
+    def release(self) -> None:
+        if not self._is_active:
+            raise RuntimeError("UoW is already closed")
+        if self.session.new or self.session.dirty or self.session.deleted:
+            raise RuntimeError("UoW has pending changes, commit them instead")
+        # nothing to write: ends the transaction and returns the connection to
+        # the pool; loaded objects stay usable (expire_on_commit=False)
+        self.session.commit()
+
     def close(self) -> None:
         if self._is_active:
             try:
@@ -49,3 +59,57 @@ class SqlAlchemyUoW(UoW):
         if exc_type is not None:
             self.rollback()
         self.close()
+
+
+class AsyncSqlAlchemyUoW(AsyncUoW):
+    """
+    Async counterpart of SqlAlchemyUoW over an AsyncSession.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session: AsyncSession = session
+        self._is_active: bool = True
+
+    async def flush(self) -> None:
+        if not self._is_active:
+            raise RuntimeError("UoW is already closed")
+        await self.session.flush()
+
+    async def rollback(self) -> None:
+        if not self._is_active:
+            return
+        await self.session.rollback()
+        self._is_active = False
+
+    async def commit(self) -> None:
+        if not self._is_active:
+            raise RuntimeError("UoW is already closed")
+        try:
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+        finally:
+            self._is_active = False
+
+    async def release(self) -> None:
+        if not self._is_active:
+            raise RuntimeError("UoW is already closed")
+        if self.session.new or self.session.dirty or self.session.deleted:
+            raise RuntimeError("UoW has pending changes, commit them instead")
+        await self.session.commit()
+
+    async def close(self) -> None:
+        if self._is_active:
+            try:
+                await self.session.close()
+            finally:
+                self._is_active = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            await self.rollback()
+        await self.close()
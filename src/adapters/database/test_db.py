@@ -0,0 +1,105 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from adapters.database.loading import LoadProfile, loader_options
+from adapters.database.mappings import (
+    open_answer_keys_table as keys_t,
+    question_options_table as options_t,
+    test_questions_table as questions_t,
+    tests_table,
+)
+from application.common.compiled_test import (
+    CompiledOption, CompiledQuestion, CompiledTest, CompiledTestReader,
+)
+from application.common.test_gateway import TestReader
+from domain.models.test import Test
+
+
+# drafts still change without a version bump; deactivated tests are withdrawn
+_WAS_PUBLISHED = tests_table.c.published_at.is_not(None)
+_PUBLISHED = _WAS_PUBLISHED & tests_table.c.is_active.is_(True)
+
+
+class PublishedTestGateway(CompiledTestReader, TestReader):
+    """Published tests as plain rows through Core: no ORM objects, no lazy loads."""
+
+    # the tests this gateway can see
+    visible = _PUBLISHED
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_test(self, test_id: int) -> Test | None:
+        return self.session.scalar(
+            select(Test)
+            .options(*loader_options(LoadProfile.TAKE_TEST))
+            .where(Test.id == test_id, self.visible)
+        )
+
+    def get_test_version(self, test_id: int) -> int | None:
+        return self.session.scalar(
+            select(tests_table.c.version).where(tests_table.c.id == test_id, self.visible)
+        )
+
+    def get_compiled_test(self, test_id: int) -> CompiledTest | None:
+        test = self.session.execute(
+            select(tests_table.c.version, tests_table.c.published_at)
+            .where(tests_table.c.id == test_id, self.visible)
+        ).first()
+        if test is None:
+            return None
+
+        live = (questions_t.c.test_id == test_id) & questions_t.c.is_deleted.is_(False)
+        questions = self.session.execute(
+            select(
+                questions_t.c.id, questions_t.c.type, questions_t.c.question_text,
+                questions_t.c.points, questions_t.c.position, keys_t.c.expected_answer,
+            )
+            .outerjoin(keys_t, keys_t.c.question_id == questions_t.c.id)
+            .where(live)
+            .order_by(questions_t.c.position, questions_t.c.id)
+        ).all()
+
+        options: dict[int, list[CompiledOption]] = {}
+        for row in self.session.execute(
+            select(
+                options_t.c.question_id, options_t.c.id, options_t.c.position,
+                options_t.c.option_text, options_t.c.is_correct,
+            )
+            .join(questions_t, questions_t.c.id == options_t.c.question_id)
+            .where(live)
+            .order_by(options_t.c.question_id, options_t.c.position, options_t.c.id)
+        ):
+            options.setdefault(row.question_id, []).append(CompiledOption(
+                option_id=row.id,
+                position=row.position,
+                text=row.option_text,
+                is_correct=row.is_correct,
+            ))
+
+        return CompiledTest(
+            test_id=test_id,
+            version=test.version,
+            published_at=test.published_at,
+            questions=tuple(
+                CompiledQuestion(
+                    question_id=row.id,
+                    type=row.type,
+                    text=row.question_text,
+                    points=float(row.points),
+                    position=row.position,
+                    options=tuple(options.get(row.id, ())),
+                    expected_answer=row.expected_answer,
+                )
+                for row in questions
+            ),
+        )
+
+
+class AnswerKeyGateway(PublishedTestGateway):
+    """
+    Grading's view of published tests: a test deactivated after students
+    submitted still has to be graded by its key.
+    """
+
+    visible = _WAS_PUBLISHED
@@ -0,0 +1,85 @@
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from adapters.database.loading import LoadProfile, loader_options
+from adapters.database.mappings import (
+    open_answer_keys_table, question_options_table, test_questions_table,
+)
+from application.common.test_generator import GeneratedQuestion
+from application.common.test_spec_gateway import DraftQuestionSaver, TestSpecReader
+from domain.models.enums import QuestionType
+from domain.models.test import TestSpec
+
+
+class TestSpecGateway(TestSpecReader, DraftQuestionSaver):
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_spec(self, spec_id: int, for_update: bool = False) -> TestSpec | None:
+        stmt = select(TestSpec).where(TestSpec.id == spec_id)
+        if for_update:
+            stmt = stmt.with_for_update()
+        return self.session.scalar(stmt)
+
+    def get_spec_with_questions(self, spec_id: int) -> TestSpec | None:
+        return self.session.scalar(
+            select(TestSpec)
+            .options(*loader_options(LoadProfile.SPEC_EDITOR))
+            .where(TestSpec.id == spec_id)
+        )
+
+    def replace_draft_questions(self, spec_id: int, questions: list[GeneratedQuestion]) -> int:
+        q = test_questions_table
+        # options and answer keys go with their questions (ON DELETE CASCADE)
+        self.session.execute(
+            delete(q).where(q.c.spec_id == spec_id, q.c.test_id.is_(None))
+        )
+        if not questions:
+            return 0
+
+        # one multi-row INSERT .. RETURNING per table instead of a round trip
+        # per row; ids come back in parameter order
+        question_ids = self.session.scalars(
+            insert(q).returning(q.c.id, sort_by_parameter_order=True),
+            [
+                {
+                    "spec_id": spec_id,
+                    "test_id": None,
+                    "type": question.type,
+                    "question_text": question.text,
+                    "explanation": question.explanation,
+                    "points": question.points,
+                    "position": position,
+                    "is_deleted": False,
+                }
+                for position, question in enumerate(questions, start=1)
+            ],
+        ).all()
+
+        options = [
+            {
+                "question_id": question_id,
+                "option_text": option.text,
+                "is_correct": option.is_correct,
+                "position": position,
+            }
+            for question_id, question in zip(question_ids, questions)
+            for position, option in enumerate(question.options, start=1)
+        ]
+        if options:
+            self.session.execute(insert(question_options_table), options)
+
+        keys = [
+            {
+                "question_id": question_id,
+                "expected_answer": question.expected_answer,
+                "rubric_json": question.rubric,
+            }
+            for question_id, question in zip(question_ids, questions)
+            if question.type == QuestionType.OPEN
+        ]
+        if keys:
+            self.session.execute(insert(open_answer_keys_table), keys)
+
+        return len(question_ids)
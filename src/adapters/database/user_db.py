@@ -1,6 +1,8 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 
-from application.common.user_gateway import UserReader, UserSaver
+from application.common.user_gateway import AsyncUserReader, UserReader, UserSaver
 from domain.models.user import User
 from domain.models.user_id import UserId
 
@@ -28,3 +30,26 @@ class UserGateway(UserReader, UserSaver):
 
     def save_user(self, user: User) -> None:
         self.session.add(user)
+
+
+class AsyncUserGateway(AsyncUserReader, UserSaver):
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_user(self, user_id: UserId) -> User | None:
+        return await self.session.scalar(
+            select(User)
+            .options(joinedload(User.student_profile))
+            .where(User.id == user_id)
+        )
+
+    async def get_user_by_email(self, email: str) -> User | None:
+        return await self.session.scalar(
+            select(User)
+            .options(joinedload(User.student_profile))
+            .where(User.email == email)
+        )
+
+    def save_user(self, user: User) -> None:
+        self.session.add(user)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from application.common.grading import (
+    AnswerGrade, AnswerKey, AttemptGrade, GradingResult, MultiChoiceCredit, SubmittedAnswer,
+)
+from domain.exceptions.test import InvalidAnswerKeyError
+from domain.models.enums import QuestionType
+
+# option sets are bitmasks in one uint64 per question
+MAX_OPTIONS = 64
+
+_SINGLE, _MULTI, _OPEN = 0, 1, 2
+_KIND = {
+    QuestionType.SINGLE_CHOICE: _SINGLE,
+    QuestionType.MULTI_CHOICE: _MULTI,
+    QuestionType.OPEN: _OPEN,
+}
+
+
+def normalize_open_answer(text: str | None) -> str:
+    return " ".join((text or "").split()).casefold()
+
+
+class CompiledKey:
+    """An AnswerKey as flat arrays indexed by question position."""
+
+    __slots__ = (
+        "question_index", "option_bit", "kind", "points",
+        "correct_mask", "option_count", "correct_count", "expected", "max_score",
+    )
+
+    def __init__(self, key: AnswerKey):
+        size = len(key.questions)
+        self.question_index: dict[int, int] = {}
+        # option id -> (question index, bit)
+        self.option_bit: dict[int, tuple[int, int]] = {}
+        self.kind = np.empty(size, dtype=np.int8)
+        self.points = np.empty(size, dtype=np.float64)
+        self.correct_mask = np.zeros(size, dtype=np.uint64)
+        self.option_count = np.zeros(size, dtype=np.int64)
+        self.correct_count = np.zeros(size, dtype=np.int64)
+        self.expected: list[str | None] = []
+
+        for index, question in enumerate(key.questions):
+            if len(question.options) > MAX_OPTIONS:
+                raise InvalidAnswerKeyError(
+                    f"Question {question.question_id} has more than {MAX_OPTIONS} options."
+                )
+            self.question_index[question.question_id] = index
+            self.kind[index] = _KIND[question.type]
+            self.points[index] = question.points
+            mask = 0
+            for bit, option in enumerate(question.options):
+                self.option_bit[option.option_id] = (index, bit)
+                if option.is_correct:
+                    mask |= 1 << bit
+            self.correct_mask[index] = mask
+            self.option_count[index] = len(question.options)
+            self.correct_count[index] = sum(o.is_correct for o in question.options)
+            self.expected.append(
+                normalize_open_answer(question.expected_answer)
+                if question.expected_answer else None
+            )
+        self.max_score = float(self.points.sum())
+
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    return np.bitwise_count(masks).astype(np.int64)
+
+
+class NumpyGradingEngine:
+    """
+    Scores a whole batch of answers with array operations. The only
+    per-answer Python work is turning option ids into a bitmask (and
+    comparing open answers, which have no array form).
+    """
+
+    def compile(self, key: AnswerKey) -> CompiledKey:
+        return CompiledKey(key)
+
+    def grade(
+            self,
+            key: AnswerKey | CompiledKey,
+            attempt_ids: Sequence[int],
+            answers: Sequence[SubmittedAnswer],
+            multi_choice_credit: MultiChoiceCredit,
+    ) -> GradingResult:
+        compiled = key if isinstance(key, CompiledKey) else self.compile(key)
+        attempt_index = {attempt_id: i for i, attempt_id in enumerate(attempt_ids)}
+        answers = [a for a in answers if a.attempt_id in attempt_index]
+        size = len(answers)
+
+        question_idx = np.zeros(size, dtype=np.int64)
+        attempt_idx = np.empty(size, dtype=np.int64)
+        selected = np.zeros(size, dtype=np.uint64)
+        # answers to questions that are not in the key (e.g. deleted) earn nothing
+        known = np.zeros(size, dtype=bool)
+        for i, answer in enumerate(answers):
+            attempt_idx[i] = attempt_index[answer.attempt_id]
+            q = compiled.question_index.get(answer.question_id)
+            if q is None:
+                continue
+            known[i] = True
+            question_idx[i] = q
+            mask = 0
+            for option_id in answer.option_ids:
+                position = compiled.option_bit.get(option_id)
+                # an option of some other question is ignored
+                if position is not None and position[0] == q:
+                    mask |= 1 << position[1]
+            selected[i] = mask
+
+        kind = compiled.kind[question_idx]
+        correct = compiled.correct_mask[question_idx]
+        exact = selected == correct
+
+        credit = exact.astype(np.float64)
+        multi = kind == _MULTI
+        if multi.any() and multi_choice_credit != MultiChoiceCredit.ALL_OR_NOTHING:
+            if multi_choice_credit == MultiChoiceCredit.PROPORTIONAL:
+                hits = _popcount(selected & correct)
+                wrong = _popcount(selected & ~correct)
+                partial = (hits - wrong) / np.maximum(compiled.correct_count[question_idx], 1)
+            else:
+                options = compiled.option_count[question_idx]
+                partial = (options - _popcount(selected ^ correct)) / np.maximum(options, 1)
+            credit = np.where(multi, np.clip(partial, 0.0, 1.0), credit)
+
+        for i in np.flatnonzero(kind == _OPEN):
+            expected = compiled.expected[question_idx[i]]
+            matched = expected is not None and normalize_open_answer(answers[i].answer_text) == expected
+            exact[i] = matched
+            credit[i] = 1.0 if matched else 0.0
+
+        exact &= known
+        points = np.round(np.where(known, compiled.points[question_idx] * credit, 0.0), 4)
+        scores = np.bincount(attempt_idx, weights=points, minlength=len(attempt_ids))
+
+        return GradingResult(
+            answers=[
+                AnswerGrade(answer_id=answer.answer_id, is_correct=is_correct, points_awarded=awarded)
+                for answer, is_correct, awarded in zip(answers, exact.tolist(), points.tolist())
+            ],
+            attempts=[
+                AttemptGrade(attempt_id=attempt_id, score=score, max_score=compiled.max_score)
+                for attempt_id, score in zip(attempt_ids, np.round(scores, 4).tolist())
+            ],
+        )
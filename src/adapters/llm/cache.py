@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import unicodedata
+from abc import abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from logging import getLogger
+from typing import AsyncIterator, Protocol
+
+from anyio import to_thread
+
+from adapters.cache.lru import LruTtlCache
+from application.common.llm import CompletionRequest, LlmClient
+
+logger = getLogger(__name__)
+
+# bump when the key layout changes so old rows are never matched
+KEY_VERSION = 2
+
+
+class AsyncLlmResponseStore(Protocol):
+    @abstractmethod
+    async def get(self, key: str, now: datetime) -> str | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def put(self, key: str, model: str, response: str, expires_at: datetime) -> None:
+        raise NotImplementedError
+
+
+class LlmResponseStore(Protocol):
+    @abstractmethod
+    def get(self, key: str, now: datetime) -> str | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, key: str, model: str, response: str, expires_at: datetime) -> None:
+        raise NotImplementedError
+
+
+class ThreadedLlmResponseStore(AsyncLlmResponseStore):
+    """Runs a blocking store in the worker thread pool (sync database stack)."""
+
+    def __init__(self, store: LlmResponseStore):
+        self.store = store
+
+    async def get(self, key: str, now: datetime) -> str | None:
+        return await to_thread.run_sync(self.store.get, key, now)
+
+    async def put(self, key: str, model: str, response: str, expires_at: datetime) -> None:
+        await to_thread.run_sync(self.store.put, key, model, response, expires_at)
+
+
+def _normalize_text(text: str) -> str:
+    # NFC + no trailing whitespace: prompts that render identically hash identically
+    text = unicodedata.normalize("NFC", text)
+    return "\n".join(line.rstrip() for line in text.strip().splitlines())
+
+
+def completion_cache_key(request: CompletionRequest, model: str, backend: str) -> str:
+    canonical = {
+        "v": KEY_VERSION,
+        # the same model name behind another provider is another model
+        "backend": backend,
+        "model": model,
+        "messages": [
+            [m.role, _normalize_text(m.content)] for m in request.messages
+        ],
+        "temperature": round(request.temperature, 3),
+        "max_tokens": request.max_tokens,
+        "stop": list(request.stop),
+    }
+    payload = json.dumps(canonical, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class LlmCacheStats:
+    memory_hits: int
+    store_hits: int
+    misses: int
+    bypasses: int
+    stores: int
+    store_errors: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.memory_hits + self.store_hits + self.misses
+        return (self.memory_hits + self.store_hits) / lookups if lookups else 0.0
+
+
+class CachingLlmClient:
+    """
+    Content-addressed cache in front of an LlmClient.
+
+    Lookup goes memory (LRU) -> shared store (Postgres) -> model. A hit is
+    yielded as a single chunk; a miss is streamed through unchanged and
+    stored only once the model finished the reply. Store failures are
+    logged and never fail the completion.
+    """
+
+    def __init__(
+            self,
+            client: LlmClient,
+            store: AsyncLlmResponseStore,
+            memory: LruTtlCache[str, str],
+            backend: str,
+            default_model: str,
+            ttl_seconds: int,
+    ):
+        self.client = client
+        self.backend = backend
+        self.store = store
+        self.memory = memory
+        self.default_model = default_model
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(
+            ("memory_hits", "store_hits", "misses", "bypasses", "stores", "store_errors"), 0,
+        )
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counts[name] += 1
+
+    def stats(self) -> LlmCacheStats:
+        with self._lock:
+            return LlmCacheStats(**self._counts)
+
+    async def _lookup(self, key: str) -> str | None:
+        cached = self.memory.get(key)
+        if cached is not None:
+            self._count("memory_hits")
+            return cached
+
+        try:
+            cached = await self.store.get(key, datetime.utcnow())
+        except Exception:
+            logger.exception("LLM cache lookup failed")
+            self._count("store_errors")
+            cached = None
+        if cached is None:
+            self._count("misses")
+            return None
+
+        self._count("store_hits")
+        self.memory.set(key, cached)
+        return cached
+
+    async def _save(self, key: str, model: str, response: str) -> None:
+        self.memory.set(key, response)
+        try:
+            await self.store.put(
+                key, model, response, datetime.utcnow() + timedelta(seconds=self.ttl_seconds),
+            )
+        except Exception:
+            logger.exception("LLM cache store failed")
+            self._count("store_errors")
+            return
+        self._count("stores")
+
+    async def stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        if not request.use_cache:
+            self._count("bypasses")
+            async for chunk in self.client.stream(request):
+                yield chunk
+            return
+
+        model = request.model or self.default_model
+        key = completion_cache_key(request, model, self.backend)
+        cached = await self._lookup(key)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        async for chunk in self.client.stream(request):
+            parts.append(chunk)
+            yield chunk
+        # only complete replies get here: errors and cancellation skip the store
+        if parts:
+            await self._save(key, model, "".join(parts))
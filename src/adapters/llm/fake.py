@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from typing import AsyncIterator, Callable
+
+from application.common.llm import CompletionRequest
+from application.common.test_generator import (
+    GeneratedOption, GeneratedQuestion, TestSpecBrief,
+)
+from domain.models.enums import QuestionType
+
+# words together with the whitespace that follows them, so joined chunks
+# reproduce the reply exactly
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+
+def echo_reply(request: CompletionRequest) -> str:
+    last_user = next(
+        (m.content for m in reversed(request.messages) if m.role == "user"), "",
+    )
+    return f"(fake model) You asked: {last_user}"
+
+
+class FakeLlmClient:
+    """
+    Deterministic local backend: same request, same chunks, same timing.
+    Used when no API key is configured, in tests and in benchmarks.
+    """
+
+    def __init__(
+            self,
+            reply: Callable[[CompletionRequest], str] = echo_reply,
+            first_token_delay_seconds: float = 0.0,
+            token_delay_seconds: float = 0.0,
+    ):
+        self.reply = reply
+        self.first_token_delay_seconds = first_token_delay_seconds
+        self.token_delay_seconds = token_delay_seconds
+
+    async def stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        tokens = _TOKEN_RE.findall(self.reply(request))
+        if request.max_tokens > 0:
+            tokens = tokens[:request.max_tokens]
+
+        if self.first_token_delay_seconds:
+            await asyncio.sleep(self.first_token_delay_seconds)
+        for i, token in enumerate(tokens):
+            if i and self.token_delay_seconds:
+                await asyncio.sleep(self.token_delay_seconds)
+            yield token
+
+
+class FakeTestGenerator:
+    """Deterministic, well-formed tests for any spec; no model involved."""
+
+    def __init__(self, delay_seconds: float = 0.0):
+        self.delay_seconds = delay_seconds
+
+    async def generate(
+            self, spec: TestSpecBrief, use_cache: bool = True,
+    ) -> list[GeneratedQuestion]:
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+
+        label = f"{spec.topic} (grade {spec.grade}, {spec.difficulty.value})"
+        questions = []
+        for i in range(1, spec.single_choice_count + 1):
+            questions.append(GeneratedQuestion(
+                type=QuestionType.SINGLE_CHOICE,
+                text=f"{label}: single-choice question {i}",
+                options=tuple(
+                    GeneratedOption(text=f"Option {n}", is_correct=n == 1) for n in range(1, 5)
+                ),
+            ))
+        for i in range(1, spec.multi_choice_count + 1):
+            questions.append(GeneratedQuestion(
+                type=QuestionType.MULTI_CHOICE,
+                text=f"{label}: multi-choice question {i}",
+                options=tuple(
+                    GeneratedOption(text=f"Option {n}", is_correct=n <= 2) for n in range(1, 5)
+                ),
+            ))
+        for i in range(1, spec.open_count + 1):
+            questions.append(GeneratedQuestion(
+                type=QuestionType.OPEN,
+                text=f"{label}: open question {i}",
+                expected_answer=f"Answer {i}",
+            ))
+        return questions
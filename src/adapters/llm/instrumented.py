@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import AsyncIterator
+
+from adapters.metrics.histogram import Histogram
+from application.common.llm import CompletionRequest, LlmClient
+
+LLM_LATENCY_BUCKETS = (
+    0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0, 60.0,
+)
+
+
+class LlmMonitor:
+    """Time-to-first-token and full-reply latency of streamed completions."""
+
+    def __init__(self):
+        self.time_to_first_token = Histogram(LLM_LATENCY_BUCKETS)
+        self.duration = Histogram(LLM_LATENCY_BUCKETS)
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.chunks = 0
+        self._lock = threading.Lock()
+
+    def _add(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def snapshot(self) -> dict:
+        return {
+            "time_to_first_token_seconds": self.time_to_first_token.snapshot(),
+            "duration_seconds": self.duration.snapshot(),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "chunks": self.chunks,
+        }
+
+
+class InstrumentedLlmClient:
+    def __init__(self, client: LlmClient, monitor: LlmMonitor):
+        self.client = client
+        self.monitor = monitor
+
+    async def stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        monitor = self.monitor
+        started = time.perf_counter()
+        first = True
+        chunks = 0
+        monitor._add(in_flight=1)
+        try:
+            async for chunk in self.client.stream(request):
+                if first:
+                    monitor.time_to_first_token.observe(time.perf_counter() - started)
+                    first = False
+                chunks += 1
+                yield chunk
+        except BaseException:
+            # includes the client going away mid-stream (GeneratorExit / cancel)
+            monitor._add(in_flight=-1, failed=1, chunks=chunks)
+            raise
+        monitor.duration.observe(time.perf_counter() - started)
+        monitor._add(in_flight=-1, completed=1, chunks=chunks)
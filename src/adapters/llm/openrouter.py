@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+from logging import getLogger
+from typing import AsyncIterator
+
+import httpx
+
+from application.common.llm import CompletionRequest, LlmBackendError
+
+logger = getLogger(__name__)
+
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+
+class OpenRouterClient:
+    """
+    OpenAI-compatible chat completions over OpenRouter with `stream: true`.
+
+    One AsyncClient (and its keep-alive connections) is shared by all
+    requests; call `aclose()` on shutdown.
+    """
+
+    def __init__(
+            self,
+            api_key: str,
+            model: str,
+            base_url: str = OPENROUTER_BASE_URL,
+            connect_timeout_seconds: float = 5.0,
+            read_timeout_seconds: float = 60.0,
+            max_connections: int = 100,
+    ):
+        self.model = model
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            # read timeout bounds the gap between chunks, not the whole reply
+            timeout=httpx.Timeout(read_timeout_seconds, connect=connect_timeout_seconds),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+    def _payload(self, request: CompletionRequest) -> dict:
+        payload = {
+            "model": request.model or self.model,
+            "messages": [
+                {"role": m.role, "content": m.content} for m in request.messages
+            ],
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+            "stream": True,
+        }
+        if request.stop:
+            payload["stop"] = list(request.stop)
+        return payload
+
+    async def stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        try:
+            async for content in self._stream(request):
+                yield content
+        except httpx.HTTPError as exc:
+            logger.error("LLM request failed: %r", exc)
+            raise LlmBackendError("LLM backend is unreachable") from exc
+
+    async def _stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        async with self._client.stream(
+            "POST", "/chat/completions", json=self._payload(request),
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                logger.error("LLM request failed: %s %s", response.status_code, body[:500])
+                raise LlmBackendError(f"LLM backend returned {response.status_code}")
+
+            async for line in response.aiter_lines():
+                # SSE: "data: {...}" per chunk, ": comment" keep-alives, "data: [DONE]"
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                chunk = _parse_chunk(data)
+                if "error" in chunk:
+                    error = chunk["error"]
+                    message = error.get("message") if isinstance(error, dict) else None
+                    raise LlmBackendError(message or "LLM stream error")
+                for choice in chunk.get("choices") or ():
+                    delta = choice.get("delta") if isinstance(choice, dict) else None
+                    content = delta.get("content") if isinstance(delta, dict) else None
+                    if isinstance(content, str) and content:
+                        yield content
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def _parse_chunk(data: str) -> dict:
+    # a garbled stream can't be resumed: fail it like an unreachable backend
+    try:
+        chunk = json.loads(data)
+    except json.JSONDecodeError as exc:
+        logger.error("LLM stream sent invalid JSON: %r", data[:500])
+        raise LlmBackendError("LLM backend sent an invalid stream") from exc
+    if not isinstance(chunk, dict):
+        logger.error("LLM stream sent an unexpected chunk: %r", data[:500])
+        raise LlmBackendError("LLM backend sent an invalid stream")
+    return chunk
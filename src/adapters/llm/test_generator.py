@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+
+from application.common.llm import CompletionRequest, LlmClient, LlmMessage
+from application.common.test_generator import (
+    GeneratedOption, GeneratedQuestion, TestSpecBrief,
+)
+from domain.exceptions.test import InvalidGeneratedTestError
+from domain.models.enums import QuestionType
+
+_SYSTEM_PROMPT = """\
+You write school math tests. Reply with one JSON object and nothing else:
+{"questions": [{
+  "type": "single_choice" | "multi_choice" | "open",
+  "text": "...",
+  "explanation": "...",
+  "points": 1,
+  "options": [{"text": "...", "is_correct": true}],
+  "expected_answer": "..."
+}]}
+Choice questions have 3-5 options and no expected_answer; single_choice has
+exactly one correct option. Open questions have no options."""
+
+
+def _user_prompt(spec: TestSpecBrief) -> str:
+    # only what shapes the test goes into the prompt, so equal specs share
+    # one cached completion regardless of their name or owner
+    return (
+        f"Topic: {spec.topic.strip()}\n"
+        f"Grade: {spec.grade}\n"
+        f"Difficulty: {spec.difficulty.value}\n"
+        f"single_choice questions: {spec.single_choice_count}\n"
+        f"multi_choice questions: {spec.multi_choice_count}\n"
+        f"open questions: {spec.open_count}"
+    )
+
+
+def _strip_fences(text: str) -> str:
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return text
+
+
+def parse_questions(text: str) -> list[GeneratedQuestion]:
+    try:
+        raw = json.loads(_strip_fences(text))["questions"]
+        return [
+            GeneratedQuestion(
+                type=QuestionType(item["type"]),
+                text=str(item["text"]),
+                explanation=item.get("explanation"),
+                points=int(item.get("points", 1)),
+                options=tuple(
+                    GeneratedOption(text=str(o["text"]), is_correct=bool(o["is_correct"]))
+                    for o in item.get("options") or ()
+                ),
+                expected_answer=item.get("expected_answer"),
+                rubric=item.get("rubric"),
+            )
+            for item in raw
+        ]
+    except (ValueError, KeyError, TypeError) as exc:
+        raise InvalidGeneratedTestError(f"Unparseable generation output: {exc}") from exc
+
+
+class LlmTestGenerator:
+    def __init__(self, llm: LlmClient, max_tokens: int = 4000, temperature: float = 0.4):
+        self.llm = llm
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+
+    async def generate(
+            self, spec: TestSpecBrief, use_cache: bool = True,
+    ) -> list[GeneratedQuestion]:
+        request = CompletionRequest(
+            messages=(
+                LlmMessage(role="system", content=_SYSTEM_PROMPT),
+                LlmMessage(role="user", content=_user_prompt(spec)),
+            ),
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            use_cache=use_cache,
+        )
+        text = "".join([chunk async for chunk in self.llm.stream(request)])
+        return parse_questions(text)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, TypedDict
+
+from adapters.metrics.histogram import DEFAULT_LATENCY_BUCKETS, Histogram
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+class MetricFamily(TypedDict):
+    name: str
+    type: str
+    help: str
+    # (labels, value); histogram values are Histogram.snapshot() dicts
+    samples: list[tuple[dict[str, str], float | dict]]
+
+
+def _key(labels: dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class _Metric:
+    type: str
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+
+    def family(self) -> MetricFamily:
+        return MetricFamily(name=self.name, type=self.type, help=self.help, samples=self._samples())
+
+    def _samples(self) -> list:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = COUNTER
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list:
+        with self._lock:
+            return [(dict(key), value) for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    type = GAUGE
+
+    def __init__(self, name: str, help: str):
+        super().__init__(name, help)
+        self._values: dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[_key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def _samples(self) -> list:
+        with self._lock:
+            return [(dict(key), value) for key, value in self._values.items()]
+
+
+class LabeledHistogram(_Metric):
+    type = HISTOGRAM
+
+    def __init__(self, name: str, help: str, buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = buckets
+        self._children: dict[LabelKey, Histogram] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _key(labels)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, Histogram(self.buckets))
+        child.observe(value)
+
+    def _samples(self) -> list:
+        with self._lock:
+            children = list(self._children.items())
+        return [(dict(key), child.snapshot()) for key, child in children]
+
+
+Collector = Callable[[], Iterable[MetricFamily]]
+
+
+class MetricsRegistry:
+    """
+    In-process metrics. Values owned elsewhere (pool monitors, cache
+    stats) are read at collection time through collectors instead of
+    being mirrored on every change.
+    """
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Collector] = []
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._register(Counter(name, help))
+
+    def gauge(self, name: str, help: str) -> Gauge:
+        return self._register(Gauge(name, help))
+
+    def histogram(self, name: str, help: str, buckets=DEFAULT_LATENCY_BUCKETS) -> LabeledHistogram:
+        return self._register(LabeledHistogram(name, help, buckets))
+
+    def add_collector(self, collector: Collector) -> None:
+        self._collectors.append(collector)
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collect(self) -> list[MetricFamily]:
+        families = [metric.family() for metric in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        return families
+
+
+def family(name: str, type: str, help: str, samples) -> MetricFamily:
+    return MetricFamily(name=name, type=type, help=help, samples=list(samples))
+
+
+# ----------------------------
+# several worker processes
+# ----------------------------
+def _add_histograms(a: dict, b: dict) -> dict:
+    buckets = dict(a["buckets"])
+    for bound, n in b["buckets"].items():
+        buckets[bound] = buckets.get(bound, 0) + n
+    return {"buckets": buckets, "sum": a["sum"] + b["sum"], "count": a["count"] + b["count"]}
+
+
+def merge_families(per_process: Iterable[tuple[list[MetricFamily], bool]]) -> list[MetricFamily]:
+    """
+    Sum the families of several processes sample by sample. Gauges of
+    processes that are gone are dropped; their counters and histograms
+    still count, so totals don't go backwards when a worker restarts.
+    """
+    merged: dict[str, MetricFamily] = {}
+    values: dict[str, dict[LabelKey, float | dict]] = {}
+    for families, alive in per_process:
+        for fam in families:
+            if fam["type"] == GAUGE and not alive:
+                continue
+            if fam["name"] not in merged:
+                merged[fam["name"]] = family(fam["name"], fam["type"], fam["help"], [])
+                values[fam["name"]] = {}
+            by_labels = values[fam["name"]]
+            for labels, value in fam["samples"]:
+                key = _key(labels)
+                current = by_labels.get(key)
+                if current is None:
+                    by_labels[key] = value
+                elif fam["type"] == HISTOGRAM:
+                    by_labels[key] = _add_histograms(current, value)
+                else:
+                    by_labels[key] = current + value
+    for name, fam in merged.items():
+        fam["samples"] = [(dict(key), value) for key, value in values[name].items()]
+    return list(merged.values())
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MultiprocessStore:
+    """
+    One JSON snapshot per worker process in a shared directory. Each
+    worker rewrites its own file periodically; whichever worker serves
+    /metrics merges all of them.
+    """
+
+    def __init__(self, directory: str | Path, pid: int | None = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.pid = pid or os.getpid()
+
+    def write(self, families: list[MetricFamily]) -> None:
+        path = self.directory / f"{self.pid}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(families))
+        os.replace(tmp, path)
+
+    def read_all(self) -> list[tuple[list[MetricFamily], bool]]:
+        snapshots = []
+        for path in self.directory.glob("*.json"):
+            try:
+                pid = int(path.stem)
+                families = json.loads(path.read_text())
+            except (ValueError, OSError):
+                continue
+            if pid == self.pid:
+                continue
+            snapshots.append((families, _pid_alive(pid)))
+        return snapshots
+
+
+# ----------------------------
+# text exposition
+# ----------------------------
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict[str, str], extra: dict[str, str] | None = None) -> str:
+    items = {**labels, **(extra or {})}
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in items.items()) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else f"{int(value)}"
+
+
+def render_text(families: Iterable[MetricFamily]) -> str:
+    """Prometheus text exposition format 0.0.4."""
+    lines: list[str] = []
+    for fam in sorted(families, key=lambda f: f["name"]):
+        name = fam["name"]
+        lines.append(f"# HELP {name} {fam['help']}")
+        lines.append(f"# TYPE {name} {fam['type']}")
+        for labels, value in fam["samples"]:
+            if fam["type"] != HISTOGRAM:
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            for bound, n in value["buckets"].items():
+                lines.append(f"{name}_bucket{_labels(labels, {'le': bound})} {n}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(value['sum'])}")
+            lines.append(f"{name}_count{_labels(labels)} {value['count']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+import time
+from abc import abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Callable, Protocol
+
+from anyio import to_thread
+
+from application.common.rate_limit import LoginThrottle
+from domain.exceptions.auth import TooManyAttemptsError
+
+logger = getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    per_second: float       # refill rate
+    burst: float            # bucket size
+
+    @classmethod
+    def per_minute(cls, rate: float, burst: float) -> BucketPolicy:
+        return cls(per_second=rate / 60, burst=burst)
+
+    @property
+    def full_after_seconds(self) -> float:
+        """An untouched bucket is full again after this long."""
+        return self.burst / self.per_second
+
+
+def refill(tokens: float, refilled_at: float, policy: BucketPolicy, now: float) -> float:
+    # clocks of different workers may disagree slightly: never refill backwards
+    elapsed = max(0.0, now - refilled_at)
+    return min(policy.burst, tokens + elapsed * policy.per_second)
+
+
+def wait_seconds(tokens: float, policy: BucketPolicy) -> float:
+    return (1 - tokens) / policy.per_second
+
+
+class TokenBucketStore(Protocol):
+    @abstractmethod
+    def take(self, key: str, policy: BucketPolicy, now: float) -> float:
+        """Take one token. Returns 0 if it was there, else seconds until it will be."""
+        raise NotImplementedError
+
+
+class AsyncTokenBucketStore(Protocol):
+    @abstractmethod
+    async def take(self, key: str, policy: BucketPolicy, now: float) -> float:
+        raise NotImplementedError
+
+
+class MemoryTokenBucketStore(AsyncTokenBucketStore):
+    """
+    Buckets of this process only. With several workers each one limits
+    separately, so the effective limit is multiplied by the worker count.
+    The least recently used keys are forgotten beyond `max_keys`.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, policy: BucketPolicy, now: float) -> float:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                tokens = policy.burst
+            else:
+                tokens = refill(*bucket, policy, now)
+                self._buckets.move_to_end(key)
+
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = wait_seconds(tokens, policy)
+            self._buckets[key] = (tokens, now)
+
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class ThreadedTokenBucketStore(AsyncTokenBucketStore):
+    """Runs a blocking store in the worker thread pool (sync database stack)."""
+
+    def __init__(self, store: TokenBucketStore):
+        self.store = store
+
+    async def take(self, key: str, policy: BucketPolicy, now: float) -> float:
+        return await to_thread.run_sync(self.store.take, key, policy, now)
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+class TokenBucketThrottle(LoginThrottle):
+    """
+    One bucket per client IP and one per account email: the IP bucket
+    stops a single host spraying many accounts, the email bucket stops
+    many hosts hammering one account. If the store fails the attempt is
+    let through; the login itself still has to succeed.
+    """
+
+    def __init__(
+            self,
+            store: AsyncTokenBucketStore,
+            ip_policy: BucketPolicy,
+            email_policy: BucketPolicy,
+            clock: Callable[[], float] = time.time,
+    ):
+        self.store = store
+        self.policies = {"ip": ip_policy, "email": email_policy}
+        self._clock = clock
+
+        self.allowed = 0
+        self.rejected = {bucket: 0 for bucket in self.policies}
+        self.store_errors = 0
+
+    async def check(self, client_ip: str | None, email: str) -> None:
+        values = {"ip": client_ip, "email": normalize_email(email)}
+        for bucket, policy in self.policies.items():
+            if not values[bucket]:
+                continue
+            try:
+                wait = await self.store.take(f"{bucket}:{values[bucket]}", policy, self._clock())
+            except Exception:
+                self.store_errors += 1
+                logger.exception("Rate limit store failed, letting the attempt through")
+                continue
+            if wait > 0:
+                self.rejected[bucket] += 1
+                raise TooManyAttemptsError(retry_after=wait)
+        self.allowed += 1
+
+    def snapshot(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "rejected": dict(self.rejected),
+            "store_errors": self.store_errors,
+        }
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from application.common.chat import NewChatMessage, build_messages, get_own_chat
+from application.common.chat_gateway import ChatMessageSaver, ChatReader
+from application.common.content_version import ContentVersionBumper, chat_version_key
+from application.common.interactor import Interactor
+from application.common.uow import UoW
+from domain.exceptions.chat import InvalidChatActionError
+from domain.models.chat import ChatMessage
+from domain.models.user_id import UserId
+
+
+class ChatDbGateway(ChatReader, ChatMessageSaver, Protocol):
+    pass
+
+
+@dataclass
+class AppendChatMessagesCommand:
+    user_id: UserId
+    chat_id: int
+    messages: list[NewChatMessage] = field(default_factory=list)
+    flow_step: str | None = None
+    # when set, the append is rejected unless the chat is still at this step
+    expected_flow_step: str | None = None
+
+
+@dataclass
+class AppendChatMessagesResult:
+    messages: list[ChatMessage]
+
+
+class AppendChatMessages(Interactor[AppendChatMessagesCommand, AppendChatMessagesResult]):
+    def __init__(
+        self,
+        chat_db_gateway: ChatDbGateway,
+        content_version_gateway: ContentVersionBumper,
+        uow: UoW,
+    ):
+        self.chat_db_gateway = chat_db_gateway
+        self.content_version_gateway = content_version_gateway
+        self.uow = uow
+
+    def __call__(self, data: AppendChatMessagesCommand) -> AppendChatMessagesResult:
+        # row lock serializes concurrent turns on the same chat
+        chat = get_own_chat(
+            self.chat_db_gateway, data.user_id, data.chat_id, for_update=True,
+        )
+        if data.expected_flow_step is not None and chat.flow_step != data.expected_flow_step:
+            raise InvalidChatActionError("Chat has moved on to another step.")
+
+        messages = build_messages(chat, data.messages)
+        self.chat_db_gateway.save_messages(messages)
+        chat.flow_step = data.flow_step
+        self.content_version_gateway.bump_versions([chat_version_key(data.chat_id)])
+        self.uow.commit()
+
+        return AppendChatMessagesResult(messages=messages)
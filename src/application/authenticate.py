@@ -1,7 +1,7 @@
 from typing import Protocol
 
-from application.common.id_provider import IdProvider
-from application.common.interactor import Interactor
+from application.common.id_provider import AsyncUserProvider, IdProvider, UserProvider
+from application.common.interactor import AsyncInteractor, Interactor
 from application.common.user_gateway import UserSaver, UserReader
 from domain.exceptions.auth import AuthenticationError
 from domain.models.user import User
@@ -31,3 +31,30 @@ class Authenticate(Interactor[None, User]):
             raise AuthenticationError("User not found.")
 
         return user
+
+
+class AuthenticateCurrentUser(Interactor[None, User]):
+    """
+    Authenticate variant for providers that already resolve the user
+    (e.g. session -> user in one query), so no extra lookup is needed.
+    """
+
+    def __init__(
+            self,
+            user_provider: UserProvider,
+    ):
+        self.user_provider = user_provider
+
+    def __call__(self, data: None = None) -> User:
+        return self.user_provider.get_current_user()
+
+
+class AsyncAuthenticateCurrentUser(AsyncInteractor[None, User]):
+    def __init__(
+            self,
+            user_provider: AsyncUserProvider,
+    ):
+        self.user_provider = user_provider
+
+    async def __call__(self, data: None = None) -> User:
+        return await self.user_provider.get_current_user()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Protocol
+
+from application.common.interactor import Interactor
+from application.common.job_gateway import JobClaimer
+from application.common.test_generation import JOB_KIND, brief_of, give_up, spec_id_of
+from application.common.test_generator import TestSpecBrief
+from application.common.test_spec_gateway import TestSpecReader
+from application.common.uow import UoW
+from domain.models.enums import JobStatus, TestSpecStatus
+
+
+class TestSpecDbGateway(TestSpecReader, Protocol):
+    pass
+
+
+class JobDbGateway(JobClaimer, Protocol):
+    pass
+
+
+@dataclass
+class ClaimTestGenerationCommand:
+    worker_id: str
+    limit: int
+    lease_seconds: int
+
+
+@dataclass
+class ClaimedTestGeneration:
+    job_id: int
+    # the lease is bound to this attempt number
+    attempt: int
+    spec: TestSpecBrief
+
+
+class ClaimTestGeneration(Interactor[ClaimTestGenerationCommand, list[ClaimedTestGeneration]]):
+    def __init__(
+        self,
+        test_spec_db_gateway: TestSpecDbGateway,
+        job_db_gateway: JobDbGateway,
+        uow: UoW,
+    ):
+        self.test_spec_db_gateway = test_spec_db_gateway
+        self.job_db_gateway = job_db_gateway
+        self.uow = uow
+
+    def __call__(self, data: ClaimTestGenerationCommand) -> list[ClaimedTestGeneration]:
+        if data.limit <= 0:
+            return []
+
+        now = datetime.utcnow()
+        jobs = self.job_db_gateway.claim_jobs(JOB_KIND, now, data.limit)
+
+        claimed = []
+        for job in jobs:
+            spec = self.test_spec_db_gateway.get_spec(spec_id_of(job), for_update=True)
+            if job.attempts >= job.max_attempts:
+                # the last attempt's worker died without reporting back
+                give_up(job, spec, now, job.last_error or "Lease expired.")
+                continue
+            if spec is None or spec.status != TestSpecStatus.GENERATING:
+                give_up(job, spec, now, "Spec is no longer waiting for generation.")
+                continue
+
+            job.status = JobStatus.RUNNING
+            job.attempts += 1
+            job.locked_by = data.worker_id
+            job.locked_until = now + timedelta(seconds=data.lease_seconds)
+            claimed.append(ClaimedTestGeneration(
+                job_id=job.id,
+                attempt=job.attempts,
+                spec=brief_of(spec),
+            ))
+        self.uow.commit()
+
+        return claimed
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Protocol
+
+from domain.models.enums import UserRole
+from domain.models.user import StudentProfile, User
+from domain.models.user_id import UserId
+
+
+@dataclass(frozen=True)
+class AccessClaims:
+    """What a signed access token says about its user: enough to render a page."""
+    user_id: UserId
+    role: UserRole
+    email: str
+    full_name: str | None
+    grade: int | None
+
+    @classmethod
+    def of(cls, user: User) -> AccessClaims:
+        return cls(
+            user_id=UserId(int(user.id)),
+            role=UserRole(user.role),
+            email=user.email,
+            full_name=user.full_name,
+            grade=user.student_profile.grade if user.student_profile else None,
+        )
+
+    def to_user(self) -> User:
+        """A detached user; there is no password hash and it must not be saved."""
+        profile = None
+        if self.grade is not None:
+            profile = StudentProfile(user_id=self.user_id, grade=self.grade)
+        return User(
+            id=self.user_id,
+            email=self.email,
+            password_hash="",
+            role=self.role,
+            full_name=self.full_name,
+            student_profile=profile,
+        )
+
+
+class AccessTokenIssuer(Protocol):
+    @abstractmethod
+    def issue_access_token(self, claims: AccessClaims) -> str:
+        raise NotImplementedError
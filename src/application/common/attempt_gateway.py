@@ -0,0 +1,43 @@
+from abc import abstractmethod
+from datetime import datetime
+from typing import Protocol, Sequence
+
+from application.common.grading import GradingResult, SubmittedAnswer
+from domain.models.attempt import TestAttempt
+
+
+class AttemptReader(Protocol):
+    @abstractmethod
+    def get_attempt_for_grading(self, attempt_id: int) -> TestAttempt | None:
+        """The attempt with its answers and the test's questions, options and keys."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_attempt_for_review(self, attempt_id: int) -> TestAttempt | None:
+        """As for grading, plus the review chat."""
+        raise NotImplementedError
+
+
+class SubmittedAttemptReader(Protocol):
+    @abstractmethod
+    def lock_submitted_attempts(
+            self,
+            test_id: int,
+            attempt_ids: Sequence[int] | None,
+            limit: int,
+    ) -> list[int]:
+        """
+        Ids of submitted, not yet graded attempts, locked for this
+        transaction. Attempts locked by a concurrent grader are skipped.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_submitted_answers(self, attempt_ids: Sequence[int]) -> list[SubmittedAnswer]:
+        raise NotImplementedError
+
+
+class GradeSaver(Protocol):
+    @abstractmethod
+    def save_grades(self, result: GradingResult, graded_at: datetime) -> None:
+        raise NotImplementedError
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from application.common.chat_gateway import ChatReader
+from domain.exceptions.chat import ChatNotFoundError
+from domain.models.chat import ChatMessage, ChatSession
+from domain.models.enums import MessageRole
+from domain.models.user_id import UserId
+
+
+@dataclass
+class NewChatMessage:
+    role: MessageRole
+    content: str
+    kind: str | None = None
+
+
+def get_own_chat(
+        chat_gateway: ChatReader,
+        user_id: UserId,
+        chat_id: int,
+        for_update: bool = False,
+) -> ChatSession:
+    chat = chat_gateway.get_chat(chat_id, for_update=for_update)
+    # someone else's chat is reported exactly like a missing one
+    if chat is None or chat.user_id != user_id:
+        raise ChatNotFoundError("Chat not found.")
+    return chat
+
+
+def build_messages(chat: ChatSession, messages: list[NewChatMessage]) -> list[ChatMessage]:
+    return [
+        ChatMessage(
+            id=None,
+            session_id=chat.id,
+            role=message.role,
+            content=message.content,
+            kind=message.kind,
+            session=chat,
+        )
+        for message in messages
+    ]
@@ -0,0 +1,53 @@
+from abc import abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol
+
+from domain.models.chat import ChatMessage, ChatSession
+from domain.models.user_id import UserId
+
+
+@dataclass(frozen=True)
+class MessageCursor:
+    """Keyset position in a chat history: (created_at, id) of a message."""
+    created_at: datetime
+    id: int
+
+
+class ChatReader(Protocol):
+    @abstractmethod
+    def get_chat(self, chat_id: int, for_update: bool = False) -> ChatSession | None:
+        """`for_update` locks the row until the transaction ends."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_chats(self, user_id: UserId, limit: int) -> list[ChatSession]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_chats(self, user_id: UserId) -> int:
+        raise NotImplementedError
+
+
+class ChatSaver(Protocol):
+    @abstractmethod
+    def save_chat(self, chat: ChatSession) -> None:
+        raise NotImplementedError
+
+
+class ChatMessageReader(Protocol):
+    @abstractmethod
+    def get_messages(
+            self,
+            chat_id: int,
+            limit: int,
+            before: MessageCursor | None = None,
+    ) -> list[ChatMessage]:
+        """Up to `limit` messages older than `before`, oldest first."""
+        raise NotImplementedError
+
+
+class ChatMessageSaver(Protocol):
+    @abstractmethod
+    def save_messages(self, messages: list[ChatMessage]) -> None:
+        raise NotImplementedError
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Protocol
+
+from application.common.grading import AnswerKey, KeyOption, KeyQuestion
+from domain.models.enums import QuestionType
+
+
+# Published tests never change in place: a change means a new `version`.
+# These structures are immutable so one instance can be shared by every
+# request and thread of the process.
+
+@dataclass(frozen=True, slots=True)
+class CompiledOption:
+    option_id: int
+    position: int
+    text: str
+    is_correct: bool
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledQuestion:
+    question_id: int
+    type: QuestionType
+    text: str
+    points: float
+    position: int
+    # in position order
+    options: tuple[CompiledOption, ...] = ()
+    expected_answer: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledTest:
+    test_id: int
+    version: int
+    published_at: datetime | None
+    # in position order
+    questions: tuple[CompiledQuestion, ...]
+    max_score: float = field(init=False)
+    answer_key: AnswerKey = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "max_score", float(sum(q.points for q in self.questions)))
+        object.__setattr__(self, "answer_key", AnswerKey(
+            test_id=self.test_id,
+            questions=tuple(
+                KeyQuestion(
+                    question_id=q.question_id,
+                    type=q.type,
+                    points=q.points,
+                    options=tuple(KeyOption(o.option_id, o.is_correct) for o in q.options),
+                    expected_answer=q.expected_answer,
+                )
+                for q in self.questions
+            ),
+        ))
+
+
+class CompiledTestReader(Protocol):
+    @abstractmethod
+    def get_compiled_test(self, test_id: int) -> CompiledTest | None:
+        raise NotImplementedError
@@ -0,0 +1,38 @@
+"""
+Version counters of user-visible content. Every change that alters what
+a page shows bumps its counter in the same transaction, so anything
+derived from the content (rendered fragments, ETags) can be keyed by the
+version instead of by the content itself.
+"""
+from abc import abstractmethod
+from typing import Protocol, Sequence
+
+from domain.models.user_id import UserId
+
+
+def chat_list_version_key(user_id: UserId) -> str:
+    """The chats of a user: bumped when one is created."""
+    return f"chats:{int(user_id)}"
+
+
+def chat_version_key(chat_id: int) -> str:
+    """Messages and flow step of a chat: bumped on every append."""
+    return f"chat:{chat_id}"
+
+
+class ContentVersionBumper(Protocol):
+    @abstractmethod
+    def bump_versions(self, keys: Sequence[str]) -> None:
+        raise NotImplementedError
+
+
+class ContentVersionReader(Protocol):
+    @abstractmethod
+    def get_versions(self, keys: Sequence[str]) -> dict[str, int]:
+        """Current versions; keys never bumped are 0."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_chat_version(self, user_id: UserId, chat_id: int) -> int | None:
+        """Version of a chat of this user; None when it is not theirs or does not exist."""
+        raise NotImplementedError
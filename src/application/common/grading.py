@@ -0,0 +1,83 @@
+from abc import abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+from typing import Protocol, Sequence
+
+from domain.models.enums import QuestionType
+
+
+class MultiChoiceCredit(str, Enum):
+    # full points only for exactly the correct set
+    ALL_OR_NOTHING = "all_or_nothing"
+    # (correct picks - wrong picks) / correct options, not below zero
+    PROPORTIONAL = "proportional"
+    # share of options judged right, picked or left out
+    PER_OPTION = "per_option"
+
+
+@dataclass(frozen=True)
+class KeyOption:
+    option_id: int
+    is_correct: bool
+
+
+@dataclass(frozen=True)
+class KeyQuestion:
+    question_id: int
+    type: QuestionType
+    points: float
+    # in position order
+    options: tuple[KeyOption, ...] = ()
+    expected_answer: str | None = None
+
+
+@dataclass(frozen=True)
+class AnswerKey:
+    test_id: int
+    questions: tuple[KeyQuestion, ...]
+
+    @property
+    def max_score(self) -> float:
+        return float(sum(q.points for q in self.questions))
+
+
+@dataclass(frozen=True)
+class SubmittedAnswer:
+    answer_id: int
+    attempt_id: int
+    question_id: int
+    option_ids: tuple[int, ...] = ()
+    answer_text: str | None = None
+
+
+@dataclass(frozen=True)
+class AnswerGrade:
+    answer_id: int
+    is_correct: bool
+    points_awarded: float
+
+
+@dataclass(frozen=True)
+class AttemptGrade:
+    attempt_id: int
+    score: float
+    max_score: float
+
+
+@dataclass
+class GradingResult:
+    answers: list[AnswerGrade]
+    attempts: list[AttemptGrade]
+
+
+class GradingEngine(Protocol):
+    @abstractmethod
+    def grade(
+            self,
+            key: AnswerKey,
+            attempt_ids: Sequence[int],
+            answers: Sequence[SubmittedAnswer],
+            multi_choice_credit: MultiChoiceCredit,
+    ) -> GradingResult:
+        """Score every attempt in `attempt_ids`; unanswered questions earn nothing."""
+        raise NotImplementedError
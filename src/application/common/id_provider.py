@@ -1,6 +1,7 @@
 from abc import abstractmethod
 from typing import Protocol
 
+from domain.models.user import User
 from domain.models.user_id import UserId
 
 
@@ -9,3 +10,21 @@ class IdProvider(Protocol):
     @abstractmethod
     def get_current_user_id(self) -> UserId:
         raise NotImplementedError
+
+
+class UserProvider(IdProvider, Protocol):
+
+    @abstractmethod
+    def get_current_user(self) -> User:
+        raise NotImplementedError
+
+
+class AsyncUserProvider(Protocol):
+
+    @abstractmethod
+    async def get_current_user_id(self) -> UserId:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_current_user(self) -> User:
+        raise NotImplementedError
@@ -9,5 +9,10 @@ class Interactor(Generic[InputDTO, OutputDTO]):
         raise NotImplementedError
 
 
+class AsyncInteractor(Generic[InputDTO, OutputDTO]):
+    async def __call__(self, data: InputDTO) -> OutputDTO:
+        raise NotImplementedError
+
+
 InteractorT = TypeVar("InteractorT")
 InteractorFactory = Callable[[], InteractorT]
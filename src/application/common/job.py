@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime
+
+from domain.exceptions.job import JobLeaseLostError
+from domain.models.enums import JobStatus
+from domain.models.job import Job
+
+# last_error is for humans; tracebacks are in the worker log
+MAX_ERROR_LENGTH = 2000
+
+
+def check_lease(job: Job | None, worker_id: str, attempt: int) -> Job:
+    # a worker whose lease expired must not overwrite the new owner's work
+    if (
+        job is None
+        or job.status != JobStatus.RUNNING
+        or job.locked_by != worker_id
+        or job.attempts != attempt
+    ):
+        raise JobLeaseLostError("Job lease was lost.")
+    return job
+
+
+def retry_delay_seconds(attempt: int, base_seconds: float, max_seconds: float) -> float:
+    """Exponential backoff with jitter: half fixed, half random."""
+    delay = min(max_seconds, base_seconds * 2 ** max(attempt - 1, 0))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def finish_job(job: Job, status: JobStatus, now: datetime, error: str | None = None) -> None:
+    job.status = status
+    job.finished_at = now
+    job.locked_by = None
+    job.locked_until = None
+    job.last_error = error[:MAX_ERROR_LENGTH] if error else None
+
+
+def requeue_job(job: Job, run_after: datetime, error: str) -> None:
+    job.status = JobStatus.QUEUED
+    job.run_after = run_after
+    job.locked_by = None
+    job.locked_until = None
+    job.last_error = error[:MAX_ERROR_LENGTH]
@@ -0,0 +1,28 @@
+from abc import abstractmethod
+from datetime import datetime
+from typing import Protocol
+
+from domain.models.job import Job
+
+
+class JobSaver(Protocol):
+    @abstractmethod
+    def save_job(self, job: Job) -> None:
+        raise NotImplementedError
+
+
+class JobReader(Protocol):
+    @abstractmethod
+    def get_job(self, job_id: int, for_update: bool = False) -> Job | None:
+        raise NotImplementedError
+
+
+class JobClaimer(Protocol):
+    @abstractmethod
+    def claim_jobs(self, kind: str, now: datetime, limit: int) -> list[Job]:
+        """
+        Lock up to `limit` claimable jobs of `kind`: queued ones that are
+        due and running ones whose lease expired. Rows locked by another
+        transaction are skipped, not waited for.
+        """
+        raise NotImplementedError
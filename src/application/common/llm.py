@@ -0,0 +1,31 @@
+from abc import abstractmethod
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Protocol
+
+
+class LlmBackendError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class LlmMessage:
+    role: str       # "system" | "user" | "assistant"
+    content: str
+
+
+@dataclass(frozen=True)
+class CompletionRequest:
+    messages: tuple[LlmMessage, ...]
+    model: str | None = None            # None: the client's default model
+    temperature: float = 0.2
+    max_tokens: int = 512
+    stop: tuple[str, ...] = field(default_factory=tuple)
+    # False skips cache lookup and store (e.g. "regenerate")
+    use_cache: bool = True
+
+
+class LlmClient(Protocol):
+    @abstractmethod
+    def stream(self, request: CompletionRequest) -> AsyncIterator[str]:
+        """Yield the completion text chunk by chunk as the model produces it."""
+        raise NotImplementedError
@@ -1,12 +1,33 @@
 from __future__ import annotations
 
-import hashlib
+from abc import abstractmethod
+from typing import Protocol
 
 
-def hash_password(password: str) -> str:
-    # TODO: replace with a stronger hash (bcrypt/argon2).
-    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+class PasswordHasher(Protocol):
+    @abstractmethod
+    def hash(self, password: str) -> str:
+        raise NotImplementedError
 
+    @abstractmethod
+    def verify(self, password: str, password_hash: str) -> bool:
+        raise NotImplementedError
 
-def verify_password(password: str, password_hash: str) -> bool:
-    return hash_password(password) == password_hash
+    @abstractmethod
+    def needs_rehash(self, password_hash: str) -> bool:
+        """The hash is legacy or uses weaker parameters than the current ones."""
+        raise NotImplementedError
+
+
+class AsyncPasswordHasher(Protocol):
+    @abstractmethod
+    async def hash(self, password: str) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def verify(self, password: str, password_hash: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def needs_rehash(self, password_hash: str) -> bool:
+        raise NotImplementedError
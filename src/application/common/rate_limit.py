@@ -0,0 +1,12 @@
+from abc import abstractmethod
+from typing import Protocol
+
+
+class LoginThrottle(Protocol):
+    @abstractmethod
+    async def check(self, client_ip: str | None, email: str) -> None:
+        """
+        Take one attempt for this client and this account.
+        Raises TooManyAttemptsError when either is over its limit.
+        """
+        raise NotImplementedError
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from datetime import datetime
 from typing import Protocol
 
 from domain.models.session import Session
@@ -10,7 +11,45 @@ class SessionReader(Protocol):
         raise NotImplementedError
 
 
+class SessionUserReader(Protocol):
+    @abstractmethod
+    def get_session_with_user(self, session_key: str) -> Session | None:
+        """Load the session with its user and student profile in one query."""
+        raise NotImplementedError
+
+
 class SessionSaver(Protocol):
     @abstractmethod
     def save_session(self, session: Session) -> None:
         raise NotImplementedError
+
+
+class SessionRevoker(Protocol):
+    @abstractmethod
+    def revoke_session(self, session_key: str, revoked_at: datetime) -> None:
+        raise NotImplementedError
+
+
+class AsyncSessionReader(Protocol):
+    @abstractmethod
+    async def get_session_by_key(self, session_key: str) -> Session | None:
+        raise NotImplementedError
+
+
+class AsyncSessionUserReader(Protocol):
+    @abstractmethod
+    async def get_session_with_user(self, session_key: str) -> Session | None:
+        raise NotImplementedError
+
+
+class AsyncSessionRevoker(Protocol):
+    @abstractmethod
+    async def revoke_session(self, session_key: str, revoked_at: datetime) -> None:
+        raise NotImplementedError
+
+
+class SessionPurger(Protocol):
+    @abstractmethod
+    def delete_expired_sessions(self, now: datetime, limit: int) -> int:
+        """Delete up to `limit` expired or revoked sessions; returns how many."""
+        raise NotImplementedError
@@ -0,0 +1,11 @@
+from abc import abstractmethod
+from typing import Protocol
+
+from domain.models.test import Test
+
+
+class TestReader(Protocol):
+    @abstractmethod
+    def get_test(self, test_id: int) -> Test | None:
+        """The published test with its live questions and options, without answer keys."""
+        raise NotImplementedError
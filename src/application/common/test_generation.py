@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from application.common.job import finish_job
+from application.common.test_generator import GeneratedQuestion, TestSpecBrief
+from domain.exceptions.test import InvalidGeneratedTestError
+from domain.models.enums import JobStatus, QuestionType, TestSpecStatus
+from domain.models.job import Job
+from domain.models.test import TestSpec
+
+JOB_KIND = "generate_test_spec"
+
+
+def spec_id_of(job: Job) -> int:
+    return int(job.payload["spec_id"])
+
+
+def brief_of(spec: TestSpec) -> TestSpecBrief:
+    return TestSpecBrief(
+        spec_id=spec.id,
+        topic=spec.topic,
+        grade=spec.grade,
+        difficulty=spec.difficulty,
+        single_choice_count=spec.single_choice_count,
+        multi_choice_count=spec.multi_choice_count,
+        open_count=spec.open_count,
+    )
+
+
+def give_up(job: Job, spec: TestSpec | None, now: datetime, error: str) -> None:
+    """Final failure: the spec goes back to DRAFT so the teacher can retry."""
+    finish_job(job, JobStatus.FAILED, now, error)
+    if spec is not None and spec.status == TestSpecStatus.GENERATING:
+        spec.status = TestSpecStatus.DRAFT
+
+
+def validate_generated(brief: TestSpecBrief, questions: list[GeneratedQuestion]) -> None:
+    counts = {question_type: 0 for question_type in QuestionType}
+    for question in questions:
+        counts[question.type] += 1
+        if not question.text.strip():
+            raise InvalidGeneratedTestError("Empty question text.")
+        if question.type == QuestionType.OPEN:
+            continue
+
+        correct = sum(option.is_correct for option in question.options)
+        if len(question.options) < 2:
+            raise InvalidGeneratedTestError("Choice question needs at least two options.")
+        if question.type == QuestionType.SINGLE_CHOICE and correct != 1:
+            raise InvalidGeneratedTestError("Single-choice question needs exactly one correct option.")
+        if question.type == QuestionType.MULTI_CHOICE and correct < 1:
+            raise InvalidGeneratedTestError("Multi-choice question needs a correct option.")
+
+    expected = {
+        QuestionType.SINGLE_CHOICE: brief.single_choice_count,
+        QuestionType.MULTI_CHOICE: brief.multi_choice_count,
+        QuestionType.OPEN: brief.open_count,
+    }
+    if counts != expected:
+        raise InvalidGeneratedTestError(
+            f"Expected {expected[QuestionType.SINGLE_CHOICE]}/"
+            f"{expected[QuestionType.MULTI_CHOICE]}/{expected[QuestionType.OPEN]} "
+            f"single/multi/open questions, got {counts[QuestionType.SINGLE_CHOICE]}/"
+            f"{counts[QuestionType.MULTI_CHOICE]}/{counts[QuestionType.OPEN]}."
+        )
@@ -0,0 +1,43 @@
+from abc import abstractmethod
+from dataclasses import dataclass
+from typing import Protocol
+
+from domain.models.enums import Difficulty, QuestionType
+
+
+@dataclass(frozen=True)
+class TestSpecBrief:
+    """What a generator needs to know about a spec; no ORM state attached."""
+    spec_id: int
+    topic: str
+    grade: int
+    difficulty: Difficulty
+    single_choice_count: int
+    multi_choice_count: int
+    open_count: int
+
+
+@dataclass(frozen=True)
+class GeneratedOption:
+    text: str
+    is_correct: bool
+
+
+@dataclass(frozen=True)
+class GeneratedQuestion:
+    type: QuestionType
+    text: str
+    explanation: str | None = None
+    points: int = 1
+    options: tuple[GeneratedOption, ...] = ()
+    # open questions only
+    expected_answer: str | None = None
+    rubric: dict | None = None
+
+
+class TestGenerator(Protocol):
+    @abstractmethod
+    async def generate(
+            self, spec: TestSpecBrief, use_cache: bool = True,
+    ) -> list[GeneratedQuestion]:
+        raise NotImplementedError
@@ -0,0 +1,23 @@
+from abc import abstractmethod
+from typing import Protocol
+
+from application.common.test_generator import GeneratedQuestion
+from domain.models.test import TestSpec
+
+
+class TestSpecReader(Protocol):
+    @abstractmethod
+    def get_spec(self, spec_id: int, for_update: bool = False) -> TestSpec | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_spec_with_questions(self, spec_id: int) -> TestSpec | None:
+        """The spec with its questions, options and answer keys, for the editor."""
+        raise NotImplementedError
+
+
+class DraftQuestionSaver(Protocol):
+    @abstractmethod
+    def replace_draft_questions(self, spec_id: int, questions: list[GeneratedQuestion]) -> int:
+        """Swap the spec's draft questions for `questions` in bulk; returns rows inserted."""
+        raise NotImplementedError
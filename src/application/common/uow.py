@@ -8,6 +8,11 @@ class UoW(Protocol):
     def commit(self) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def release(self) -> None:
+        """End a read-only transaction and give its connection back; the UoW stays usable."""
+        raise NotImplementedError
+
     @abstractmethod
     def flush(self) -> None:
         raise NotImplementedError
@@ -15,3 +20,22 @@ class UoW(Protocol):
     @abstractmethod
     def rollback(self) -> None:
         raise NotImplementedError
+
+
+class AsyncUoW(Protocol):
+
+    @abstractmethod
+    async def commit(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def flush(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        raise NotImplementedError
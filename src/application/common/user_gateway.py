@@ -19,3 +19,13 @@ class UserSaver(Protocol):
     @abstractmethod
     def save_user(self, user: User) -> None:
         raise NotImplementedError
+
+
+class AsyncUserReader(Protocol):
+    @abstractmethod
+    async def get_user(self, user_id: UserId) -> User | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_user_by_email(self, email: str) -> User | None:
+        raise NotImplementedError
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Protocol
+
+from application.common.interactor import Interactor
+from application.common.job import check_lease, finish_job
+from application.common.job_gateway import JobReader
+from application.common.test_generation import brief_of, give_up, spec_id_of, validate_generated
+from application.common.test_generator import GeneratedQuestion
+from application.common.test_spec_gateway import DraftQuestionSaver, TestSpecReader
+from application.common.uow import UoW
+from domain.models.enums import JobStatus, TestSpecStatus
+
+
+class TestSpecDbGateway(TestSpecReader, DraftQuestionSaver, Protocol):
+    pass
+
+
+class JobDbGateway(JobReader, Protocol):
+    pass
+
+
+@dataclass
+class CompleteTestGenerationCommand:
+    job_id: int
+    worker_id: str
+    attempt: int
+    questions: list[GeneratedQuestion] = field(default_factory=list)
+
+
+@dataclass
+class CompleteTestGenerationResult:
+    question_count: int
+
+
+class CompleteTestGeneration(
+    Interactor[CompleteTestGenerationCommand, CompleteTestGenerationResult],
+):
+    """GENERATING -> READY_FOR_REVIEW together with all generated rows."""
+
+    def __init__(
+        self,
+        test_spec_db_gateway: TestSpecDbGateway,
+        job_db_gateway: JobDbGateway,
+        uow: UoW,
+    ):
+        self.test_spec_db_gateway = test_spec_db_gateway
+        self.job_db_gateway = job_db_gateway
+        self.uow = uow
+
+    def __call__(self, data: CompleteTestGenerationCommand) -> CompleteTestGenerationResult:
+        now = datetime.utcnow()
+        job = check_lease(
+            self.job_db_gateway.get_job(data.job_id, for_update=True),
+            data.worker_id,
+            data.attempt,
+        )
+        spec = self.test_spec_db_gateway.get_spec(spec_id_of(job), for_update=True)
+        if spec is None or spec.status != TestSpecStatus.GENERATING:
+            give_up(job, spec, now, "Spec is no longer waiting for generation.")
+            self.uow.commit()
+            return CompleteTestGenerationResult(question_count=0)
+
+        # raises before anything is written; the worker reports it as a failure
+        validate_generated(brief_of(spec), data.questions)
+
+        count = self.test_spec_db_gateway.replace_draft_questions(spec.id, data.questions)
+        spec.status = TestSpecStatus.READY_FOR_REVIEW
+        finish_job(job, JobStatus.SUCCEEDED, now)
+        self.uow.commit()
+
+        return CompleteTestGenerationResult(question_count=count)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from application.common.chat import NewChatMessage, build_messages
+from application.common.chat_gateway import ChatMessageSaver, ChatReader, ChatSaver
+from application.common.content_version import ContentVersionBumper, chat_list_version_key
+from application.common.interactor import Interactor
+from application.common.uow import UoW
+from domain.models.chat import ChatSession
+from domain.models.user_id import UserId
+
+
+class ChatDbGateway(ChatReader, ChatSaver, ChatMessageSaver, Protocol):
+    pass
+
+
+@dataclass
+class CreateChatCommand:
+    user_id: UserId
+    messages: list[NewChatMessage] = field(default_factory=list)
+    flow_step: str | None = None
+
+
+@dataclass
+class CreateChatResult:
+    chat_id: int
+    title: str
+
+
+class CreateChat(Interactor[CreateChatCommand, CreateChatResult]):
+    def __init__(
+        self,
+        chat_db_gateway: ChatDbGateway,
+        content_version_gateway: ContentVersionBumper,
+        uow: UoW,
+    ):
+        self.chat_db_gateway = chat_db_gateway
+        self.content_version_gateway = content_version_gateway
+        self.uow = uow
+
+    def __call__(self, data: CreateChatCommand) -> CreateChatResult:
+        number = self.chat_db_gateway.count_chats(data.user_id) + 1
+        chat = ChatSession(
+            id=None,
+            user_id=data.user_id,
+            title=f"Chat #{number}",
+            flow_step=data.flow_step,
+        )
+        self.chat_db_gateway.save_chat(chat)
+        self.chat_db_gateway.save_messages(build_messages(chat, data.messages))
+        self.content_version_gateway.bump_versions([chat_list_version_key(data.user_id)])
+        self.uow.commit()
+
+        return CreateChatResult(chat_id=chat.id, title=chat.title)
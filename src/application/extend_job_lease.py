@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Protocol
+
+from application.common.interactor import Interactor
+from application.common.job import check_lease
+from application.common.job_gateway import JobReader
+from application.common.uow import UoW
+
+
+class JobDbGateway(JobReader, Protocol):
+    pass
+
+
+@dataclass
+class ExtendJobLeaseCommand:
+    job_id: int
+    worker_id: str
+    attempt: int
+    lease_seconds: int
+
+
+class ExtendJobLease(Interactor[ExtendJobLeaseCommand, None]):
+    """Heartbeat of a long-running job; raises JobLeaseLostError if it was reclaimed."""
+
+    def __init__(
+        self,
+        job_db_gateway: JobDbGateway,
+        uow: UoW,
+    ):
+        self.job_db_gateway = job_db_gateway
+        self.uow = uow
+
+    def __call__(self, data: ExtendJobLeaseCommand) -> None:
+        job = check_lease(
+            self.job_db_gateway.get_job(data.job_id, for_update=True),
+            data.worker_id,
+            data.attempt,
+        )
+        job.locked_until = datetime.utcnow() + timedelta(seconds=data.lease_seconds)
+        self.uow.commit()
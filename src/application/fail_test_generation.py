@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Protocol
+
+from application.common.interactor import Interactor
+from application.common.job import check_lease, requeue_job, retry_delay_seconds
+from application.common.job_gateway import JobReader
+from application.common.test_generation import give_up, spec_id_of
+from application.common.test_spec_gateway import TestSpecReader
+from application.common.uow import UoW
+
+
+class TestSpecDbGateway(TestSpecReader, Protocol):
+    pass
+
+
+class JobDbGateway(JobReader, Protocol):
+    pass
+
+
+@dataclass
+class FailTestGenerationCommand:
+    job_id: int
+    worker_id: str
+    attempt: int
+    error: str
+    retry_base_seconds: float = 10.0
+    retry_max_seconds: float = 600.0
+
+
+@dataclass
+class FailTestGenerationResult:
+    # None when the job ran out of attempts
+    retry_at: datetime | None
+
+
+class FailTestGeneration(Interactor[FailTestGenerationCommand, FailTestGenerationResult]):
+    def __init__(
+        self,
+        test_spec_db_gateway: TestSpecDbGateway,
+        job_db_gateway: JobDbGateway,
+        uow: UoW,
+    ):
+        self.test_spec_db_gateway = test_spec_db_gateway
+        self.job_db_gateway = job_db_gateway
+        self.uow = uow
+
+    def __call__(self, data: FailTestGenerationCommand) -> FailTestGenerationResult:
+        now = datetime.utcnow()
+        job = check_lease(
+            self.job_db_gateway.get_job(data.job_id, for_update=True),
+            data.worker_id,
+            data.attempt,
+        )
+
+        if job.attempts >= job.max_attempts:
+            spec = self.test_spec_db_gateway.get_spec(spec_id_of(job), for_update=True)
+            give_up(job, spec, now, data.error)
+            retry_at = None
+        else:
+            delay = retry_delay_seconds(
+                job.attempts, data.retry_base_seconds, data.retry_max_seconds,
+            )
+            retry_at = now + timedelta(seconds=delay)
+            requeue_job(job, retry_at, data.error)
+        self.uow.commit()
+
+        return FailTestGenerationResult(retry_at=retry_at)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from application.common.content_version import ContentVersionReader, chat_version_key
+from application.common.interactor import Interactor
+from domain.exceptions.chat import ChatNotFoundError
+from domain.models.user_id import UserId
+
+
+@dataclass
+class GetContentVersionsQuery:
+    keys: list[str]
+    # also the version of this chat, which must belong to `user_id`
+    chat_id: int | None = None
+    user_id: UserId | None = None
+
+
+class GetContentVersions(Interactor[GetContentVersionsQuery, dict[str, int]]):
+    def __init__(
+        self,
+        content_version_gateway: ContentVersionReader,
+    ):
+        self.content_version_gateway = content_version_gateway
+
+    def __call__(self, data: GetContentVersionsQuery) -> dict[str, int]:
+        versions = self.content_version_gateway.get_versions(data.keys)
+        if data.chat_id is not None:
+            version = self.content_version_gateway.get_chat_version(data.user_id, data.chat_id)
+            if version is None:
+                raise ChatNotFoundError("Chat not found.")
+            versions[chat_version_key(data.chat_id)] = version
+        return versions
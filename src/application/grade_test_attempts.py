@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol
+
+from application.common.attempt_gateway import GradeSaver, SubmittedAttemptReader
+from application.common.compiled_test import CompiledTestReader
+from application.common.grading import GradingEngine, MultiChoiceCredit
+from application.common.interactor import Interactor
+from application.common.uow import UoW
+from domain.exceptions.test import TestNotFoundError
+
+
+class AttemptDbGateway(SubmittedAttemptReader, GradeSaver, Protocol):
+    pass
+
+
+@dataclass
+class GradeTestAttemptsCommand:
+    test_id: int
+    # None grades every submitted attempt of the test
+    attempt_ids: list[int] | None = None
+    multi_choice_credit: MultiChoiceCredit = MultiChoiceCredit.PROPORTIONAL
+    batch_size: int = 500
+
+
+@dataclass
+class GradeTestAttemptsResult:
+    graded: int
+    # a full batch was graded: call again for the rest
+    has_more: bool
+
+
+class GradeTestAttempts(Interactor[GradeTestAttemptsCommand, GradeTestAttemptsResult]):
+    """
+    SUBMITTED -> GRADED for one batch of attempts of a test: the key
+    comes from the compiled test, all answers are scored together and written back with
+    bulk UPDATEs. One batch per call keeps the transaction and its row
+    locks short.
+    """
+
+    def __init__(
+        self,
+        attempt_db_gateway: AttemptDbGateway,
+        test_reader: CompiledTestReader,
+        grading_engine: GradingEngine,
+        uow: UoW,
+    ):
+        self.attempt_db_gateway = attempt_db_gateway
+        self.test_reader = test_reader
+        self.grading_engine = grading_engine
+        self.uow = uow
+
+    def __call__(self, data: GradeTestAttemptsCommand) -> GradeTestAttemptsResult:
+        test = self.test_reader.get_compiled_test(data.test_id)
+        if test is None:
+            raise TestNotFoundError("Test not found.")
+
+        attempt_ids = self.attempt_db_gateway.lock_submitted_attempts(
+            data.test_id, data.attempt_ids, data.batch_size,
+        )
+        if not attempt_ids:
+            return GradeTestAttemptsResult(graded=0, has_more=False)
+
+        answers = self.attempt_db_gateway.get_submitted_answers(attempt_ids)
+        result = self.grading_engine.grade(
+            test.answer_key, attempt_ids, answers, data.multi_choice_credit,
+        )
+        self.attempt_db_gateway.save_grades(result, datetime.utcnow())
+        self.uow.commit()
+
+        return GradeTestAttemptsResult(
+            graded=len(attempt_ids),
+            has_more=len(attempt_ids) == data.batch_size,
+        )
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Protocol
+
+from application.common.chat_gateway import ChatReader
+from application.common.interactor import Interactor
+from domain.models.user_id import UserId
+
+
+class ChatDbGateway(ChatReader, Protocol):
+    pass
+
+
+@dataclass
+class ListChatsQuery:
+    user_id: UserId
+    limit: int = 50
+
+
+@dataclass
+class ChatSummary:
+    id: int
+    title: str
+
+
+class ListChats(Interactor[ListChatsQuery, list[ChatSummary]]):
+    def __init__(
+        self,
+        chat_db_gateway: ChatDbGateway,
+    ):
+        self.chat_db_gateway = chat_db_gateway
+
+    def __call__(self, data: ListChatsQuery) -> list[ChatSummary]:
+        chats = self.chat_db_gateway.list_chats(data.user_id, limit=data.limit)
+        return [
+            ChatSummary(id=chat.id, title=chat.title or f"Chat {chat.id}")
+            for chat in chats
+        ]
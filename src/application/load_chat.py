@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from application.common.chat import get_own_chat
+from application.common.chat_gateway import ChatMessageReader, ChatReader, MessageCursor
+from application.common.interactor import Interactor
+from domain.models.chat import ChatMessage
+from domain.models.user_id import UserId
+
+
+class ChatDbGateway(ChatReader, ChatMessageReader, Protocol):
+    pass
+
+
+@dataclass
+class LoadChatQuery:
+    user_id: UserId
+    chat_id: int
+    # 0 loads only the chat itself, without history
+    limit: int = 50
+    before: MessageCursor | None = None
+
+
+@dataclass
+class ChatView:
+    chat_id: int
+    title: str
+    flow_step: str | None
+    messages: list[ChatMessage] = field(default_factory=list)
+    # cursor for the next older page, None when the history is exhausted
+    older_cursor: MessageCursor | None = None
+
+
+class LoadChat(Interactor[LoadChatQuery, ChatView]):
+    def __init__(
+        self,
+        chat_db_gateway: ChatDbGateway,
+    ):
+        self.chat_db_gateway = chat_db_gateway
+
+    def __call__(self, data: LoadChatQuery) -> ChatView:
+        chat = get_own_chat(self.chat_db_gateway, data.user_id, data.chat_id)
+        view = ChatView(
+            chat_id=chat.id,
+            title=chat.title or f"Chat {chat.id}",
+            flow_step=chat.flow_step,
+        )
+        if data.limit <= 0:
+            return view
+
+        # one extra row tells whether an older page exists
+        messages = self.chat_db_gateway.get_messages(
+            chat.id, limit=data.limit + 1, before=data.before,
+        )
+        if len(messages) > data.limit:
+            messages = messages[1:]
+            oldest = messages[0]
+            view.older_cursor = MessageCursor(created_at=oldest.created_at, id=oldest.id)
+        view.messages = messages
+        return view
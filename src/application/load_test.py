@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+from application.common.compiled_test import CompiledTest, CompiledTestReader
+from application.common.interactor import Interactor
+from domain.exceptions.test import TestNotFoundError
+
+
+@dataclass
+class LoadTestQuery:
+    test_id: int
+
+
+class LoadTest(Interactor[LoadTestQuery, CompiledTest]):
+    """
+    A published test with its questions and options, for serving an
+    attempt. Comes from the compiled test cache when the version matches.
+    """
+
+    def __init__(
+        self,
+        test_reader: CompiledTestReader,
+    ):
+        self.test_reader = test_reader
+
+    def __call__(self, data: LoadTestQuery) -> CompiledTest:
+        test = self.test_reader.get_compiled_test(data.test_id)
+        if test is None:
+            raise TestNotFoundError("Test not found.")
+        return test
@@ -1,21 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Protocol
 from uuid import uuid4
 
-from application.common.interactor import Interactor
-from application.common.passwords import verify_password
-from application.common.session_gateway import SessionReader, SessionSaver
-from application.common.uow import UoW
-from application.common.user_gateway import UserReader
+from application.common.access_token import AccessClaims
+from application.common.interactor import AsyncInteractor, Interactor
+from application.common.passwords import AsyncPasswordHasher, PasswordHasher
+from application.common.session_gateway import AsyncSessionReader, SessionReader, SessionSaver
+from application.common.uow import AsyncUoW, UoW
+from application.common.user_gateway import AsyncUserReader, UserReader, UserSaver
 from domain.exceptions.auth import AuthenticationError
 from domain.models.session import Session
+from domain.models.user import User
 from domain.models.user_id import UserId
 
 
-class UserDbGateway(UserReader, Protocol):
+class UserDbGateway(UserReader, UserSaver, Protocol):
     pass
 
 
@@ -23,6 +25,14 @@ class SessionDbGateway(SessionReader, SessionSaver, Protocol):
     pass
 
 
+class AsyncUserDbGateway(AsyncUserReader, UserSaver, Protocol):
+    pass
+
+
+class AsyncSessionDbGateway(AsyncSessionReader, SessionSaver, Protocol):
+    pass
+
+
 @dataclass
 class LoginStudentCommand:
     email: str
@@ -35,6 +45,43 @@ class LoginStudentResult:
     session_key: str
     full_name: str
     grade: int | None
+    claims: AccessClaims
+
+
+def _normalize_email(email: str) -> str:
+    email = email.strip().lower()
+    if "@" not in email or "." not in email:
+        raise AuthenticationError("Email is invalid.")
+    return email
+
+
+def _require_user(user: User | None) -> User:
+    if not user:
+        raise AuthenticationError("User not found.")
+    return user
+
+
+def _new_session(user: User, ttl: timedelta) -> Session:
+    now = datetime.utcnow()
+    return Session(
+        id=None,
+        user_id=None,
+        session_key=uuid4().hex,
+        created_at=now,
+        expires_at=now + ttl,
+        user=user,
+    )
+
+
+def _login_result(user: User, session: Session) -> LoginStudentResult:
+    grade = user.student_profile.grade if user.student_profile else None
+    return LoginStudentResult(
+        user_id=user.id,
+        session_key=session.session_key,
+        full_name=user.full_name or user.email,
+        grade=grade,
+        claims=AccessClaims.of(user),
+    )
 
 
 class LoginStudent(Interactor[LoginStudentCommand, LoginStudentResult]):
@@ -42,38 +89,62 @@ class LoginStudent(Interactor[LoginStudentCommand, LoginStudentResult]):
         self,
         user_db_gateway: UserDbGateway,
         session_db_gateway: SessionDbGateway,
+        password_hasher: PasswordHasher,
+        session_ttl: timedelta,
         uow: UoW,
     ):
         self.user_db_gateway = user_db_gateway
         self.session_db_gateway = session_db_gateway
+        self.password_hasher = password_hasher
+        self.session_ttl = session_ttl
         self.uow = uow
 
     def __call__(self, data: LoginStudentCommand) -> LoginStudentResult:
-        email = data.email.strip().lower()
-        if "@" not in email or "." not in email:
-            raise AuthenticationError("Email is invalid.")
-
-        user = self.user_db_gateway.get_user_by_email(email)
-        if not user:
-            raise AuthenticationError("User not found.")
-        if not verify_password(data.password, user.password_hash):
+        email = _normalize_email(data.email)
+        user = _require_user(self.user_db_gateway.get_user_by_email(email))
+        # don't sit on a pooled connection while the password waits for a KDF thread
+        self.uow.release()
+        if not self.password_hasher.verify(data.password, user.password_hash):
             raise AuthenticationError("Invalid credentials.")
+        if self.password_hasher.needs_rehash(user.password_hash):
+            # legacy SHA-256 or older KDF parameters: upgrade while we have the password
+            user.password_hash = self.password_hasher.hash(data.password)
+            self.user_db_gateway.save_user(user)
 
-        session_key = uuid4().hex
-        session = Session(
-            id=None,
-            user_id=None,
-            session_key=session_key,
-            created_at=datetime.utcnow(),
-            user=user,
-        )
+        session = _new_session(user, self.session_ttl)
         self.session_db_gateway.save_session(session)
         self.uow.commit()
 
-        grade = user.student_profile.grade if user.student_profile else None
-        return LoginStudentResult(
-            user_id=user.id,
-            session_key=session_key,
-            full_name=user.full_name or user.email,
-            grade=grade,
-        )
+        return _login_result(user, session)
+
+
+class AsyncLoginStudent(AsyncInteractor[LoginStudentCommand, LoginStudentResult]):
+    def __init__(
+        self,
+        user_db_gateway: AsyncUserDbGateway,
+        session_db_gateway: AsyncSessionDbGateway,
+        password_hasher: AsyncPasswordHasher,
+        session_ttl: timedelta,
+        uow: AsyncUoW,
+    ):
+        self.user_db_gateway = user_db_gateway
+        self.session_db_gateway = session_db_gateway
+        self.password_hasher = password_hasher
+        self.session_ttl = session_ttl
+        self.uow = uow
+
+    async def __call__(self, data: LoginStudentCommand) -> LoginStudentResult:
+        email = _normalize_email(data.email)
+        user = _require_user(await self.user_db_gateway.get_user_by_email(email))
+        await self.uow.release()
+        if not await self.password_hasher.verify(data.password, user.password_hash):
+            raise AuthenticationError("Invalid credentials.")
+        if self.password_hasher.needs_rehash(user.password_hash):
+            user.password_hash = await self.password_hasher.hash(data.password)
+            self.user_db_gateway.save_user(user)
+
+        session = _new_session(user, self.session_ttl)
+        self.session_db_gateway.save_session(session)
+        await self.uow.commit()
+
+        return _login_result(user, session)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol
+
+from application.common.interactor import AsyncInteractor, Interactor
+from application.common.session_gateway import AsyncSessionRevoker, SessionRevoker
+from application.common.uow import AsyncUoW, UoW
+
+
+class SessionDbGateway(SessionRevoker, Protocol):
+    pass
+
+
+class AsyncSessionDbGateway(AsyncSessionRevoker, Protocol):
+    pass
+
+
+@dataclass
+class LogoutStudentCommand:
+    session_key: str
+
+
+class LogoutStudent(Interactor[LogoutStudentCommand, None]):
+    def __init__(
+        self,
+        session_db_gateway: SessionDbGateway,
+        uow: UoW,
+    ):
+        self.session_db_gateway = session_db_gateway
+        self.uow = uow
+
+    def __call__(self, data: LogoutStudentCommand) -> None:
+        self.session_db_gateway.revoke_session(
+            data.session_key, revoked_at=datetime.utcnow(),
+        )
+        self.uow.commit()
+
+
+class AsyncLogoutStudent(AsyncInteractor[LogoutStudentCommand, None]):
+    def __init__(
+        self,
+        session_db_gateway: AsyncSessionDbGateway,
+        uow: AsyncUoW,
+    ):
+        self.session_db_gateway = session_db_gateway
+        self.uow = uow
+
+    async def __call__(self, data: LogoutStudentCommand) -> None:
+        await self.session_db_gateway.revoke_session(
+            data.session_key, revoked_at=datetime.utcnow(),
+        )
+        await self.uow.commit()
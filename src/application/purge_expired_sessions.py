@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from application.common.interactor import Interactor
+from application.common.session_gateway import SessionPurger
+from application.common.uow import UoW
+
+
+@dataclass
+class PurgeExpiredSessionsCommand:
+    batch_size: int = 1000
+
+
+@dataclass
+class PurgeExpiredSessionsResult:
+    deleted: int
+    # a full batch was deleted: call again for the rest
+    has_more: bool
+
+
+class PurgeExpiredSessions(Interactor[PurgeExpiredSessionsCommand, PurgeExpiredSessionsResult]):
+    """
+    Deletes one batch of expired or revoked sessions. Small batches keep
+    each DELETE short, so logins writing to the same table never wait long.
+    """
+
+    def __init__(
+        self,
+        session_db_gateway: SessionPurger,
+        uow: UoW,
+    ):
+        self.session_db_gateway = session_db_gateway
+        self.uow = uow
+
+    def __call__(self, data: PurgeExpiredSessionsCommand) -> PurgeExpiredSessionsResult:
+        deleted = self.session_db_gateway.delete_expired_sessions(datetime.utcnow(), data.batch_size)
+        self.uow.commit()
+        return PurgeExpiredSessionsResult(deleted=deleted, has_more=deleted >= data.batch_size)
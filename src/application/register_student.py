@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import uuid4
 from typing import Protocol
 
-from application.common.interactor import Interactor
-from application.common.passwords import hash_password
-from application.common.session_gateway import SessionReader, SessionSaver
-from application.common.uow import UoW
-from application.common.user_gateway import UserReader, UserSaver
+from application.common.access_token import AccessClaims
+from application.common.interactor import AsyncInteractor, Interactor
+from application.common.passwords import AsyncPasswordHasher, PasswordHasher
+from application.common.session_gateway import AsyncSessionReader, SessionReader, SessionSaver
+from application.common.uow import AsyncUoW, UoW
+from application.common.user_gateway import AsyncUserReader, UserReader, UserSaver
 from domain.exceptions.auth import RegistrationError
 from domain.models.enums import UserRole
 from domain.models.session import Session
@@ -25,6 +26,14 @@ class SessionDbGateway(SessionReader, SessionSaver, Protocol):
     pass
 
 
+class AsyncUserDbGateway(AsyncUserReader, UserSaver, Protocol):
+    pass
+
+
+class AsyncSessionDbGateway(AsyncSessionReader, SessionSaver, Protocol):
+    pass
+
+
 @dataclass
 class RegisterStudentCommand:
     full_name: str
@@ -39,6 +48,48 @@ class RegisterStudentResult:
     session_key: str
     full_name: str
     grade: int
+    claims: AccessClaims
+
+
+def _validate(data: RegisterStudentCommand) -> tuple[str, str]:
+    email = data.email.strip().lower()
+    full_name = data.full_name.strip()
+
+    if not full_name:
+        raise RegistrationError("Name is required.")
+    if "@" not in email or "." not in email:
+        raise RegistrationError("Email is invalid.")
+    if len(data.password) < 6:
+        raise RegistrationError("Password must be at least 6 characters.")
+    if not (1 <= data.grade <= 12):
+        raise RegistrationError("Grade must be between 1 and 12.")
+    return email, full_name
+
+
+def _new_student(
+        data: RegisterStudentCommand, email: str, full_name: str, password_hash: str,
+) -> User:
+    user = User(
+        id=None,
+        email=email,
+        password_hash=password_hash,
+        role=UserRole.STUDENT,
+        full_name=full_name,
+    )
+    user.student_profile = StudentProfile(user_id=None, grade=data.grade)
+    return user
+
+
+def _new_session(user: User, ttl: timedelta) -> Session:
+    now = datetime.utcnow()
+    return Session(
+        id=None,
+        user_id=None,
+        session_key=uuid4().hex,
+        created_at=now,
+        expires_at=now + ttl,
+        user=user,
+    )
 
 
 class RegisterStudent(Interactor[RegisterStudentCommand, RegisterStudentResult]):
@@ -46,58 +97,83 @@ class RegisterStudent(Interactor[RegisterStudentCommand, RegisterStudentResult])
         self,
         user_db_gateway: UserDbGateway,
         session_db_gateway: SessionDbGateway,
+        password_hasher: PasswordHasher,
+        session_ttl: timedelta,
         uow: UoW,
     ):
         self.user_db_gateway = user_db_gateway
         self.session_db_gateway = session_db_gateway
+        self.password_hasher = password_hasher
+        self.session_ttl = session_ttl
         self.uow = uow
 
     def __call__(self, data: RegisterStudentCommand) -> RegisterStudentResult:
-        email = data.email.strip().lower()
-        full_name = data.full_name.strip()
-
-        if not full_name:
-            raise RegistrationError("Name is required.")
-        if "@" not in email or "." not in email:
-            raise RegistrationError("Email is invalid.")
-        if len(data.password) < 6:
-            raise RegistrationError("Password must be at least 6 characters.")
-        if not (1 <= data.grade <= 12):
-            raise RegistrationError("Grade must be between 1 and 12.")
+        email, full_name = _validate(data)
 
         existing = self.user_db_gateway.get_user_by_email(email)
         if existing:
             raise RegistrationError("User already exists.")
+        # don't sit on a pooled connection while the password waits for a KDF thread
+        self.uow.release()
 
-        user = User(
-            id=None,
-            email=email,
-            password_hash=hash_password(data.password),
-            role=UserRole.STUDENT,
+        user = _new_student(data, email, full_name, self.password_hasher.hash(data.password))
+        self.user_db_gateway.save_user(user)
+        self.uow.flush()
+        if user.id is None:
+            raise RegistrationError("Failed to create user.")
+
+        session = _new_session(user, self.session_ttl)
+        self.session_db_gateway.save_session(session)
+
+        self.uow.commit()
+
+        return RegisterStudentResult(
+            user_id=user.id,
+            session_key=session.session_key,
             full_name=full_name,
+            grade=data.grade,
+            claims=AccessClaims.of(user),
         )
-        user.student_profile = StudentProfile(user_id=None, grade=data.grade)
 
+
+class AsyncRegisterStudent(AsyncInteractor[RegisterStudentCommand, RegisterStudentResult]):
+    def __init__(
+        self,
+        user_db_gateway: AsyncUserDbGateway,
+        session_db_gateway: AsyncSessionDbGateway,
+        password_hasher: AsyncPasswordHasher,
+        session_ttl: timedelta,
+        uow: AsyncUoW,
+    ):
+        self.user_db_gateway = user_db_gateway
+        self.session_db_gateway = session_db_gateway
+        self.password_hasher = password_hasher
+        self.session_ttl = session_ttl
+        self.uow = uow
+
+    async def __call__(self, data: RegisterStudentCommand) -> RegisterStudentResult:
+        email, full_name = _validate(data)
+
+        existing = await self.user_db_gateway.get_user_by_email(email)
+        if existing:
+            raise RegistrationError("User already exists.")
+        await self.uow.release()
+
+        user = _new_student(data, email, full_name, await self.password_hasher.hash(data.password))
         self.user_db_gateway.save_user(user)
-        self.uow.flush()
+        await self.uow.flush()
         if user.id is None:
             raise RegistrationError("Failed to create user.")
 
-        session_key = uuid4().hex
-        session = Session(
-            id=None,
-            user_id=None,
-            session_key=session_key,
-            created_at=datetime.utcnow(),
-            user=user,
-        )
+        session = _new_session(user, self.session_ttl)
         self.session_db_gateway.save_session(session)
 
-        self.uow.commit()
+        await self.uow.commit()
 
         return RegisterStudentResult(
             user_id=user.id,
-            session_key=session_key,
+            session_key=session.session_key,
             full_name=full_name,
             grade=data.grade,
+            claims=AccessClaims.of(user),
         )
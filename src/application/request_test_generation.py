@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol
+
+from application.common.interactor import Interactor
+from application.common.job_gateway import JobSaver
+from application.common.test_generation import JOB_KIND
+from application.common.test_spec_gateway import TestSpecReader
+from application.common.uow import UoW
+from domain.exceptions.test import InvalidTestSpecStatusError, TestSpecNotFoundError
+from domain.models.enums import TestSpecStatus
+from domain.models.job import Job
+from domain.models.user_id import UserId
+
+
+class TestSpecDbGateway(TestSpecReader, Protocol):
+    pass
+
+
+class JobDbGateway(JobSaver, Protocol):
+    pass
+
+
+@dataclass
+class RequestTestGenerationCommand:
+    teacher_id: UserId
+    spec_id: int
+    max_attempts: int = 5
+
+
+@dataclass
+class RequestTestGenerationResult:
+    job_id: int
+
+
+class RequestTestGeneration(Interactor[RequestTestGenerationCommand, RequestTestGenerationResult]):
+    """DRAFT -> GENERATING; the spec and its job are written in one transaction."""
+
+    def __init__(
+        self,
+        test_spec_db_gateway: TestSpecDbGateway,
+        job_db_gateway: JobDbGateway,
+        uow: UoW,
+    ):
+        self.test_spec_db_gateway = test_spec_db_gateway
+        self.job_db_gateway = job_db_gateway
+        self.uow = uow
+
+    def __call__(self, data: RequestTestGenerationCommand) -> RequestTestGenerationResult:
+        spec = self.test_spec_db_gateway.get_spec(data.spec_id, for_update=True)
+        if spec is None or spec.teacher_id != data.teacher_id:
+            raise TestSpecNotFoundError("Test spec not found.")
+        if spec.status != TestSpecStatus.DRAFT:
+            raise InvalidTestSpecStatusError("Only a draft spec can be generated.")
+
+        spec.status = TestSpecStatus.GENERATING
+        job = Job(
+            id=None,
+            kind=JOB_KIND,
+            payload={"spec_id": spec.id},
+            max_attempts=data.max_attempts,
+            run_after=datetime.utcnow(),
+        )
+        self.job_db_gateway.save_job(job)
+        self.uow.commit()
+
+        return RequestTestGenerationResult(job_id=job.id)
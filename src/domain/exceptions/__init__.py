@@ -1 +1 @@
-__all__ = ["auth"]
+__all__ = ["auth", "chat", "job", "test"]
@@ -4,3 +4,15 @@ class AuthenticationError(Exception):
 
 class RegistrationError(Exception):
     pass
+
+
+class PasswordHashingBusyError(Exception):
+    """Too many password hashes are already queued; try again shortly."""
+
+
+class TooManyAttemptsError(Exception):
+    """Login or registration attempts exceeded the rate limit."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("Too many attempts. Please wait a moment and try again.")
+        self.retry_after = retry_after
@@ -0,0 +1,6 @@
+class ChatNotFoundError(Exception):
+    pass
+
+
+class InvalidChatActionError(Exception):
+    pass
@@ -0,0 +1,18 @@
+class TestSpecNotFoundError(Exception):
+    pass
+
+
+class InvalidTestSpecStatusError(Exception):
+    pass
+
+
+class InvalidGeneratedTestError(Exception):
+    pass
+
+
+class TestNotFoundError(Exception):
+    pass
+
+
+class InvalidAnswerKeyError(Exception):
+    pass
@@ -14,6 +14,9 @@ class ChatSession:
     id: int | None
     user_id: int
     kind: ChatKind = ChatKind.ASSISTANT_CHAT
+    title: str | None = None
+    # current step of the scripted (buttons-only) conversation
+    flow_step: str | None = None
     created_at: datetime | None = None
     user: User | None = None
     messages: list[ChatMessage] = field(default_factory=list)
@@ -25,5 +28,7 @@ class ChatMessage:
     session_id: int
     role: MessageRole
     content: str
+    # presentation hint: question / feedback / info / user_choice
+    kind: str | None = None
     created_at: datetime | None = None
     session: ChatSession | None = None
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from domain.models.enums import JobStatus
+
+
+@dataclass
+class Job:
+    id: int | None
+    kind: str
+    payload: dict = field(default_factory=dict)
+    status: JobStatus = JobStatus.QUEUED
+    # claims so far; a claim whose lease expired still counts
+    attempts: int = 0
+    max_attempts: int = 5
+    # not claimable before this moment (retry backoff)
+    run_after: datetime | None = None
+    # lease of the worker currently running the job
+    locked_by: str | None = None
+    locked_until: datetime | None = None
+    last_error: str | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    finished_at: datetime | None = None
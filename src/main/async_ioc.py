@@ -0,0 +1,277 @@
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import AsyncIterator, Callable, Generic
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session as OrmSession
+
+from adapters.auth.passwords import (
+    AsyncOffloadedPasswordHasher, KdfExecutor, PasswordConfig, ScryptPasswordHasher,
+)
+from adapters.cache.compiled_test_cache import CachedCompiledTestGateway, CompiledTestCache
+from adapters.cache.lru import LruTtlCache
+from adapters.cache.session_cache import AsyncCachedSessionGateway, SessionCache
+from adapters.database.attempt_db import AttemptGateway
+from adapters.database.session_db import AsyncSessionGateway, SessionGateway
+from adapters.database.chat_db import ChatGateway
+from adapters.database.content_version_db import ContentVersionGateway
+from adapters.database.job_db import JobGateway
+from adapters.database.pool import PoolConfig, PoolMonitor
+from adapters.database.sqlalchemy import (
+    QueryMonitor, make_async_engine, make_async_session_factory, prewarm_async_pool,
+)
+from adapters.database.sqlalchemy_uow import AsyncSqlAlchemyUoW, SqlAlchemyUoW
+from adapters.database.test_db import AnswerKeyGateway, PublishedTestGateway
+from adapters.database.test_spec_db import TestSpecGateway
+from adapters.database.user_db import AsyncUserGateway
+from adapters.grading.numpy_engine import NumpyGradingEngine
+from application.append_chat_messages import AppendChatMessages
+from application.authenticate import AsyncAuthenticateCurrentUser
+from application.claim_test_generation import ClaimTestGeneration
+from application.complete_test_generation import CompleteTestGeneration
+from application.common.id_provider import AsyncUserProvider
+from application.common.interactor import AsyncInteractor, InputDTO, Interactor, OutputDTO
+from application.create_chat import CreateChat
+from application.extend_job_lease import ExtendJobLease
+from application.fail_test_generation import FailTestGeneration
+from application.get_content_versions import GetContentVersions
+from application.grade_test_attempts import GradeTestAttempts
+from application.list_chats import ListChats
+from application.load_chat import LoadChat
+from application.load_test import LoadTest
+from application.login_student import AsyncLoginStudent
+from application.logout_student import AsyncLogoutStudent
+from application.purge_expired_sessions import PurgeExpiredSessions
+from application.register_student import AsyncRegisterStudent
+from application.request_test_generation import RequestTestGeneration
+from presentation.interactor_factory import AsyncInteractorFactory
+
+
+class GreenletInteractor(AsyncInteractor[InputDTO, OutputDTO], Generic[InputDTO, OutputDTO]):
+    """
+    Runs a sync interactor on an AsyncSession via `run_sync`: the ORM code
+    is shared with the sync stack while the I/O stays on the event loop.
+    """
+
+    def __init__(
+            self,
+            session_factory: async_sessionmaker[AsyncSession],
+            build: Callable[[OrmSession, SqlAlchemyUoW], Interactor[InputDTO, OutputDTO]],
+    ):
+        self.session_factory = session_factory
+        self.build = build
+
+    def _call_sync(self, session: OrmSession, data: InputDTO) -> OutputDTO:
+        with SqlAlchemyUoW(session) as uow:
+            return self.build(session, uow)(data)
+
+    async def __call__(self, data: InputDTO) -> OutputDTO:
+        async with self.session_factory() as session:
+            return await session.run_sync(self._call_sync, data)
+
+
+class AsyncIoC(AsyncInteractorFactory):
+
+    def __init__(
+            self,
+            db_uri: str,
+            pool: PoolConfig = PoolConfig(),
+            passwords: PasswordConfig = PasswordConfig(),
+            session_cache_size: int = 10_000,
+            session_cache_ttl_seconds: int = 30,
+            session_ttl: timedelta = timedelta(days=30),
+            compiled_test_cache_size: int = 1_000,
+            slow_query_ms: float = 200.0,
+    ):
+        self.db_uri = db_uri
+        self.session_ttl = session_ttl
+
+        self.pool_monitor = PoolMonitor()
+        self.query_monitor = QueryMonitor(slow_query_ms=slow_query_ms)
+        self.engine = make_async_engine(self.db_uri, pool, self.pool_monitor, self.query_monitor)
+        self.session_factory = make_async_session_factory(self.engine)
+        self.session_cache: SessionCache = LruTtlCache(
+            max_size=session_cache_size,
+            ttl_seconds=session_cache_ttl_seconds,
+        )
+        self.compiled_test_cache = CompiledTestCache(max_size=compiled_test_cache_size)
+        self.grading_engine = NumpyGradingEngine()
+        self.kdf_executor = KdfExecutor(passwords.kdf_workers, passwords.kdf_max_queue)
+        self.password_hasher = AsyncOffloadedPasswordHasher(ScryptPasswordHasher(passwords), self.kdf_executor)
+
+    async def prewarm(self, connections: int) -> None:
+        await prewarm_async_pool(self.engine, connections)
+
+    async def dispose(self) -> None:
+        self.kdf_executor.shutdown()
+        await self.engine.dispose()
+
+    def session_gateway(self, session: AsyncSession) -> AsyncCachedSessionGateway:
+        return AsyncCachedSessionGateway(AsyncSessionGateway(session), self.session_cache)
+
+    def test_gateway(self, session: OrmSession) -> CachedCompiledTestGateway:
+        return CachedCompiledTestGateway(PublishedTestGateway(session), self.compiled_test_cache)
+
+    def answer_key_gateway(self, session: OrmSession) -> CachedCompiledTestGateway:
+        return CachedCompiledTestGateway(AnswerKeyGateway(session), self.compiled_test_cache)
+
+    @asynccontextmanager
+    async def authenticate_current_user(
+            self, user_provider: AsyncUserProvider,
+    ) -> AsyncIterator[AsyncAuthenticateCurrentUser]:
+        yield AsyncAuthenticateCurrentUser(user_provider=user_provider)
+
+    @asynccontextmanager
+    async def register_student(self) -> AsyncIterator[AsyncRegisterStudent]:
+        async with AsyncSqlAlchemyUoW(self.session_factory()) as uow:
+            yield AsyncRegisterStudent(
+                user_db_gateway=AsyncUserGateway(uow.session),
+                session_db_gateway=AsyncSessionGateway(uow.session),
+                password_hasher=self.password_hasher,
+                session_ttl=self.session_ttl,
+                uow=uow,
+            )
+
+    @asynccontextmanager
+    async def login_student(self) -> AsyncIterator[AsyncLoginStudent]:
+        async with AsyncSqlAlchemyUoW(self.session_factory()) as uow:
+            yield AsyncLoginStudent(
+                user_db_gateway=AsyncUserGateway(uow.session),
+                session_db_gateway=AsyncSessionGateway(uow.session),
+                password_hasher=self.password_hasher,
+                session_ttl=self.session_ttl,
+                uow=uow,
+            )
+
+    @asynccontextmanager
+    async def logout_student(self) -> AsyncIterator[AsyncLogoutStudent]:
+        async with AsyncSqlAlchemyUoW(self.session_factory()) as uow:
+            yield AsyncLogoutStudent(
+                session_db_gateway=self.session_gateway(uow.session),
+                uow=uow,
+            )
+
+    @asynccontextmanager
+    async def create_chat(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: CreateChat(
+                chat_db_gateway=ChatGateway(session),
+                content_version_gateway=ContentVersionGateway(session),
+                uow=uow,
+            ),
+        )
+
+    @asynccontextmanager
+    async def list_chats(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: ListChats(chat_db_gateway=ChatGateway(session)),
+        )
+
+    @asynccontextmanager
+    async def load_chat(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: LoadChat(chat_db_gateway=ChatGateway(session)),
+        )
+
+    @asynccontextmanager
+    async def get_content_versions(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: GetContentVersions(
+                content_version_gateway=ContentVersionGateway(session),
+            ),
+        )
+
+    @asynccontextmanager
+    async def append_chat_messages(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: AppendChatMessages(
+                chat_db_gateway=ChatGateway(session),
+                content_version_gateway=ContentVersionGateway(session),
+                uow=uow,
+            ),
+        )
+
+    @asynccontextmanager
+    async def request_test_generation(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: RequestTestGeneration(
+                test_spec_db_gateway=TestSpecGateway(session),
+                job_db_gateway=JobGateway(session),
+                uow=uow,
+            ),
+        )
+
+    @asynccontextmanager
+    async def claim_test_generation(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: ClaimTestGeneration(
+                test_spec_db_gateway=TestSpecGateway(session),
+                job_db_gateway=JobGateway(session),
+                uow=uow,
+            ),
+        )
+
+    @asynccontextmanager
+    async def complete_test_generation(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: CompleteTestGeneration(
+                test_spec_db_gateway=TestSpecGateway(session),
+                job_db_gateway=JobGateway(session),
+                uow=uow,
+            ),
+        )
+
+    @asynccontextmanager
+    async def fail_test_generation(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: FailTestGeneration(
+                test_spec_db_gateway=TestSpecGateway(session),
+                job_db_gateway=JobGateway(session),
+                uow=uow,
+            ),
+        )
+
+    @asynccontextmanager
+    async def extend_job_lease(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: ExtendJobLease(job_db_gateway=JobGateway(session), uow=uow),
+        )
+
+    @asynccontextmanager
+    async def load_test(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: LoadTest(test_reader=self.test_gateway(session)),
+        )
+
+    @asynccontextmanager
+    async def grade_test_attempts(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: GradeTestAttempts(
+                attempt_db_gateway=AttemptGateway(session),
+                test_reader=self.answer_key_gateway(session),
+                grading_engine=self.grading_engine,
+                uow=uow,
+            ),
+        )
+
+    @asynccontextmanager
+    async def purge_expired_sessions(self) -> AsyncIterator[GreenletInteractor]:
+        yield GreenletInteractor(
+            self.session_factory,
+            lambda session, uow: PurgeExpiredSessions(
+                session_db_gateway=SessionGateway(session),
+                uow=uow,
+            ),
+        )
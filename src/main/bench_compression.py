@@ -0,0 +1,77 @@
+"""
+Bytes saved vs CPU spent compressing the UI's responses, per route:
+
+    python -m main.bench_compression --iterations 200
+
+Bodies are rendered from the real templates with a full page of chat
+history. Run it on production hardware before raising
+COMPRESSION_GZIP_LEVEL / COMPRESSION_BROTLI_QUALITY.
+"""
+import argparse
+import time
+from datetime import datetime
+
+from adapters.compression.codecs import BROTLI_AVAILABLE, CompressionLevels, compress
+from application.common.chat_gateway import MessageCursor
+from application.list_chats import ChatSummary
+from presentation.web_api.ui import (
+    CHAT_PAGE_SIZE, ChoiceVM, MessageVM, _render_chat_view, _render_chats_list, templates,
+)
+
+
+def _messages(n: int) -> list[MessageVM]:
+    messages = []
+    for i in range(n):
+        if i % 2:
+            messages.append(MessageVM(role="user", kind="user_choice", text=f"Answer {i}"))
+        else:
+            messages.append(MessageVM(role="assistant", kind="question", text=f"Q{i}) 1/{i + 2} + 1/4 = ?"))
+    return messages
+
+
+def _route_bodies() -> dict[str, bytes]:
+    chats = [ChatSummary(id=i, title=f"Chat {i}") for i in range(50, 0, -1)]
+    chats_html = _render_chats_list(chats, 50)
+    chat_html = _render_chat_view(
+        50, _messages(CHAT_PAGE_SIZE), "question_1", MessageCursor(created_at=datetime(2026, 1, 1), id=1),
+    )
+    actions_html = templates.get_template("partials/chat_actions.html").render(
+        chat_id=50, choices=[ChoiceVM(id="a", label="3/4"), ChoiceVM(id="b", label="2/6")], streaming=False,
+    )
+    messages_html = templates.get_template("partials/chat_messages.html").render(messages=_messages(2))
+    return {
+        "GET /partials/chats": chats_html.encode(),
+        # the bodies the handlers assemble around the fragments
+        "GET /partials/chat/{chat_id}": f"{chat_html}\n<div id=\"chats-list\" hx-swap-oob=\"innerHTML\">{chats_html}</div>".encode(),
+        "POST /chat/{chat_id}/choose": f"{actions_html}\n<div hx-swap-oob=\"beforeend:#chat-messages\">{messages_html}</div>".encode(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    settings = [("gzip", CompressionLevels(gzip_level=level)) for level in (1, 6, 9)]
+    if BROTLI_AVAILABLE:
+        settings += [("br", CompressionLevels(brotli_quality=quality)) for quality in (1, 4, 6, 11)]
+    else:
+        print("brotli is not installed: gzip only")
+
+    print(f"{'route':<30} {'codec':<8} {'bytes':>7} {'out':>7} {'saved':>6} {'cpu us':>8} {'saved B/cpu us':>14}")
+    for route, body in _route_bodies().items():
+        for encoding, levels in settings:
+            level = levels.gzip_level if encoding == "gzip" else levels.brotli_quality
+            started = time.thread_time()
+            for _ in range(args.iterations):
+                compressed = compress(body, encoding, levels)
+            cpu_us = (time.thread_time() - started) / args.iterations * 1e6
+            saved = len(body) - len(compressed)
+            print(
+                f"{route:<30} {encoding + '-' + str(level):<8} {len(body):>7} {len(compressed):>7} "
+                f"{saved / len(body):>6.0%} {cpu_us:>8.1f} {saved / cpu_us if cpu_us else 0.0:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
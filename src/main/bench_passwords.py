@@ -0,0 +1,50 @@
+"""
+Password verification throughput on this machine:
+
+    python -m main.bench_passwords --seconds 5 --workers 4
+
+One login is one verify, so verifies/sec is logins/sec.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import wait
+
+from adapters.auth.passwords import KdfExecutor, PasswordConfig, ScryptPasswordHasher
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--log-n", type=int, default=PasswordConfig.scrypt_log_n)
+    args = parser.parse_args()
+
+    config = PasswordConfig(scrypt_log_n=args.log_n, kdf_workers=args.workers, kdf_max_queue=args.workers)
+    hasher = ScryptPasswordHasher(config)
+    executor = KdfExecutor(config.kdf_workers, config.kdf_max_queue)
+    stored = hasher.hash("correct horse battery staple")
+
+    done = 0
+    started = time.perf_counter()
+    deadline = started + args.seconds
+    in_flight = set()
+    while time.perf_counter() < deadline:
+        # keep every worker busy plus a full queue
+        while len(in_flight) < config.kdf_workers + config.kdf_max_queue:
+            in_flight.add(executor.submit(hasher.verify, "correct horse battery staple", stored))
+        finished, in_flight = wait(in_flight, return_when="FIRST_COMPLETED")
+        done += len(finished)
+    wait(in_flight)
+    done += len(in_flight)
+    elapsed = time.perf_counter() - started
+    executor.shutdown()
+
+    cores = min(args.workers, os.cpu_count() or 1)
+    rate = done / elapsed
+    print(f"scrypt ln={config.scrypt_log_n} r={config.scrypt_r} p={config.scrypt_p}, {args.workers} workers")
+    print(f"{rate:.1f} logins/sec, {rate / cores:.1f} logins/sec per core ({cores} cores)")
+
+
+if __name__ == "__main__":
+    main()
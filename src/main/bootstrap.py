@@ -0,0 +1,141 @@
+"""Wiring shared by the web app and the background worker."""
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+from adapters.auth.passwords import PasswordConfig
+from adapters.cache.lru import LruTtlCache
+from adapters.database.llm_response_db import AsyncLlmResponseStore, LlmResponseStore
+from adapters.database.pool import PoolConfig
+from adapters.database.rate_limit_db import AsyncDbTokenBucketStore, DbTokenBucketStore
+from adapters.llm.cache import CachingLlmClient, ThreadedLlmResponseStore
+from adapters.llm.fake import FakeLlmClient
+from adapters.llm.instrumented import InstrumentedLlmClient, LlmMonitor
+from adapters.llm.openrouter import OpenRouterClient
+from adapters.ratelimit.token_bucket import (
+    AsyncTokenBucketStore, BucketPolicy, MemoryTokenBucketStore, ThreadedTokenBucketStore,
+    TokenBucketThrottle,
+)
+from application.common.llm import LlmClient
+from main.async_ioc import AsyncIoC
+from main.config import WebConfig
+from main.ioc import IoC
+
+
+def pool_config(web_config: WebConfig) -> PoolConfig:
+    return PoolConfig(
+        size=web_config.db_pool_size,
+        max_overflow=web_config.db_max_overflow,
+        timeout=web_config.db_pool_timeout_seconds,
+        recycle=web_config.db_pool_recycle_seconds,
+        pre_ping=web_config.db_pool_pre_ping,
+        statement_timeout_ms=web_config.db_statement_timeout_ms,
+    )
+
+
+def password_config(web_config: WebConfig) -> PasswordConfig:
+    return PasswordConfig(
+        scrypt_log_n=web_config.password_scrypt_log_n,
+        kdf_workers=web_config.password_kdf_workers,
+        kdf_max_queue=web_config.password_kdf_max_queue,
+    )
+
+
+def make_ioc(web_config: WebConfig) -> IoC:
+    return IoC(
+        db_uri=web_config.db_uri,
+        pool=pool_config(web_config),
+        passwords=password_config(web_config),
+        session_cache_size=web_config.session_cache_size,
+        session_cache_ttl_seconds=web_config.session_cache_ttl_seconds,
+        session_ttl=timedelta(days=web_config.refresh_token_expire_days),
+        compiled_test_cache_size=web_config.compiled_test_cache_size,
+        slow_query_ms=web_config.slow_query_ms,
+    )
+
+
+def make_async_ioc(web_config: WebConfig) -> AsyncIoC:
+    return AsyncIoC(
+        db_uri=web_config.db_uri,
+        pool=pool_config(web_config),
+        passwords=password_config(web_config),
+        session_cache_size=web_config.session_cache_size,
+        session_cache_ttl_seconds=web_config.session_cache_ttl_seconds,
+        session_ttl=timedelta(days=web_config.refresh_token_expire_days),
+        compiled_test_cache_size=web_config.compiled_test_cache_size,
+        slow_query_ms=web_config.slow_query_ms,
+    )
+
+
+def login_rate_policies(web_config: WebConfig) -> tuple[BucketPolicy, BucketPolicy]:
+    """(per client IP, per email)"""
+    return (
+        BucketPolicy.per_minute(web_config.login_rate_ip_per_minute, web_config.login_rate_ip_burst),
+        BucketPolicy.per_minute(web_config.login_rate_email_per_minute, web_config.login_rate_email_burst),
+    )
+
+
+def make_login_throttle(web_config: WebConfig, db_ioc: IoC | AsyncIoC) -> TokenBucketThrottle:
+    store: AsyncTokenBucketStore
+    if web_config.rate_limit_backend == "db":
+        if web_config.db_async:
+            store = AsyncDbTokenBucketStore(db_ioc.session_factory)
+        else:
+            store = ThreadedTokenBucketStore(DbTokenBucketStore(db_ioc.session_factory))
+    else:
+        store = MemoryTokenBucketStore(max_keys=web_config.rate_limit_memory_keys)
+    ip_policy, email_policy = login_rate_policies(web_config)
+    return TokenBucketThrottle(store=store, ip_policy=ip_policy, email_policy=email_policy)
+
+
+@dataclass
+class LlmStack:
+    client: LlmClient
+    monitor: LlmMonitor
+    cache: CachingLlmClient | None = None
+    # awaited on shutdown
+    closers: list[Callable[[], Awaitable[None]]] = field(default_factory=list)
+
+
+def make_llm(web_config: WebConfig, db_ioc: IoC | AsyncIoC) -> LlmStack:
+    closers = []
+    if web_config.llm_backend == "openrouter":
+        client = OpenRouterClient(
+            api_key=web_config.openroute_api_key,
+            model=web_config.llm_model,
+            base_url=web_config.llm_base_url,
+            read_timeout_seconds=web_config.llm_read_timeout_seconds,
+        )
+        closers.append(client.aclose)
+    else:
+        client = FakeLlmClient(
+            token_delay_seconds=web_config.llm_fake_token_delay_ms / 1000,
+        )
+
+    cache = None
+    # fake replies must never land in the shared cache and outlive the fake
+    if web_config.llm_cache_enabled and web_config.llm_backend != "fake":
+        if web_config.db_async:
+            store = AsyncLlmResponseStore(db_ioc.session_factory)
+        else:
+            store = ThreadedLlmResponseStore(LlmResponseStore(db_ioc.session_factory))
+        cache = CachingLlmClient(
+            client=client,
+            store=store,
+            memory=LruTtlCache(
+                max_size=web_config.llm_cache_memory_size,
+                ttl_seconds=web_config.llm_cache_memory_ttl_seconds,
+            ),
+            backend=f"{web_config.llm_backend}:{web_config.llm_base_url}",
+            default_model=web_config.llm_model,
+            ttl_seconds=web_config.llm_cache_ttl_seconds,
+        )
+        client = cache
+
+    monitor = LlmMonitor()
+    return LlmStack(
+        client=InstrumentedLlmClient(client, monitor),
+        monitor=monitor,
+        cache=cache,
+        closers=closers,
+    )
@@ -0,0 +1,24 @@
+"""
+Builds fingerprinted, precompressed static assets:
+
+    python -m main.build_assets /opt/build/static
+
+Point STATIC_BUILD_DIR at the output to serve them.
+"""
+import argparse
+from pathlib import Path
+
+from presentation.web_api.assets import build_assets
+from presentation.web_api.ui import STATIC_DIR
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target")
+    args = parser.parse_args()
+    hashed = build_assets(STATIC_DIR, Path(args.target))
+    print(f"Built {len(hashed)} assets into {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,9 @@ from logging import getLogger
 
 logger = getLogger(__name__)
 
+# anyio's default thread limiter, shared by sync handlers and the threaded IoC
+WORKER_THREAD_LIMIT = 40
+
 
 class ConfigParseError(ValueError):
     pass
@@ -15,11 +18,90 @@ class WebConfig:
 
     db_uri: str
 
+    # "hybrid": a signed access token per request, the session row only
+    # when it expires; "session": the session row on every request
+    auth_mode: str
     secret_key: str
     algorithm: str
     access_token_expire_minutes: int
     refresh_token_expire_days: int
 
+    db_async: bool
+
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_timeout_seconds: int
+    db_pool_recycle_seconds: int
+    db_pool_pre_ping: bool
+    db_pool_prewarm: int
+    db_statement_timeout_ms: int
+
+    # per-request SQL statement tracing
+    debug: bool                 # adds X-DB-* headers to responses
+    slow_query_ms: int
+    n_plus_one_threshold: int
+
+    # /metrics; with several uvicorn workers each one writes its
+    # snapshot to metrics_dir and /metrics merges them
+    metrics_dir: str | None
+    metrics_flush_seconds: int
+    # bearer token for /stats/*; unset: the endpoints are not mounted
+    stats_token: str | None
+
+    # password hashing (scrypt) on dedicated threads
+    password_scrypt_log_n: int
+    password_kdf_workers: int
+    password_kdf_max_queue: int
+
+    # login/register throttling: a token bucket per client IP and per email
+    rate_limit_backend: str     # "memory" (per worker) | "db" (shared)
+    rate_limit_memory_keys: int
+    login_rate_ip_per_minute: int
+    login_rate_ip_burst: int
+    login_rate_email_per_minute: int
+    login_rate_email_burst: int
+
+    session_cache_size: int
+    session_cache_ttl_seconds: int
+    compiled_test_cache_size: int
+    fragment_cache_size: int
+
+    # UI templates; they reload on change only with DEBUG=true
+    jinja_bytecode_cache: bool
+    jinja_bytecode_cache_dir: str | None
+    jinja_precompiled_dir: str | None
+    # output of `python -m main.build_assets`; None: hash static/ at startup
+    static_build_dir: str | None
+
+    # br/gzip for whole (non-streamed) responses of at least min_size bytes
+    compression_enabled: bool
+    compression_min_size: int
+    compression_gzip_level: int
+    compression_brotli_quality: int
+
+    llm_backend: str            # "openrouter" | "fake"
+    openroute_api_key: str | None
+    llm_model: str
+    llm_base_url: str
+    llm_read_timeout_seconds: int
+    llm_fake_token_delay_ms: int
+
+    llm_cache_enabled: bool
+    llm_cache_ttl_seconds: int
+    llm_cache_memory_size: int
+    llm_cache_memory_ttl_seconds: int
+
+    # background worker (python -m main.worker)
+    worker_concurrency: int
+    worker_poll_interval_ms: int
+    job_lease_seconds: int
+    job_timeout_seconds: int
+    job_retry_base_seconds: int
+    job_retry_max_seconds: int
+    # expired sessions, LLM responses and idle rate-limit buckets
+    sweep_interval_seconds: int
+    session_sweep_batch_size: int
+
     # rabbitmq_host: str
     # rabbitmq_user: str
     # rabbitmq_password: str
@@ -29,6 +111,17 @@ class WebConfig:
     # redis_url: str
 
 
+@dataclass
+class LogConfig:
+    level: str                  # root level
+    json: bool
+    # per-logger levels, e.g. {"sqlalchemy.engine": "WARNING"}
+    levels: dict[str, str]
+    # share of DEBUG/INFO records kept per logger, e.g. {"uvicorn.access": 0.1}
+    sample_rates: dict[str, float]
+    queue_size: int
+
+
 def get_str_env(key) -> str:
     val = os.getenv(key)
     if not val:
@@ -37,6 +130,48 @@ def get_str_env(key) -> str:
     return val
 
 
+def get_mapping_env(key) -> dict[str, str]:
+    """`a=1,b.c=2` -> {"a": "1", "b.c": "2"}"""
+    val = os.getenv(key)
+    if not val:
+        return {}
+    mapping = {}
+    for item in val.split(","):
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip():
+            logger.error("%s must be a list of name=value pairs, got %r", key, val)
+            raise ConfigParseError(f"{key} must be a list of name=value pairs")
+        mapping[name.strip()] = value.strip()
+    return mapping
+
+
+def get_int_env(key, default: int) -> int:
+    val = os.getenv(key)
+    if not val:
+        return default
+    try:
+        return int(val)
+    except ValueError as exc:
+        logger.error("%s must be an integer, got %r", key, val)
+        raise ConfigParseError(f"{key} must be an integer") from exc
+
+
+def get_bool_env(key, default: bool) -> bool:
+    val = os.getenv(key)
+    if not val:
+        return default
+    return val.strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_optional_str_env(key) -> str | None:
+    return os.getenv(key) or None
+
+
+def is_async_db_uri(db_uri: str) -> bool:
+    driver = db_uri.split("://", 1)[0]
+    return driver.endswith(("+asyncpg", "+aiosqlite", "+psycopg_async"))
+
+
 def load_web_config():
     login_url = get_str_env('WEB_LOGIN_URL')
 
@@ -48,11 +183,112 @@ def load_web_config():
     # redis_host = get_str_env("REDIS_HOST")
     # redis_url = f'redis://{redis_host}:6379/0'
 
+    db_uri = get_str_env('DB_URI')
+    openroute_api_key = get_optional_str_env('OPENROUTE_API_KEY')
+    llm_backend = get_optional_str_env('LLM_BACKEND') or (
+        "openrouter" if openroute_api_key else "fake"
+    )
+    if llm_backend not in ("openrouter", "fake"):
+        raise ConfigParseError(f"Unknown LLM_BACKEND {llm_backend!r}")
+    if llm_backend == "openrouter" and not openroute_api_key:
+        logger.error("OPENROUTE_API_KEY is not set")
+        raise ConfigParseError("OPENROUTE_API_KEY is not set")
+    auth_mode = get_optional_str_env('AUTH_MODE') or "hybrid"
+    if auth_mode not in ("hybrid", "session"):
+        raise ConfigParseError(f"Unknown AUTH_MODE {auth_mode!r}")
+    rate_limit_backend = get_optional_str_env('RATE_LIMIT_BACKEND') or "memory"
+    if rate_limit_backend not in ("memory", "db"):
+        raise ConfigParseError(f"Unknown RATE_LIMIT_BACKEND {rate_limit_backend!r}")
+    db_pool_size = get_int_env('DB_POOL_SIZE', 20)
+    db_max_overflow = get_int_env('DB_MAX_OVERFLOW', 20)
+    password_kdf_workers = get_int_env('PASSWORD_KDF_WORKERS', min(4, os.cpu_count() or 1))
+    password_kdf_max_queue = get_int_env('PASSWORD_KDF_MAX_QUEUE', 8)
+    # every admitted sign-in still needs a worker thread and, once hashed, a
+    # pooled connection; keep them to half of either so browsing never starves
+    kdf_admission_limit = min(db_pool_size + db_max_overflow, WORKER_THREAD_LIMIT) // 2
+    if password_kdf_workers + password_kdf_max_queue > kdf_admission_limit:
+        raise ConfigParseError(
+            "PASSWORD_KDF_WORKERS + PASSWORD_KDF_MAX_QUEUE must not exceed "
+            f"{kdf_admission_limit} (half of the DB pool or worker threads)"
+        )
+
     return WebConfig(
         login_url=login_url,
-        db_uri=get_str_env('DB_URI'),
+        db_uri=db_uri,
+        db_async=get_bool_env('DB_ASYNC', is_async_db_uri(db_uri)),
+        db_pool_size=db_pool_size,
+        db_max_overflow=db_max_overflow,
+        db_pool_timeout_seconds=get_int_env('DB_POOL_TIMEOUT_SECONDS', 10),
+        db_pool_recycle_seconds=get_int_env('DB_POOL_RECYCLE_SECONDS', 1800),
+        db_pool_pre_ping=get_bool_env('DB_POOL_PRE_PING', True),
+        db_pool_prewarm=get_int_env('DB_POOL_PREWARM', 5),
+        db_statement_timeout_ms=get_int_env('DB_STATEMENT_TIMEOUT_MS', 0),
+        debug=get_bool_env('DEBUG', False),
+        slow_query_ms=get_int_env('SLOW_QUERY_MS', 200),
+        n_plus_one_threshold=get_int_env('N_PLUS_ONE_THRESHOLD', 5),
+        metrics_dir=get_optional_str_env('METRICS_DIR'),
+        metrics_flush_seconds=get_int_env('METRICS_FLUSH_SECONDS', 5),
+        stats_token=get_optional_str_env('STATS_TOKEN'),
+        auth_mode=auth_mode,
         secret_key=get_str_env('SECRET_KEY'),
         algorithm=get_str_env('ALGORITHM'),
         access_token_expire_minutes=int(get_str_env('ACCESS_TOKEN_EXPIRE_MINUTES')),
         refresh_token_expire_days=int(get_str_env('REFRESH_TOKEN_EXPIRE_DAYS')),
+        password_scrypt_log_n=get_int_env('PASSWORD_SCRYPT_LOG_N', 14),
+        password_kdf_workers=password_kdf_workers,
+        password_kdf_max_queue=password_kdf_max_queue,
+        rate_limit_backend=rate_limit_backend,
+        rate_limit_memory_keys=get_int_env('RATE_LIMIT_MEMORY_KEYS', 100_000),
+        # a whole class may log in from one school NAT address
+        login_rate_ip_per_minute=get_int_env('LOGIN_RATE_IP_PER_MINUTE', 30),
+        login_rate_ip_burst=get_int_env('LOGIN_RATE_IP_BURST', 60),
+        login_rate_email_per_minute=get_int_env('LOGIN_RATE_EMAIL_PER_MINUTE', 1),
+        login_rate_email_burst=get_int_env('LOGIN_RATE_EMAIL_BURST', 5),
+        session_cache_size=get_int_env('SESSION_CACHE_SIZE', 10_000),
+        session_cache_ttl_seconds=get_int_env('SESSION_CACHE_TTL_SECONDS', 30),
+        compiled_test_cache_size=get_int_env('COMPILED_TEST_CACHE_SIZE', 1_000),
+        fragment_cache_size=get_int_env('FRAGMENT_CACHE_SIZE', 10_000),
+        jinja_bytecode_cache=get_bool_env('JINJA_BYTECODE_CACHE', True),
+        jinja_bytecode_cache_dir=get_optional_str_env('JINJA_BYTECODE_CACHE_DIR'),
+        jinja_precompiled_dir=get_optional_str_env('JINJA_PRECOMPILED_DIR'),
+        static_build_dir=get_optional_str_env('STATIC_BUILD_DIR'),
+        compression_enabled=get_bool_env('COMPRESSION_ENABLED', True),
+        compression_min_size=get_int_env('COMPRESSION_MIN_SIZE', 1024),
+        compression_gzip_level=get_int_env('COMPRESSION_GZIP_LEVEL', 6),
+        compression_brotli_quality=get_int_env('COMPRESSION_BROTLI_QUALITY', 4),
+        llm_backend=llm_backend,
+        openroute_api_key=openroute_api_key,
+        llm_model=get_optional_str_env('LLM_MODEL') or "openai/gpt-4o-mini",
+        llm_base_url=get_optional_str_env('LLM_BASE_URL') or "https://openrouter.ai/api/v1",
+        llm_read_timeout_seconds=get_int_env('LLM_READ_TIMEOUT_SECONDS', 60),
+        llm_fake_token_delay_ms=get_int_env('LLM_FAKE_TOKEN_DELAY_MS', 0),
+        llm_cache_enabled=get_bool_env('LLM_CACHE_ENABLED', True),
+        llm_cache_ttl_seconds=get_int_env('LLM_CACHE_TTL_SECONDS', 7 * 24 * 3600),
+        llm_cache_memory_size=get_int_env('LLM_CACHE_MEMORY_SIZE', 1000),
+        llm_cache_memory_ttl_seconds=get_int_env('LLM_CACHE_MEMORY_TTL_SECONDS', 300),
+        worker_concurrency=get_int_env('WORKER_CONCURRENCY', 4),
+        worker_poll_interval_ms=get_int_env('WORKER_POLL_INTERVAL_MS', 1000),
+        job_lease_seconds=get_int_env('JOB_LEASE_SECONDS', 60),
+        job_timeout_seconds=get_int_env('JOB_TIMEOUT_SECONDS', 300),
+        job_retry_base_seconds=get_int_env('JOB_RETRY_BASE_SECONDS', 10),
+        job_retry_max_seconds=get_int_env('JOB_RETRY_MAX_SECONDS', 600),
+        sweep_interval_seconds=get_int_env('SWEEP_INTERVAL_SECONDS', 600),
+        session_sweep_batch_size=get_int_env('SESSION_SWEEP_BATCH_SIZE', 1000),
+    )
+
+
+def load_log_config() -> LogConfig:
+    sample_rates = {}
+    for name, rate in get_mapping_env('LOG_SAMPLE').items():
+        try:
+            sample_rates[name] = float(rate)
+        except ValueError as exc:
+            raise ConfigParseError(f"LOG_SAMPLE rate for {name} must be a number") from exc
+
+    return LogConfig(
+        level=(get_optional_str_env('LOG_LEVEL') or "INFO").upper(),
+        json=(get_optional_str_env('LOG_FORMAT') or "json") == "json",
+        levels={name: level.upper() for name, level in get_mapping_env('LOG_LEVELS').items()},
+        sample_rates=sample_rates,
+        queue_size=get_int_env('LOG_QUEUE_SIZE', 10_000),
     )
@@ -1,14 +1,47 @@
 from contextlib import contextmanager
+from datetime import timedelta
 from typing import Generator
 
-from adapters.database.sqlalchemy import make_session_factory
+from sqlalchemy.orm import Session as OrmSession
+
+from adapters.auth.passwords import (
+    OffloadedPasswordHasher, KdfExecutor, PasswordConfig, ScryptPasswordHasher,
+)
+from adapters.cache.compiled_test_cache import CachedCompiledTestGateway, CompiledTestCache
+from adapters.cache.lru import LruTtlCache
+from adapters.cache.session_cache import CachedSessionGateway, SessionCache
+from adapters.database.attempt_db import AttemptGateway
+from adapters.database.chat_db import ChatGateway
+from adapters.database.content_version_db import ContentVersionGateway
+from adapters.database.job_db import JobGateway
+from adapters.database.pool import PoolConfig, PoolMonitor
+from adapters.database.sqlalchemy import (
+    QueryMonitor, make_engine, make_session_factory, prewarm_pool,
+)
 from adapters.database.sqlalchemy_uow import SqlAlchemyUoW
 from adapters.database.session_db import SessionGateway
+from adapters.database.test_db import AnswerKeyGateway, PublishedTestGateway
+from adapters.database.test_spec_db import TestSpecGateway
 from adapters.database.user_db import UserGateway
-from application.authenticate import Authenticate
-from application.common.id_provider import IdProvider
+from adapters.grading.numpy_engine import NumpyGradingEngine
+from application.append_chat_messages import AppendChatMessages
+from application.authenticate import Authenticate, AuthenticateCurrentUser
+from application.claim_test_generation import ClaimTestGeneration
+from application.complete_test_generation import CompleteTestGeneration
+from application.common.id_provider import IdProvider, UserProvider
+from application.create_chat import CreateChat
+from application.extend_job_lease import ExtendJobLease
+from application.fail_test_generation import FailTestGeneration
+from application.get_content_versions import GetContentVersions
+from application.grade_test_attempts import GradeTestAttempts
+from application.list_chats import ListChats
+from application.load_chat import LoadChat
+from application.load_test import LoadTest
 from application.login_student import LoginStudent
+from application.logout_student import LogoutStudent
+from application.purge_expired_sessions import PurgeExpiredSessions
 from application.register_student import RegisterStudent
+from application.request_test_generation import RequestTestGeneration
 from presentation.interactor_factory import InteractorFactory
 
 
@@ -17,11 +50,45 @@ class IoC(InteractorFactory):
     def __init__(
             self,
             db_uri: str,
+            pool: PoolConfig = PoolConfig(),
+            passwords: PasswordConfig = PasswordConfig(),
+            session_cache_size: int = 10_000,
+            session_cache_ttl_seconds: int = 30,
+            session_ttl: timedelta = timedelta(days=30),
+            compiled_test_cache_size: int = 1_000,
+            slow_query_ms: float = 200.0,
     ):
         self.db_uri = db_uri
+        self.session_ttl = session_ttl
+
+        self.pool_monitor = PoolMonitor()
+        self.query_monitor = QueryMonitor(slow_query_ms=slow_query_ms)
+        self.engine = make_engine(self.db_uri, pool, self.pool_monitor, self.query_monitor)
+        self.session_factory = make_session_factory(self.engine)
+        self.session_cache: SessionCache = LruTtlCache(
+            max_size=session_cache_size,
+            ttl_seconds=session_cache_ttl_seconds,
+        )
+        self.compiled_test_cache = CompiledTestCache(max_size=compiled_test_cache_size)
+        self.grading_engine = NumpyGradingEngine()
+        self.kdf_executor = KdfExecutor(passwords.kdf_workers, passwords.kdf_max_queue)
+        self.password_hasher = OffloadedPasswordHasher(ScryptPasswordHasher(passwords), self.kdf_executor)
+
+    def prewarm(self, connections: int) -> None:
+        prewarm_pool(self.engine, connections)
 
-        self.session_factory = make_session_factory(self.db_uri)
+    def dispose(self) -> None:
+        self.kdf_executor.shutdown()
+        self.engine.dispose()
 
+    def session_gateway(self, session: OrmSession) -> CachedSessionGateway:
+        return CachedSessionGateway(SessionGateway(session), self.session_cache)
+
+    def test_gateway(self, session: OrmSession) -> CachedCompiledTestGateway:
+        return CachedCompiledTestGateway(PublishedTestGateway(session), self.compiled_test_cache)
+
+    def answer_key_gateway(self, session: OrmSession) -> CachedCompiledTestGateway:
+        return CachedCompiledTestGateway(AnswerKeyGateway(session), self.compiled_test_cache)
 
     @contextmanager
     def authenticate(self, id_provider: IdProvider) -> Generator[Authenticate, None, None]:
@@ -35,6 +102,13 @@ class IoC(InteractorFactory):
         finally:
             session.close()
 
+    @contextmanager
+    def authenticate_current_user(
+            self, user_provider: UserProvider,
+    ) -> Generator[AuthenticateCurrentUser, None, None]:
+        # user_provider already runs on the request-scoped session
+        yield AuthenticateCurrentUser(user_provider=user_provider)
+
     @contextmanager
     def register_student(self) -> Generator[RegisterStudent, None, None]:
         session = self.session_factory()
@@ -44,6 +118,8 @@ class IoC(InteractorFactory):
             yield RegisterStudent(
                 user_db_gateway=user_gateway,
                 session_db_gateway=session_gateway,
+                password_hasher=self.password_hasher,
+                session_ttl=self.session_ttl,
                 uow=uow,
             )
 
@@ -56,5 +132,137 @@ class IoC(InteractorFactory):
             yield LoginStudent(
                 user_db_gateway=user_gateway,
                 session_db_gateway=session_gateway,
+                password_hasher=self.password_hasher,
+                session_ttl=self.session_ttl,
+                uow=uow,
+            )
+
+    @contextmanager
+    def logout_student(self) -> Generator[LogoutStudent, None, None]:
+        session = self.session_factory()
+        with SqlAlchemyUoW(session) as uow:
+            yield LogoutStudent(
+                session_db_gateway=self.session_gateway(uow.session),
+                uow=uow,
+            )
+
+    @contextmanager
+    def create_chat(self) -> Generator[CreateChat, None, None]:
+        session = self.session_factory()
+        with SqlAlchemyUoW(session) as uow:
+            yield CreateChat(
+                chat_db_gateway=ChatGateway(uow.session),
+                content_version_gateway=ContentVersionGateway(uow.session),
+                uow=uow,
+            )
+
+    @contextmanager
+    def list_chats(self) -> Generator[ListChats, None, None]:
+        session = self.session_factory()
+        try:
+            yield ListChats(chat_db_gateway=ChatGateway(session))
+        finally:
+            session.close()
+
+    @contextmanager
+    def load_chat(self) -> Generator[LoadChat, None, None]:
+        session = self.session_factory()
+        try:
+            yield LoadChat(chat_db_gateway=ChatGateway(session))
+        finally:
+            session.close()
+
+    @contextmanager
+    def get_content_versions(self) -> Generator[GetContentVersions, None, None]:
+        session = self.session_factory()
+        try:
+            yield GetContentVersions(content_version_gateway=ContentVersionGateway(session))
+        finally:
+            session.close()
+
+    @contextmanager
+    def append_chat_messages(self) -> Generator[AppendChatMessages, None, None]:
+        session = self.session_factory()
+        with SqlAlchemyUoW(session) as uow:
+            yield AppendChatMessages(
+                chat_db_gateway=ChatGateway(uow.session),
+                content_version_gateway=ContentVersionGateway(uow.session),
+                uow=uow,
+            )
+
+    @contextmanager
+    def request_test_generation(self) -> Generator[RequestTestGeneration, None, None]:
+        session = self.session_factory()
+        with SqlAlchemyUoW(session) as uow:
+            yield RequestTestGeneration(
+                test_spec_db_gateway=TestSpecGateway(uow.session),
+                job_db_gateway=JobGateway(uow.session),
+                uow=uow,
+            )
+
+    @contextmanager
+    def claim_test_generation(self) -> Generator[ClaimTestGeneration, None, None]:
+        session = self.session_factory()
+        with SqlAlchemyUoW(session) as uow:
+            yield ClaimTestGeneration(
+                test_spec_db_gateway=TestSpecGateway(uow.session),
+                job_db_gateway=JobGateway(uow.session),
+                uow=uow,
+            )
+
+    @contextmanager
+    def complete_test_generation(self) -> Generator[CompleteTestGeneration, None, None]:
+        session = self.session_factory()
+        with SqlAlchemyUoW(session) as uow:
+            yield CompleteTestGeneration(
+                test_spec_db_gateway=TestSpecGateway(uow.session),
+                job_db_gateway=JobGateway(uow.session),
+                uow=uow,
+            )
+
+    @contextmanager
+    def fail_test_generation(self) -> Generator[FailTestGeneration, None, None]:
+        session = self.session_factory()
+        with SqlAlchemyUoW(session) as uow:
+            yield FailTestGeneration(
+                test_spec_db_gateway=TestSpecGateway(uow.session),
+                job_db_gateway=JobGateway(uow.session),
+                uow=uow,
+            )
+
+    @contextmanager
+    def extend_job_lease(self) -> Generator[ExtendJobLease, None, None]:
+        session = self.session_factory()
+        with SqlAlchemyUoW(session) as uow:
+            yield ExtendJobLease(
+                job_db_gateway=JobGateway(uow.session),
+                uow=uow,
+            )
+
+    @contextmanager
+    def load_test(self) -> Generator[LoadTest, None, None]:
+        session = self.session_factory()
+        try:
+            yield LoadTest(test_reader=self.test_gateway(session))
+        finally:
+            session.close()
+
+    @contextmanager
+    def grade_test_attempts(self) -> Generator[GradeTestAttempts, None, None]:
+        session = self.session_factory()
+        with SqlAlchemyUoW(session) as uow:
+            yield GradeTestAttempts(
+                attempt_db_gateway=AttemptGateway(uow.session),
+                test_reader=self.answer_key_gateway(uow.session),
+                grading_engine=self.grading_engine,
+                uow=uow,
+            )
+
+    @contextmanager
+    def purge_expired_sessions(self) -> Generator[PurgeExpiredSessions, None, None]:
+        session = self.session_factory()
+        with SqlAlchemyUoW(session) as uow:
+            yield PurgeExpiredSessions(
+                session_db_gateway=SessionGateway(uow.session),
                 uow=uow,
             )
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Callable
+
+from anyio import to_thread
+
+from adapters.cache.fragment_cache import FragmentCache
+from adapters.cache.lru import CacheStats
+from adapters.metrics.registry import (
+    COUNTER, GAUGE, HISTOGRAM, MetricFamily, MetricsRegistry, MultiprocessStore,
+    family, merge_families, render_text,
+)
+from adapters.ratelimit.token_bucket import TokenBucketThrottle
+from main.async_ioc import AsyncIoC
+from main.bootstrap import LlmStack
+from main.config import WebConfig
+from main.ioc import IoC
+from main.log import dropped_records
+
+logger = getLogger(__name__)
+
+
+def pool_collector(db_ioc: IoC | AsyncIoC):
+    def collect() -> list[MetricFamily]:
+        stats = db_ioc.pool_monitor.snapshot()
+        families = [
+            family("db_pool_checkout_wait_seconds", HISTOGRAM,
+                   "Time spent waiting for a pooled connection.",
+                   [({}, stats["checkout_wait_seconds"])]),
+            family("db_pool_checkout_timeouts_total", COUNTER,
+                   "Checkouts that gave up waiting for a connection.",
+                   [({}, stats["checkout_timeouts"])]),
+            family("db_statements_total", COUNTER, "SQL statements executed.",
+                   [({}, db_ioc.query_monitor.statements)]),
+            family("db_slow_queries_total", COUNTER, "SQL statements slower than SLOW_QUERY_MS.",
+                   [({}, db_ioc.query_monitor.slow_count)]),
+        ]
+        # sqlite has no QueuePool and so no gauges
+        for key, help in (
+                ("size", "Connections the pool keeps open."),
+                ("in_use", "Connections checked out."),
+                ("idle", "Connections waiting in the pool."),
+                ("overflow", "Connections opened above the pool size."),
+        ):
+            if key in stats:
+                families.append(family(f"db_pool_{key}", GAUGE, help, [({}, stats[key])]))
+        return families
+
+    return collect
+
+
+def cache_collector(caches: dict[str, Callable[[], tuple[int, int]]]):
+    """`caches` maps a cache label to a function returning (hits, misses)."""
+
+    def collect() -> list[MetricFamily]:
+        counts = {name: stats() for name, stats in caches.items()}
+        return [
+            family("cache_hits_total", COUNTER, "Cache lookups answered from the cache.",
+                   [({"cache": name}, hits) for name, (hits, _) in counts.items()]),
+            family("cache_misses_total", COUNTER, "Cache lookups that fell through.",
+                   [({"cache": name}, misses) for name, (_, misses) in counts.items()]),
+        ]
+
+    return collect
+
+
+def _lru_counts(stats: CacheStats) -> tuple[int, int]:
+    return stats.hits, stats.misses
+
+
+def threadpool_collector() -> list[MetricFamily]:
+    # the pool sync interactors and handlers run in
+    limiter = to_thread.current_default_thread_limiter()
+    return [
+        family("threadpool_busy_threads", GAUGE, "Worker threads in use.",
+               [({}, limiter.borrowed_tokens)]),
+        family("threadpool_max_threads", GAUGE, "Worker thread limit.",
+               [({}, limiter.total_tokens)]),
+        family("threadpool_waiting_tasks", GAUGE, "Calls queued for a free worker thread.",
+               [({}, limiter.statistics().tasks_waiting)]),
+    ]
+
+
+def kdf_collector(db_ioc: IoC | AsyncIoC):
+    def collect() -> list[MetricFamily]:
+        stats = db_ioc.kdf_executor.snapshot()
+        return [
+            family("password_kdf_pending", GAUGE, "Password hashes running or queued.",
+                   [({}, stats["pending"])]),
+            family("password_kdf_completed_total", COUNTER, "Password hashes computed.",
+                   [({}, stats["completed"])]),
+            family("password_kdf_rejected_total", COUNTER, "Password hashes refused: queue full.",
+                   [({}, stats["rejected"])]),
+        ]
+
+    return collect
+
+
+def rate_limit_collector(throttle: TokenBucketThrottle):
+    def collect() -> list[MetricFamily]:
+        return [
+            family("login_rate_limit_allowed_total", COUNTER, "Login/register attempts let through.",
+                   [({}, throttle.allowed)]),
+            family("login_rate_limit_rejected_total", COUNTER, "Login/register attempts refused with 429.",
+                   [({"bucket": bucket}, n) for bucket, n in throttle.rejected.items()]),
+            family("login_rate_limit_store_errors_total", COUNTER, "Rate limit store failures (attempt let through).",
+                   [({}, throttle.store_errors)]),
+        ]
+
+    return collect
+
+
+def fragment_collector(fragments: FragmentCache):
+    def collect() -> list[MetricFamily]:
+        stats = fragments.render_stats()
+        return [
+            family("fragment_render_seconds_total", COUNTER, "Time spent rendering cacheable fragments.",
+                   [({}, stats.render_seconds)]),
+            family("fragment_render_seconds_saved_total", COUNTER,
+                   "Render time avoided by fragment cache hits (estimated from mean render time).",
+                   [({}, stats.saved_seconds)]),
+        ]
+
+    return collect
+
+
+def logging_collector() -> list[MetricFamily]:
+    return [
+        family("log_records_dropped_total", COUNTER, "Log records dropped because the log queue was full.",
+               [({}, dropped_records())]),
+    ]
+
+
+def with_ratios(families: list[MetricFamily]) -> list[MetricFamily]:
+    """Ratios don't add up across processes: derive them after merging."""
+    by_name = {f["name"]: f for f in families}
+    derived = []
+
+    def by_cache(name: str) -> dict[str, float]:
+        fam = by_name.get(name)
+        return {labels["cache"]: value for labels, value in fam["samples"]} if fam else {}
+
+    hits, misses = by_cache("cache_hits_total"), by_cache("cache_misses_total")
+    if hits:
+        ratios = []
+        for name, hit in hits.items():
+            lookups = hit + misses.get(name, 0)
+            ratios.append(({"cache": name}, hit / lookups if lookups else 0.0))
+        derived.append(family("cache_hit_ratio", GAUGE, "Share of cache lookups that hit.", ratios))
+
+    busy = by_name.get("threadpool_busy_threads")
+    limit = by_name.get("threadpool_max_threads")
+    if busy and limit and busy["samples"] and limit["samples"]:
+        total = sum(v for _, v in limit["samples"])
+        derived.append(family(
+            "threadpool_saturation", GAUGE, "Busy worker threads over the thread limit.",
+            [({}, sum(v for _, v in busy["samples"]) / total if total else 0.0)],
+        ))
+    return families + derived
+
+
+@dataclass
+class Metrics:
+    registry: MetricsRegistry
+    store: MultiprocessStore | None
+    flush_seconds: float
+
+    def render(self) -> str:
+        families = self.registry.collect()
+        if self.store is not None:
+            self.store.write(families)
+            families = merge_families([(families, True), *self.store.read_all()])
+        return render_text(with_ratios(families))
+
+    async def flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                self.store.write(self.registry.collect())
+            except OSError:
+                logger.exception("Could not write metrics snapshot")
+
+
+def make_metrics(
+        web_config: WebConfig,
+        db_ioc: IoC | AsyncIoC,
+        llm: LlmStack,
+        throttle: TokenBucketThrottle,
+        fragments: FragmentCache,
+) -> Metrics:
+    registry = MetricsRegistry()
+    registry.add_collector(pool_collector(db_ioc))
+    registry.add_collector(threadpool_collector)
+    registry.add_collector(logging_collector)
+    registry.add_collector(kdf_collector(db_ioc))
+    registry.add_collector(rate_limit_collector(throttle))
+    registry.add_collector(fragment_collector(fragments))
+
+    caches = {
+        "session": lambda: _lru_counts(db_ioc.session_cache.stats()),
+        "compiled_test": lambda: _lru_counts(db_ioc.compiled_test_cache.stats()),
+        "fragment": lambda: _lru_counts(fragments.stats()),
+    }
+    if llm.cache is not None:
+        def llm_counts() -> tuple[int, int]:
+            stats = llm.cache.stats()
+            return stats.memory_hits + stats.store_hits, stats.misses
+
+        caches["llm"] = llm_counts
+    registry.add_collector(cache_collector(caches))
+
+    store = MultiprocessStore(web_config.metrics_dir) if web_config.metrics_dir else None
+    return Metrics(registry=registry, store=store, flush_seconds=web_config.metrics_flush_seconds)
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import threading
+import time
+from logging import getLogger
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from adapters.compression.codecs import CompressionLevels, accepted_encodings, compress, preferred_encoding
+from adapters.database.sqlalchemy import QueryTrace, current_query_trace
+from adapters.metrics.histogram import Histogram
+from adapters.metrics.registry import MetricsRegistry
+
+logger = getLogger(__name__)
+
+STATEMENT_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def route_template(scope: Scope) -> str:
+    # the route template, not the raw path: /partials/chat/{chat_id};
+    # set by the router, so only known once the request was routed
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+def route_label(scope: Scope) -> str:
+    return f"{scope['method']} {route_template(scope)}"
+
+
+class _RouteQueries:
+    def __init__(self):
+        self.requests = 0
+        self.statements = Histogram(STATEMENT_COUNT_BUCKETS)
+        self.statements_max = 0
+        self.db_seconds = Histogram()
+        self.n_plus_one_requests = 0
+        self.last_repeated: tuple[str, int] | None = None
+        self.slow_queries = 0
+
+
+class RouteQueryStats:
+    """Statement counts and DB time aggregated per route template."""
+
+    def __init__(self):
+        self._routes: dict[str, _RouteQueries] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, trace: QueryTrace, repeated: list[tuple[str, int]]) -> None:
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = _RouteQueries()
+            entry.requests += 1
+            entry.statements_max = max(entry.statements_max, trace.statements)
+            entry.slow_queries += len(trace.slow)
+            if repeated:
+                entry.n_plus_one_requests += 1
+                entry.last_repeated = repeated[0]
+        entry.statements.observe(trace.statements)
+        entry.db_seconds.observe(trace.db_time)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            routes = dict(self._routes)
+        stats = {}
+        for route, entry in sorted(routes.items()):
+            statements = entry.statements.snapshot()
+            stats[route] = {
+                "requests": entry.requests,
+                "statements_avg": statements["sum"] / statements["count"] if statements["count"] else 0.0,
+                "statements_max": entry.statements_max,
+                "statements": statements,
+                "db_seconds": entry.db_seconds.snapshot(),
+                "slow_queries": entry.slow_queries,
+                "n_plus_one_requests": entry.n_plus_one_requests,
+                "last_repeated": (
+                    {"statement": entry.last_repeated[0], "count": entry.last_repeated[1]}
+                    if entry.last_repeated else None
+                ),
+            }
+        return stats
+
+
+class QueryStatsMiddleware:
+    """
+    Opens a QueryTrace for every HTTP request. Headers reflect the
+    statements run before the response started; the per-route stats also
+    include whatever a streaming body ran afterwards.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            stats: RouteQueryStats,
+            n_plus_one_threshold: int = 5,
+            debug_headers: bool = False,
+    ):
+        self.app = app
+        self.stats = stats
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = QueryTrace()
+        token = current_query_trace.set(trace)
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-DB-Statements"] = str(trace.statements)
+                headers["X-DB-Time-Ms"] = f"{trace.db_time * 1000:.1f}"
+                repeated = trace.repeated(self.n_plus_one_threshold)
+                if repeated:
+                    headers["X-DB-Repeated"] = f"{repeated[0][1]}x {len(repeated)} shape(s)"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers if self.debug_headers else send)
+        finally:
+            current_query_trace.reset(token)
+            route = route_label(scope)
+            repeated = trace.repeated(self.n_plus_one_threshold)
+            if repeated:
+                statement, count = repeated[0]
+                logger.warning(
+                    "Possible N+1 on %s: %s statements, %r ran %s times",
+                    route, trace.statements, statement, count,
+                )
+            self.stats.record(route, trace, repeated)
+
+
+class HttpMetricsMiddleware:
+    """Latency histogram and status counts per route template, plus in-flight requests."""
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry):
+        self.app = app
+        self.in_flight = registry.gauge(
+            "http_requests_in_flight", "Requests currently being served.",
+        )
+        self.requests = registry.counter(
+            "http_requests_total", "Finished requests by route template and status code.",
+        )
+        self.latency = registry.histogram(
+            "http_request_duration_seconds", "Time until the response body was sent.",
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.in_flight.dec()
+            labels = {"method": scope["method"], "route": route_template(scope)}
+            self.latency.observe(time.perf_counter() - started, **labels)
+            self.requests.inc(status=str(status), **labels)
+
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+
+def _compressible(message: Message) -> bool:
+    if message["status"] in (204, 206, 304):
+        return False
+    headers = Headers(raw=message["headers"])
+    if "content-encoding" in headers or "no-transform" in headers.get("cache-control", ""):
+        return False
+    content_type = headers.get("content-type", "")
+    # SSE must reach the browser event by event
+    return content_type.startswith(_COMPRESSIBLE_TYPES) and not content_type.startswith("text/event-stream")
+
+
+class CompressionMiddleware:
+    """
+    br or gzip for bodies sent in one piece (every rendered page and
+    partial). Streamed bodies, SSE and anything under min_size pass
+    through untouched: nothing is buffered waiting for more body.
+    """
+
+    def __init__(
+            self,
+            app: ASGIApp,
+            registry: MetricsRegistry,
+            min_size: int = 1024,
+            levels: CompressionLevels = CompressionLevels(),
+    ):
+        self.app = app
+        self.min_size = min_size
+        self.levels = levels
+        self.bytes_in = registry.counter(
+            "http_compression_input_bytes_total", "Response bytes before compression, by route and encoding.",
+        )
+        self.bytes_out = registry.counter(
+            "http_compression_output_bytes_total", "Response bytes after compression, by route and encoding.",
+        )
+        self.cpu_seconds = registry.counter(
+            "http_compression_cpu_seconds_total", "CPU time spent compressing responses, by route and encoding.",
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = preferred_encoding(accepted_encodings(Headers(scope=scope).get("accept-encoding")))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        # held back until the first body message shows whether the body is whole
+        pending_start: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal pending_start
+            if message["type"] == "http.response.start":
+                if _compressible(message):
+                    pending_start = message
+                else:
+                    await send(message)
+                return
+            if pending_start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, pending_start = pending_start, None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.min_size:
+                await send(start)
+                await send(message)
+                return
+
+            started = time.thread_time()
+            compressed = compress(body, encoding, self.levels)
+            labels = {"route": route_template(scope), "encoding": encoding}
+            self.cpu_seconds.inc(time.thread_time() - started, **labels)
+            self.bytes_in.inc(len(body), **labels)
+            self.bytes_out.inc(len(compressed), **labels)
+
+            headers = MutableHeaders(scope=start)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            if "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # a different representation: no longer byte-for-byte equal
+                headers["etag"] = "W/" + etag
+            await send(start)
+            await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,24 @@
+"""
+Compiles the UI templates into Python modules at build time:
+
+    python -m main.precompile_templates /opt/build/jinja_compiled
+
+Point JINJA_PRECOMPILED_DIR at the output and workers skip template
+compilation altogether.
+"""
+import argparse
+
+from presentation.web_api.templating import precompile_templates
+from presentation.web_api.ui import templates
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("target")
+    args = parser.parse_args()
+    precompile_templates(templates.env, args.target)
+    print(f"Compiled {len(templates.env.list_templates(extensions=['html']))} templates into {args.target}")
+
+
+if __name__ == "__main__":
+    main()
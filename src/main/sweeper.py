@@ -0,0 +1,107 @@
+"""Periodic deletion of rows nothing will read again. Runs in the worker."""
+import asyncio
+import random
+import time
+from datetime import datetime
+from logging import getLogger
+from typing import Awaitable, Callable
+
+from anyio import to_thread
+
+from adapters.database.llm_response_db import AsyncLlmResponseStore, LlmResponseStore
+from adapters.database.rate_limit_db import AsyncDbTokenBucketStore, DbTokenBucketStore
+from application.purge_expired_sessions import PurgeExpiredSessionsCommand
+from main.async_ioc import AsyncIoC
+from main.bootstrap import login_rate_policies
+from main.config import WebConfig
+from main.ioc import IoC
+from presentation.interactor_factory import AsyncInteractorFactory
+
+logger = getLogger(__name__)
+
+# deletes rows, returns how many
+Purge = Callable[[], Awaitable[int]]
+
+# between session batches, so the sweep never monopolizes the table
+_BATCH_PAUSE_SECONDS = 0.05
+
+
+def session_purge(ioc: AsyncInteractorFactory, batch_size: int) -> Purge:
+    async def purge() -> int:
+        total = 0
+        while True:
+            async with ioc.purge_expired_sessions() as purge_sessions:
+                result = await purge_sessions(PurgeExpiredSessionsCommand(batch_size=batch_size))
+            total += result.deleted
+            if not result.has_more:
+                return total
+            await asyncio.sleep(_BATCH_PAUSE_SECONDS)
+
+    return purge
+
+
+class RetentionSweeper:
+    """Runs each purge every `interval_seconds` and logs what it removed."""
+
+    def __init__(self, purges: dict[str, Purge], interval_seconds: float):
+        self.purges = purges
+        self.interval_seconds = interval_seconds
+
+    async def sweep_once(self) -> dict[str, int]:
+        removed = {}
+        for name, purge in self.purges.items():
+            started = time.perf_counter()
+            try:
+                removed[name] = await purge()
+            except Exception:
+                logger.exception("Sweeping %s failed", name)
+                continue
+            logger.info(
+                "Swept %s: %s rows removed in %.2fs",
+                name, removed[name], time.perf_counter() - started,
+            )
+        return removed
+
+    async def run_forever(self) -> None:
+        while True:
+            await self.sweep_once()
+            # jittered so several workers don't sweep in lockstep
+            await asyncio.sleep(self.interval_seconds * random.uniform(0.8, 1.2))
+
+
+def make_sweeper(
+        web_config: WebConfig,
+        db_ioc: IoC | AsyncIoC,
+        ioc: AsyncInteractorFactory,
+) -> RetentionSweeper:
+    purges: dict[str, Purge] = {
+        "user_sessions": session_purge(ioc, web_config.session_sweep_batch_size),
+    }
+    # a bucket untouched this long has refilled completely
+    idle_seconds = max(policy.full_after_seconds for policy in login_rate_policies(web_config))
+
+    if web_config.db_async:
+        llm_store = AsyncLlmResponseStore(db_ioc.session_factory)
+        bucket_store = AsyncDbTokenBucketStore(db_ioc.session_factory)
+
+        async def purge_llm_responses() -> int:
+            return await llm_store.delete_expired(datetime.utcnow())
+
+        async def purge_rate_limit_buckets() -> int:
+            return await bucket_store.delete_idle(time.time() - idle_seconds)
+    else:
+        sync_llm_store = LlmResponseStore(db_ioc.session_factory)
+        sync_bucket_store = DbTokenBucketStore(db_ioc.session_factory)
+
+        async def purge_llm_responses() -> int:
+            return await to_thread.run_sync(sync_llm_store.delete_expired, datetime.utcnow())
+
+        async def purge_rate_limit_buckets() -> int:
+            return await to_thread.run_sync(sync_bucket_store.delete_idle, time.time() - idle_seconds)
+
+    if web_config.llm_cache_enabled:
+        purges["llm_responses"] = purge_llm_responses
+    if web_config.rate_limit_backend == "db":
+        purges["rate_limit_buckets"] = purge_rate_limit_buckets
+
+    return RetentionSweeper(purges, web_config.sweep_interval_seconds)
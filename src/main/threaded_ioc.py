@@ -0,0 +1,107 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, ContextManager, Generic
+
+from anyio import to_thread
+
+from application.authenticate import AsyncAuthenticateCurrentUser
+from application.common.id_provider import AsyncUserProvider
+from application.common.interactor import AsyncInteractor, InputDTO, Interactor, OutputDTO
+from main.ioc import IoC
+from presentation.interactor_factory import AsyncInteractorFactory
+
+
+class ThreadedInteractor(AsyncInteractor[InputDTO, OutputDTO], Generic[InputDTO, OutputDTO]):
+    """
+    Runs a whole sync interactor lifecycle (open session, call, close)
+    in one worker-thread hop.
+    """
+
+    def __init__(
+            self,
+            interactor_factory: Callable[[], ContextManager[Interactor[InputDTO, OutputDTO]]],
+    ):
+        self.interactor_factory = interactor_factory
+
+    def _call_sync(self, data: InputDTO) -> OutputDTO:
+        with self.interactor_factory() as interactor:
+            return interactor(data)
+
+    async def __call__(self, data: InputDTO) -> OutputDTO:
+        return await to_thread.run_sync(self._call_sync, data)
+
+
+class ThreadedIoC(AsyncInteractorFactory):
+    """Async facade over the sync IoC, selected when DB_ASYNC is off."""
+
+    def __init__(self, ioc: IoC):
+        self.ioc = ioc
+
+    @asynccontextmanager
+    async def authenticate_current_user(
+            self, user_provider: AsyncUserProvider,
+    ) -> AsyncIterator[AsyncAuthenticateCurrentUser]:
+        yield AsyncAuthenticateCurrentUser(user_provider=user_provider)
+
+    @asynccontextmanager
+    async def register_student(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.register_student)
+
+    @asynccontextmanager
+    async def login_student(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.login_student)
+
+    @asynccontextmanager
+    async def logout_student(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.logout_student)
+
+    @asynccontextmanager
+    async def create_chat(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.create_chat)
+
+    @asynccontextmanager
+    async def list_chats(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.list_chats)
+
+    @asynccontextmanager
+    async def load_chat(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.load_chat)
+
+    @asynccontextmanager
+    async def get_content_versions(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.get_content_versions)
+
+    @asynccontextmanager
+    async def append_chat_messages(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.append_chat_messages)
+
+    @asynccontextmanager
+    async def request_test_generation(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.request_test_generation)
+
+    @asynccontextmanager
+    async def claim_test_generation(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.claim_test_generation)
+
+    @asynccontextmanager
+    async def complete_test_generation(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.complete_test_generation)
+
+    @asynccontextmanager
+    async def fail_test_generation(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.fail_test_generation)
+
+    @asynccontextmanager
+    async def extend_job_lease(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.extend_job_lease)
+
+    @asynccontextmanager
+    async def load_test(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.load_test)
+
+    @asynccontextmanager
+    async def grade_test_attempts(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.grade_test_attempts)
+
+    @asynccontextmanager
+    async def purge_expired_sessions(self) -> AsyncIterator[ThreadedInteractor]:
+        yield ThreadedInteractor(self.ioc.purge_expired_sessions)
@@ -1,27 +1,47 @@
-import sys
+import asyncio
 import logging
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 from datetime import timedelta
 from pathlib import Path
 from typing import TypeVar, Callable
 
-from fastapi import FastAPI, APIRouter
+from anyio import to_thread
+from fastapi import APIRouter, Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
 
 from adapters.auth.token import JwtTokenProcessor
-from adapters.database.session_db import SessionGateway
-from main.config import load_web_config
+from adapters.cache.fragment_cache import FragmentCache
+from adapters.compression.codecs import CompressionLevels
+from adapters.database.session_db import AsyncSessionGateway, SessionGateway
+from adapters.ratelimit.token_bucket import TokenBucketThrottle
+from application.common.access_token import AccessTokenIssuer
+from application.common.id_provider import AsyncUserProvider
+from application.common.llm import LlmClient
+from application.common.rate_limit import LoginThrottle
+from main.async_ioc import AsyncIoC
+from main.bootstrap import LlmStack, make_async_ioc, make_ioc, make_llm, make_login_throttle
+from main.config import WebConfig, load_log_config, load_web_config
 from main.ioc import IoC
-from presentation.interactor_factory import InteractorFactory
+from main.log import setup_logging
+from main.metrics import Metrics, make_metrics
+from main.middleware import (
+    CompressionMiddleware, HttpMetricsMiddleware, QueryStatsMiddleware, RouteQueryStats,
+)
+from main.threaded_ioc import ThreadedIoC
+from presentation.interactor_factory import AsyncInteractorFactory, InteractorFactory
 from presentation.web_api.dependencies.config import WebViewConfig
-from presentation.web_api.ui import router as ui_router
-
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
-    force=True,  # <-- this is key: overrides uvicorn’s defaults
+from presentation.web_api.dependencies.internal import bearer_token_guard
+from presentation.web_api.auth_cookies import RefreshedTokenMiddleware
+from presentation.web_api.dependencies.id_provider import (
+    async_session_user_provider, hybrid_user_provider, threaded_session_user_provider,
 )
+from presentation.web_api.assets import MANIFEST, AssetManifest, FingerprintedStaticFiles
+from presentation.web_api.templating import TemplateConfig, configure_templates, warm_templates
+from presentation.web_api.ui import STATIC_DIR, TEMPLATES_DIR, router as ui_router, templates
+
+setup_logging(load_log_config())
 
 class WebViewConfigProvider:
     def __init__(
@@ -50,14 +70,146 @@ def singleton(value: DependencyT) -> Callable[[], DependencyT]:
     return singleton_factory
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for hook in app.state.startup_hooks:
+        await hook()
+    yield
+    for hook in reversed(app.state.shutdown_hooks):
+        await hook()
+
+
+def setup_sync_db(app: FastAPI, web_config: WebConfig) -> IoC:
+    ioc = make_ioc(web_config)
+
+    def session_gateway_provider():
+        session = ioc.session_factory()
+        try:
+            yield ioc.session_gateway(session)
+        finally:
+            session.close()
+
+    app.dependency_overrides.update({
+        InteractorFactory: singleton(ioc),
+        AsyncInteractorFactory: singleton(ThreadedIoC(ioc)),
+        SessionGateway: session_gateway_provider,
+        AsyncUserProvider: threaded_session_user_provider,
+    })
+
+    async def prewarm():
+        await to_thread.run_sync(ioc.prewarm, web_config.db_pool_prewarm)
+
+    async def dispose():
+        await to_thread.run_sync(ioc.dispose)
+
+    app.state.startup_hooks.append(prewarm)
+    app.state.shutdown_hooks.append(dispose)
+    return ioc
+
+
+def setup_async_db(app: FastAPI, web_config: WebConfig) -> AsyncIoC:
+    ioc = make_async_ioc(web_config)
+
+    async def session_gateway_provider():
+        async with ioc.session_factory() as session:
+            yield ioc.session_gateway(session)
+
+    app.dependency_overrides.update({
+        AsyncInteractorFactory: singleton(ioc),
+        AsyncSessionGateway: session_gateway_provider,
+        AsyncUserProvider: async_session_user_provider,
+    })
+
+    async def prewarm():
+        await ioc.prewarm(web_config.db_pool_prewarm)
+
+    app.state.startup_hooks.append(prewarm)
+    app.state.shutdown_hooks.append(ioc.dispose)
+    return ioc
+
+
+def setup_llm(app: FastAPI, web_config: WebConfig, db_ioc: IoC | AsyncIoC) -> LlmStack:
+    llm = make_llm(web_config, db_ioc)
+    app.dependency_overrides[LlmClient] = singleton(llm.client)
+    app.state.shutdown_hooks.extend(llm.closers)
+    return llm
+
+
+def setup_metrics(
+        app: FastAPI,
+        web_config: WebConfig,
+        db_ioc: IoC | AsyncIoC,
+        llm: LlmStack,
+        throttle: TokenBucketThrottle,
+        fragments: FragmentCache,
+) -> Metrics:
+    metrics = make_metrics(web_config, db_ioc, llm, throttle, fragments)
+    if metrics.store is None:
+        return metrics
+
+    flusher: list[asyncio.Task] = []
+
+    async def start_flushing():
+        flusher.append(asyncio.create_task(metrics.flush_forever()))
+
+    async def stop_flushing():
+        for task in flusher:
+            task.cancel()
+        await asyncio.gather(*flusher, return_exceptions=True)
+        # counters of this worker keep counting after it exits
+        metrics.store.write(metrics.registry.collect())
+
+    app.state.startup_hooks.append(start_flushing)
+    app.state.shutdown_hooks.append(stop_flushing)
+    return metrics
+
+
+def setup_templates(app: FastAPI, web_config: WebConfig) -> None:
+    configure_templates(templates.env, TemplateConfig(
+        auto_reload=web_config.debug,
+        bytecode_cache=web_config.jinja_bytecode_cache,
+        bytecode_cache_dir=web_config.jinja_bytecode_cache_dir,
+        precompiled_dir=web_config.jinja_precompiled_dir,
+    ))
+
+    # compile before serving, not on the first request after a deploy
+    async def warmup():
+        await to_thread.run_sync(warm_templates, templates.env, TEMPLATES_DIR)
+
+    app.state.startup_hooks.append(warmup)
+
+
+def setup_static(app: FastAPI, web_config: WebConfig) -> None:
+    build_dir = Path(web_config.static_build_dir) if web_config.static_build_dir else None
+    if build_dir is not None and not (build_dir / MANIFEST).is_file():
+        # e.g. a dev bind mount over the image's build output
+        logger.warning("No asset build in %s, serving static/ uncompressed", build_dir)
+        build_dir = None
+    if build_dir is not None:
+        static_dir, manifest = build_dir, AssetManifest.load(build_dir, "/static")
+    else:
+        static_dir, manifest = STATIC_DIR, AssetManifest.scan(STATIC_DIR, "/static")
+    templates.env.globals["asset_url"] = manifest.url
+    app.mount("/static", FingerprintedStaticFiles(directory=static_dir, manifest=manifest), name="static")
+
+
 def create_app():
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
+    app.state.startup_hooks = []
+    app.state.shutdown_hooks = []
 
     web_config = load_web_config()
 
-    ioc = IoC(
-        db_uri=web_config.db_uri,
-    )
+    if web_config.db_async:
+        db_ioc = setup_async_db(app, web_config)
+    else:
+        db_ioc = setup_sync_db(app, web_config)
+
+    llm = setup_llm(app, web_config, db_ioc)
+    throttle = make_login_throttle(web_config, db_ioc)
+    fragments = FragmentCache(max_size=web_config.fragment_cache_size)
+    metrics = setup_metrics(app, web_config, db_ioc, llm, throttle, fragments)
+    setup_templates(app, web_config)
 
     web_view_config_provider = WebViewConfigProvider(
         login_url=web_config.login_url,
@@ -72,21 +224,31 @@ def create_app():
         algorithm="HS256",
     )
 
-    def session_gateway_provider():
-        session = ioc.session_factory()
-        try:
-            yield SessionGateway(session)
-        finally:
-            session.close()
-
-
     app.dependency_overrides.update({
-        InteractorFactory: singleton(ioc),
         WebViewConfig: web_view_config_provider,
         JwtTokenProcessor: singleton(token_processor),
-        SessionGateway: session_gateway_provider,
+        LoginThrottle: singleton(throttle),
+        FragmentCache: singleton(fragments),
     })
 
+    if web_config.auth_mode == "hybrid":
+        session_user_provider = app.dependency_overrides[AsyncUserProvider]
+        app.dependency_overrides.update({
+            AsyncUserProvider: hybrid_user_provider(session_user_provider),
+            AccessTokenIssuer: singleton(token_processor),
+        })
+        app.add_middleware(RefreshedTokenMiddleware)
+    else:
+        app.dependency_overrides[AccessTokenIssuer] = singleton(None)
+
+    query_stats = RouteQueryStats()
+    app.add_middleware(
+        QueryStatsMiddleware,
+        stats=query_stats,
+        n_plus_one_threshold=web_config.n_plus_one_threshold,
+        debug_headers=web_config.debug,
+    )
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -95,9 +257,21 @@ def create_app():
         allow_headers=["*"],
     )
 
-    # static
-    static_dir = Path(__file__).resolve().parents[1] / "presentation" / "web_api" / "static"
-    app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+    if web_config.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            registry=metrics.registry,
+            min_size=web_config.compression_min_size,
+            levels=CompressionLevels(
+                gzip_level=web_config.compression_gzip_level,
+                brotli_quality=web_config.compression_brotli_quality,
+            ),
+        )
+
+    # outermost: times everything, CORS preflights and compression included
+    app.add_middleware(HttpMetricsMiddleware, registry=metrics.registry)
+
+    setup_static(app, web_config)
 
     # ui router
     app.include_router(ui_router)
@@ -107,6 +281,56 @@ def create_app():
     async def health():
         return {"status": "UP"}
 
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics_view():
+        return PlainTextResponse(
+            metrics.render(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    # internal diagnostics (SQL shapes, slow query samples): only mounted
+    # with STATS_TOKEN set, and only answered with that bearer token
+    if web_config.stats_token:
+        stats_router = APIRouter(prefix="/stats", dependencies=[Depends(bearer_token_guard(web_config.stats_token))])
+
+        @stats_router.get("/db-pool")
+        async def db_pool_stats():
+            return db_ioc.pool_monitor.snapshot()
+
+        @stats_router.get("/queries")
+        async def query_stats_view():
+            return db_ioc.query_monitor.snapshot() | {"routes": query_stats.snapshot()}
+
+        @stats_router.get("/compiled-tests")
+        async def compiled_test_stats():
+            cache_stats = db_ioc.compiled_test_cache.stats()
+            return asdict(cache_stats) | {"hit_ratio": cache_stats.hit_ratio}
+
+        @stats_router.get("/fragments")
+        async def fragment_stats():
+            cache_stats = fragments.stats()
+            return asdict(cache_stats) | {
+                "hit_ratio": cache_stats.hit_ratio,
+                "render": asdict(fragments.render_stats()),
+            }
+
+        @stats_router.get("/rate-limit")
+        async def rate_limit_stats():
+            return throttle.snapshot()
+
+        @stats_router.get("/llm")
+        async def llm_stats():
+            stats = llm.monitor.snapshot()
+            if llm.cache is not None:
+                cache_stats = llm.cache.stats()
+                stats["cache"] = asdict(cache_stats) | {
+                    "hit_ratio": cache_stats.hit_ratio,
+                    "memory": asdict(llm.cache.memory.stats()),
+                }
+            return stats
+
+        app.include_router(stats_router)
+
     return app
 
 logger = logging.getLogger(__name__)
@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import os
+import random
+import signal
+import socket
+from dataclasses import dataclass
+
+from anyio import to_thread
+
+from adapters.llm.fake import FakeTestGenerator
+from adapters.llm.test_generator import LlmTestGenerator
+from application.claim_test_generation import ClaimedTestGeneration, ClaimTestGenerationCommand
+from application.common.test_generator import TestGenerator
+from application.complete_test_generation import CompleteTestGenerationCommand
+from application.extend_job_lease import ExtendJobLeaseCommand
+from application.fail_test_generation import FailTestGenerationCommand
+from domain.exceptions.job import JobLeaseLostError
+from main.bootstrap import make_async_ioc, make_ioc, make_llm
+from main.config import WebConfig, load_log_config, load_web_config
+from main.log import setup_logging
+from main.sweeper import make_sweeper
+from main.threaded_ioc import ThreadedIoC
+from presentation.interactor_factory import AsyncInteractorFactory
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WorkerSettings:
+    worker_id: str
+    concurrency: int
+    poll_interval_seconds: float
+    lease_seconds: int
+    timeout_seconds: int
+    retry_base_seconds: float
+    retry_max_seconds: float
+
+
+class TestGenerationWorker:
+    """
+    Claims generation jobs while it has free slots, runs each one as a
+    task and reports the outcome. Any number of these may run against the
+    same database: claiming uses SELECT ... FOR UPDATE SKIP LOCKED and
+    every result is checked against the job lease before it is written.
+    """
+
+    def __init__(
+            self,
+            ioc: AsyncInteractorFactory,
+            generator: TestGenerator,
+            settings: WorkerSettings,
+    ):
+        self.ioc = ioc
+        self.generator = generator
+        self.settings = settings
+        self._running: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        logger.info("Worker %s stopping", self.settings.worker_id)
+        self._stopping.set()
+
+    async def run(self) -> None:
+        settings = self.settings
+        logger.info(
+            "Worker %s started, concurrency %s", settings.worker_id, settings.concurrency,
+        )
+        while not self._stopping.is_set():
+            free = settings.concurrency - len(self._running)
+            claimed = await self._claim(free) if free > 0 else []
+            for item in claimed:
+                task = asyncio.create_task(self._process(item))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            if free > len(claimed):
+                # queue drained: poll again later, jittered so workers spread out
+                timeout = settings.poll_interval_seconds * random.uniform(0.8, 1.2)
+            else:
+                timeout = None  # all slots busy: wake up when one frees
+            await self._wait(timeout)
+
+        await self._drain()
+
+    async def _wait(self, timeout: float | None) -> None:
+        stop = asyncio.create_task(self._stopping.wait())
+        try:
+            await asyncio.wait(
+                {stop, *self._running},
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            stop.cancel()
+
+    async def _drain(self) -> None:
+        if not self._running:
+            return
+        # unfinished jobs are picked up by another worker once the lease expires
+        done, pending = await asyncio.wait(self._running, timeout=self.settings.lease_seconds)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("Abandoned %s running jobs", len(pending))
+
+    async def _claim(self, limit: int) -> list[ClaimedTestGeneration]:
+        try:
+            async with self.ioc.claim_test_generation() as claim:
+                return await claim(ClaimTestGenerationCommand(
+                    worker_id=self.settings.worker_id,
+                    limit=limit,
+                    lease_seconds=self.settings.lease_seconds,
+                ))
+        except Exception:
+            logger.exception("Claiming jobs failed")
+            return []
+
+    async def _heartbeat(self, item: ClaimedTestGeneration) -> None:
+        while True:
+            await asyncio.sleep(self.settings.lease_seconds / 3)
+            try:
+                async with self.ioc.extend_job_lease() as extend:
+                    await extend(ExtendJobLeaseCommand(
+                        job_id=item.job_id,
+                        worker_id=self.settings.worker_id,
+                        attempt=item.attempt,
+                        lease_seconds=self.settings.lease_seconds,
+                    ))
+            except JobLeaseLostError:
+                logger.warning("Job %s: lease lost", item.job_id)
+                return
+            except Exception:
+                logger.exception("Job %s: lease extension failed", item.job_id)
+
+    async def _process(self, item: ClaimedTestGeneration) -> None:
+        logger.info(
+            "Job %s: generating spec %s, attempt %s",
+            item.job_id, item.spec.spec_id, item.attempt,
+        )
+        heartbeat = asyncio.create_task(self._heartbeat(item))
+        try:
+            # a retry must not get the cached reply that just failed
+            questions = await asyncio.wait_for(
+                self.generator.generate(item.spec, use_cache=item.attempt == 1),
+                timeout=self.settings.timeout_seconds,
+            )
+            async with self.ioc.complete_test_generation() as complete:
+                result = await complete(CompleteTestGenerationCommand(
+                    job_id=item.job_id,
+                    worker_id=self.settings.worker_id,
+                    attempt=item.attempt,
+                    questions=questions,
+                ))
+            logger.info("Job %s: stored %s questions", item.job_id, result.question_count)
+        except JobLeaseLostError:
+            logger.warning("Job %s: lease lost, result dropped", item.job_id)
+        except Exception as exc:
+            logger.exception("Job %s: attempt %s failed", item.job_id, item.attempt)
+            await self._fail(item, exc)
+        finally:
+            heartbeat.cancel()
+
+    async def _fail(self, item: ClaimedTestGeneration, exc: Exception) -> None:
+        try:
+            async with self.ioc.fail_test_generation() as fail:
+                result = await fail(FailTestGenerationCommand(
+                    job_id=item.job_id,
+                    worker_id=self.settings.worker_id,
+                    attempt=item.attempt,
+                    error=f"{type(exc).__name__}: {exc}",
+                    retry_base_seconds=self.settings.retry_base_seconds,
+                    retry_max_seconds=self.settings.retry_max_seconds,
+                ))
+        except JobLeaseLostError:
+            logger.warning("Job %s: lease lost before the failure was recorded", item.job_id)
+            return
+        except Exception:
+            # the lease runs out and the job is retried by whoever claims it
+            logger.exception("Job %s: could not record the failure", item.job_id)
+            return
+
+        if result.retry_at is None:
+            logger.error("Job %s: giving up after %s attempts", item.job_id, item.attempt)
+        else:
+            logger.info("Job %s: retry at %s", item.job_id, result.retry_at)
+
+
+def worker_settings(web_config: WebConfig) -> WorkerSettings:
+    return WorkerSettings(
+        worker_id=f"{socket.gethostname()}:{os.getpid()}"[:64],
+        concurrency=web_config.worker_concurrency,
+        poll_interval_seconds=web_config.worker_poll_interval_ms / 1000,
+        lease_seconds=web_config.job_lease_seconds,
+        timeout_seconds=web_config.job_timeout_seconds,
+        retry_base_seconds=web_config.job_retry_base_seconds,
+        retry_max_seconds=web_config.job_retry_max_seconds,
+    )
+
+
+async def run_worker(web_config: WebConfig) -> None:
+    if web_config.db_async:
+        db_ioc = ioc = make_async_ioc(web_config)
+    else:
+        db_ioc = make_ioc(web_config)
+        ioc = ThreadedIoC(db_ioc)
+
+    llm = make_llm(web_config, db_ioc)
+    if web_config.llm_backend == "fake":
+        generator = FakeTestGenerator()
+    else:
+        generator = LlmTestGenerator(llm.client)
+
+    worker = TestGenerationWorker(ioc, generator, worker_settings(web_config))
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    sweeper = asyncio.create_task(make_sweeper(web_config, db_ioc, ioc).run_forever())
+    try:
+        await worker.run()
+    finally:
+        sweeper.cancel()
+        await asyncio.gather(sweeper, return_exceptions=True)
+        for close in llm.closers:
+            await close()
+        if web_config.db_async:
+            await db_ioc.dispose()
+        else:
+            await to_thread.run_sync(db_ioc.dispose)
+
+
+def main() -> None:
+    setup_logging(load_log_config())
+    asyncio.run(run_worker(load_web_config()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,43 @@
 from abc import ABC, abstractmethod
-from typing import ContextManager
+from typing import AsyncContextManager, ContextManager
 
-from application.authenticate import Authenticate
-from application.login_student import LoginStudent
-from application.register_student import RegisterStudent
-from application.common.id_provider import IdProvider
+from application.append_chat_messages import (
+    AppendChatMessages, AppendChatMessagesCommand, AppendChatMessagesResult,
+)
+from application.authenticate import Authenticate, AuthenticateCurrentUser
+from application.claim_test_generation import (
+    ClaimedTestGeneration, ClaimTestGeneration, ClaimTestGenerationCommand,
+)
+from application.complete_test_generation import (
+    CompleteTestGeneration, CompleteTestGenerationCommand, CompleteTestGenerationResult,
+)
+from application.create_chat import CreateChat, CreateChatCommand, CreateChatResult
+from application.extend_job_lease import ExtendJobLease, ExtendJobLeaseCommand
+from application.fail_test_generation import (
+    FailTestGeneration, FailTestGenerationCommand, FailTestGenerationResult,
+)
+from application.get_content_versions import GetContentVersions, GetContentVersionsQuery
+from application.grade_test_attempts import (
+    GradeTestAttempts, GradeTestAttemptsCommand, GradeTestAttemptsResult,
+)
+from application.list_chats import ChatSummary, ListChats, ListChatsQuery
+from application.load_chat import ChatView, LoadChat, LoadChatQuery
+from application.load_test import LoadTest, LoadTestQuery
+from application.login_student import LoginStudent, LoginStudentCommand, LoginStudentResult
+from application.logout_student import LogoutStudent, LogoutStudentCommand
+from application.purge_expired_sessions import (
+    PurgeExpiredSessions, PurgeExpiredSessionsCommand, PurgeExpiredSessionsResult,
+)
+from application.register_student import (
+    RegisterStudent, RegisterStudentCommand, RegisterStudentResult,
+)
+from application.request_test_generation import (
+    RequestTestGeneration, RequestTestGenerationCommand, RequestTestGenerationResult,
+)
+from application.common.compiled_test import CompiledTest
+from application.common.id_provider import AsyncUserProvider, IdProvider, UserProvider
+from application.common.interactor import AsyncInteractor
+from domain.models.user import User
 
 
 class InteractorFactory(ABC):
@@ -15,6 +48,12 @@ class InteractorFactory(ABC):
     ) -> ContextManager[Authenticate]:
         raise NotImplementedError
 
+    @abstractmethod
+    def authenticate_current_user(
+            self, user_provider: UserProvider,
+    ) -> ContextManager[AuthenticateCurrentUser]:
+        raise NotImplementedError
+
     @abstractmethod
     def register_student(self) -> ContextManager[RegisterStudent]:
         raise NotImplementedError
@@ -22,3 +61,168 @@ class InteractorFactory(ABC):
     @abstractmethod
     def login_student(self) -> ContextManager[LoginStudent]:
         raise NotImplementedError
+
+    @abstractmethod
+    def logout_student(self) -> ContextManager[LogoutStudent]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_chat(self) -> ContextManager[CreateChat]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_chats(self) -> ContextManager[ListChats]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_chat(self) -> ContextManager[LoadChat]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_content_versions(self) -> ContextManager[GetContentVersions]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def append_chat_messages(self) -> ContextManager[AppendChatMessages]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def request_test_generation(self) -> ContextManager[RequestTestGeneration]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim_test_generation(self) -> ContextManager[ClaimTestGeneration]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete_test_generation(self) -> ContextManager[CompleteTestGeneration]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail_test_generation(self) -> ContextManager[FailTestGeneration]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def extend_job_lease(self) -> ContextManager[ExtendJobLease]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_test(self) -> ContextManager[LoadTest]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def grade_test_attempts(self) -> ContextManager[GradeTestAttempts]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def purge_expired_sessions(self) -> ContextManager[PurgeExpiredSessions]:
+        raise NotImplementedError
+
+
+class AsyncInteractorFactory(ABC):
+    """
+    What the web handlers use. Implemented natively by AsyncIoC or by
+    running a sync InteractorFactory in the thread pool.
+    """
+
+    @abstractmethod
+    def authenticate_current_user(
+            self, user_provider: AsyncUserProvider,
+    ) -> AsyncContextManager[AsyncInteractor[None, User]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def register_student(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[RegisterStudentCommand, RegisterStudentResult]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def login_student(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[LoginStudentCommand, LoginStudentResult]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def logout_student(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[LogoutStudentCommand, None]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_chat(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[CreateChatCommand, CreateChatResult]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_chats(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[ListChatsQuery, list[ChatSummary]]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_chat(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[LoadChatQuery, ChatView]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_content_versions(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[GetContentVersionsQuery, dict[str, int]]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def append_chat_messages(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[AppendChatMessagesCommand, AppendChatMessagesResult]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def request_test_generation(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[RequestTestGenerationCommand, RequestTestGenerationResult]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim_test_generation(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[ClaimTestGenerationCommand, list[ClaimedTestGeneration]]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete_test_generation(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[CompleteTestGenerationCommand, CompleteTestGenerationResult]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail_test_generation(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[FailTestGenerationCommand, FailTestGenerationResult]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def extend_job_lease(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[ExtendJobLeaseCommand, None]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def load_test(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[LoadTestQuery, CompiledTest]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def grade_test_attempts(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[GradeTestAttemptsCommand, GradeTestAttemptsResult]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def purge_expired_sessions(
+            self,
+    ) -> AsyncContextManager[AsyncInteractor[PurgeExpiredSessionsCommand, PurgeExpiredSessionsResult]]:
+        raise NotImplementedError
@@ -0,0 +1,160 @@
+"""
+Fingerprinted static assets.
+
+`python -m main.build_assets <dir>` copies every file under static/ to
+`<name>.<hash>.<ext>` next to `.gz` / `.br` siblings and a manifest.json
+mapping logical paths to hashed ones. Without a build the source files
+are hashed at startup instead and served under the same URLs,
+compressed per response by CompressionMiddleware. Either way templates link assets with `asset_url('js/app.js')`.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mimetypes
+import shutil
+from logging import getLogger
+from pathlib import Path, PurePosixPath
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from adapters.compression.codecs import (
+    BROTLI_AVAILABLE, CompressionLevels, accepted_encodings, compress,
+)
+
+logger = getLogger(__name__)
+
+MANIFEST = "manifest.json"
+# hashed names never change content: cache for a year without revalidating
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# preferred first
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+# already compressed formats gain nothing
+_INCOMPRESSIBLE = {".png", ".jpg", ".jpeg", ".gif", ".webp", ".woff", ".woff2", ".gz", ".br", ".zip"}
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def hashed_name(path: str, data: bytes) -> str:
+    posix = PurePosixPath(path)
+    return str(posix.with_name(f"{posix.stem}.{content_hash(data)}{posix.suffix}"))
+
+
+def _source_files(source: Path) -> list[str]:
+    return sorted(
+        path.relative_to(source).as_posix()
+        for path in source.rglob("*")
+        if path.is_file() and "__pycache__" not in path.parts
+    )
+
+
+class AssetManifest:
+    """Logical asset path -> fingerprinted URL, plus where each URL lives on disk."""
+
+    def __init__(self, url_prefix: str, hashed: dict[str, str], disk: dict[str, str]):
+        self.url_prefix = url_prefix.rstrip("/")
+        # "js/app.js" -> "js/app.3f2a9c0d1b7e.js"
+        self.hashed = hashed
+        # "js/app.3f2a9c0d1b7e.js" -> file to serve, relative to the static dir
+        self.disk = disk
+
+    @classmethod
+    def load(cls, build_dir: Path, url_prefix: str) -> AssetManifest:
+        hashed = json.loads((build_dir / MANIFEST).read_text())
+        return cls(url_prefix, hashed, {name: name for name in hashed.values()})
+
+    @classmethod
+    def scan(cls, source: Path, url_prefix: str) -> AssetManifest:
+        hashed = {
+            name: hashed_name(name, (source / name).read_bytes())
+            for name in _source_files(source)
+        }
+        return cls(url_prefix, hashed, {fingerprinted: name for name, fingerprinted in hashed.items()})
+
+    def url(self, path: str) -> str:
+        # unknown paths still resolve, just without long-lived caching
+        return f"{self.url_prefix}/{self.hashed.get(path, path)}"
+
+
+# built once, so the slowest, smallest settings
+BUILD_LEVELS = CompressionLevels(gzip_level=9, brotli_quality=11)
+
+
+def build_assets(source: Path, target: Path, levels: CompressionLevels = BUILD_LEVELS) -> dict[str, str]:
+    """Writes the fingerprinted copies, their compressed siblings and the manifest."""
+    if target.exists():
+        shutil.rmtree(target)
+    hashed = {}
+    for name in _source_files(source):
+        data = (source / name).read_bytes()
+        out = target / hashed_name(name, data)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_bytes(data)
+        # the plain name too, for links that bypass asset_url
+        (target / name).write_bytes(data)
+        hashed[name] = out.relative_to(target).as_posix()
+
+        if out.suffix.lower() in _INCOMPRESSIBLE:
+            continue
+        siblings = {".gz": compress(data, "gzip", levels)}
+        if BROTLI_AVAILABLE:
+            siblings[".br"] = compress(data, "br", levels)
+        for suffix, compressed in siblings.items():
+            # only worth a lookup when it is actually smaller
+            if len(compressed) < len(data):
+                out.with_name(out.name + suffix).write_bytes(compressed)
+    if not BROTLI_AVAILABLE:
+        logger.warning("brotli is not installed: no .br assets built")
+    (target / MANIFEST).write_text(json.dumps(hashed, indent=2, sort_keys=True))
+    return hashed
+
+
+class FingerprintedStaticFiles(StaticFiles):
+    """
+    Serves fingerprinted URLs as immutable, picking a precompressed
+    sibling the client accepts. Other paths are plain StaticFiles.
+    """
+
+    def __init__(self, *, directory: Path, manifest: AssetManifest):
+        super().__init__(directory=str(directory))
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        name = self.manifest.disk.get(PurePosixPath(path).as_posix())
+        if name is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding"))
+        response = None
+        for encoding, suffix in _PRECOMPRESSED:
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, name + suffix)
+            if stat_result is not None:
+                response = self.file_response(full_path, stat_result, scope)
+                if response.status_code != 304:
+                    response.headers["content-type"] = _media_type(name)
+                response.headers["content-encoding"] = encoding
+                break
+        if response is None:
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, name)
+            if stat_result is None:
+                raise HTTPException(status_code=404)
+            response = self.file_response(full_path, stat_result, scope)
+
+        response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+        response.headers["vary"] = "Accept-Encoding"
+        return response
+
+
+def _media_type(name: str) -> str:
+    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    return f"{media_type}; charset=utf-8" if media_type.startswith("text/") else media_type
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from fastapi import Request, Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SESSION_COOKIE = "session_key"
+TOKEN_COOKIE = "token"
+
+SESSION_MAX_AGE_SECONDS = 60 * 60 * 24 * 30  # 30 days
+
+# request.state attribute a refreshed access token is parked in
+_REFRESHED_TOKEN = "refreshed_access_token"
+
+_COOKIE_OPTIONS = dict(
+    httponly=True,
+    samesite="lax",
+    secure=False,  # set True behind HTTPS
+)
+
+
+def set_auth_cookies(response: Response, session_key: str, access_token: str | None) -> None:
+    response.set_cookie(
+        SESSION_COOKIE, session_key, max_age=SESSION_MAX_AGE_SECONDS, **_COOKIE_OPTIONS,
+    )
+    if access_token is not None:
+        # browser-session cookie: the token inside expires long before
+        response.set_cookie(TOKEN_COOKIE, access_token, **_COOKIE_OPTIONS)
+
+
+def delete_auth_cookies(response: Response) -> None:
+    response.delete_cookie(SESSION_COOKIE)
+    response.delete_cookie(TOKEN_COOKIE)
+
+
+def remember_refreshed_token(request: Request, access_token: str) -> None:
+    setattr(request.state, _REFRESHED_TOKEN, access_token)
+
+
+class RefreshedTokenMiddleware:
+    """
+    Sets the token cookie when the user provider refreshed the access
+    token during the request. Handlers return their own Response objects,
+    so a dependency cannot add the cookie itself.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                token = scope.get("state", {}).get(_REFRESHED_TOKEN)
+                # a handler that logged out or in set the cookies itself
+                if token is not None and not _sets_token_cookie(message):
+                    cookie = Response()
+                    cookie.set_cookie(TOKEN_COOKIE, token, **_COOKIE_OPTIONS)
+                    MutableHeaders(scope=message).append("set-cookie", cookie.headers["set-cookie"])
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+def _sets_token_cookie(message: Message) -> bool:
+    prefix = f"{TOKEN_COOKIE}=".encode()
+    return any(
+        name.lower() == b"set-cookie" and value.startswith(prefix)
+        for name, value in message.get("headers", [])
+    )
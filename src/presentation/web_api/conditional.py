@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+from fastapi import Request, Response
+
+# per-user content the browser may keep but has to revalidate every time
+PARTIAL_CACHE_CONTROL = "private, no-cache"
+
+
+def template_revision(directory: Path) -> str:
+    """Short hash of the template sources: a deploy that changes the markup changes every ETag."""
+    digest = hashlib.sha1()
+    for path in sorted(directory.rglob("*.html")):
+        digest.update(path.relative_to(directory).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:10]
+
+
+def weak_etag(*parts: object) -> str:
+    # weak: equal versions render equivalent, not byte-identical, HTML
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    # "*" is not honoured: on per-user partials a 304 for it would answer
+    # before anything checked that the content exists for this user
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def caching_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": PARTIAL_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=caching_headers(etag))
@@ -1,19 +1,24 @@
+from functools import partial
+from typing import Callable
+
 from fastapi import Depends, Request
 from typing_extensions import Annotated
 
-from adapters.auth.session import SessionIdProvider
-from adapters.auth.token import JwtTokenProcessor, TokenIdProvider
-from adapters.database.session_db import SessionGateway
-from application.common.id_provider import IdProvider
+from adapters.auth.session import AsyncSessionUserProvider, SessionIdProvider, SessionUserProvider
+from adapters.auth.threaded import ThreadedUserProvider
+from adapters.auth.token import JwtTokenProcessor, TokenIdProvider, TokenUserProvider
+from adapters.database.session_db import AsyncSessionGateway, SessionGateway
+from application.common.id_provider import AsyncUserProvider, IdProvider, UserProvider
+from presentation.web_api.auth_cookies import SESSION_COOKIE, TOKEN_COOKIE, remember_refreshed_token
 from presentation.web_api.dependencies.depends_stub import Stub
 
 
 async def token_from_cookie(request: Request) -> str | None:
-    return request.cookies.get("token")
+    return request.cookies.get(TOKEN_COOKIE)
 
 
 async def session_key_from_cookie(request: Request) -> str | None:
-    return request.cookies.get("session_key")
+    return request.cookies.get(SESSION_COOKIE)
 
 
 def token_id_provider(
@@ -34,3 +39,50 @@ def session_id_provider(
         session_gateway=session_gateway,
         session_key=session_key,
     )
+
+
+def session_user_provider(
+    session_gateway: Annotated[SessionGateway, Depends(Stub(SessionGateway))],
+    session_key: Annotated[str | None, Depends(session_key_from_cookie)],
+) -> UserProvider:
+    return SessionUserProvider(
+        session_gateway=session_gateway,
+        session_key=session_key,
+    )
+
+
+def threaded_session_user_provider(
+    user_provider: Annotated[UserProvider, Depends(session_user_provider)],
+) -> AsyncUserProvider:
+    return ThreadedUserProvider(user_provider)
+
+
+def async_session_user_provider(
+    session_gateway: Annotated[AsyncSessionGateway, Depends(Stub(AsyncSessionGateway))],
+    session_key: Annotated[str | None, Depends(session_key_from_cookie)],
+) -> AsyncUserProvider:
+    return AsyncSessionUserProvider(
+        session_gateway=session_gateway,
+        session_key=session_key,
+    )
+
+
+def hybrid_user_provider(
+    session_user_provider_dependency: Callable[..., AsyncUserProvider],
+) -> Callable[..., AsyncUserProvider]:
+    """Access token first, `session_user_provider_dependency` to refresh it."""
+
+    def token_user_provider(
+        request: Request,
+        token_processor: Annotated[JwtTokenProcessor, Depends(Stub(JwtTokenProcessor))],
+        token: Annotated[str | None, Depends(token_from_cookie)],
+        session_user_provider: Annotated[AsyncUserProvider, Depends(session_user_provider_dependency)],
+    ) -> AsyncUserProvider:
+        return TokenUserProvider(
+            token_processor=token_processor,
+            token=token,
+            session_user_provider=session_user_provider,
+            on_refresh=partial(remember_refreshed_token, request),
+        )
+
+    return token_user_provider
@@ -0,0 +1,16 @@
+import hmac
+from typing import Callable
+
+from fastapi import HTTPException, Request
+
+
+def bearer_token_guard(token: str) -> Callable[[Request], None]:
+    """Dependency admitting only requests with `Authorization: Bearer <token>`."""
+    expected = f"Bearer {token}".encode()
+
+    def guard(request: Request) -> None:
+        provided = request.headers.get("authorization", "").encode()
+        if not hmac.compare_digest(provided, expected):
+            raise HTTPException(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+
+    return guard
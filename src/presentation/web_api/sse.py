@@ -0,0 +1,11 @@
+def sse_event(event: str, data: str = "") -> str:
+    """One Server-Sent Events frame; multi-line data becomes several data: fields."""
+    lines = data.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return f"event: {event}\n" + "".join(f"data: {line}\n" for line in lines) + "\n"
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # keep reverse proxies (nginx) from buffering the stream
+    "X-Accel-Buffering": "no",
+}
@@ -16,6 +16,18 @@ document.body.addEventListener("htmx:afterSwap", (evt) => {
   }
 });
 
+// new messages are appended out-of-band after a choice
+document.body.addEventListener("htmx:oobAfterSwap", (evt) => {
+  if (evt.detail?.target?.id === "chat-messages") {
+    scrollChatToBottom();
+  }
+});
+
+// keep following a streamed assistant reply
+document.body.addEventListener("htmx:sseMessage", () => {
+  scrollChatToBottom();
+});
+
 // prevent double submit on choice buttons
 document.body.addEventListener("htmx:beforeRequest", (evt) => {
   const btn = evt.target?.querySelector?.("button[type='submit']");
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from logging import getLogger
+from pathlib import Path
+
+from jinja2 import ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, ModuleLoader
+
+logger = getLogger(__name__)
+
+# the templates directory is also a Python package
+_EXTENSIONS = ["html"]
+
+
+@dataclass(frozen=True)
+class TemplateConfig:
+    # off in production: a template never changes under a running worker
+    auto_reload: bool = False
+    bytecode_cache: bool = True
+    # None: Jinja's per-user temp directory, shared by the workers of a host
+    bytecode_cache_dir: str | None = None
+    # output of `python -m main.precompile_templates`; used when present
+    precompiled_dir: str | None = None
+
+
+def configure_templates(env: Environment, config: TemplateConfig) -> None:
+    env.auto_reload = config.auto_reload
+    if config.bytecode_cache:
+        if config.bytecode_cache_dir:
+            Path(config.bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+        env.bytecode_cache = FileSystemBytecodeCache(config.bytecode_cache_dir)
+    if config.precompiled_dir:
+        if Path(config.precompiled_dir).is_dir():
+            # precompiled modules first, sources for anything added since
+            env.loader = ChoiceLoader([ModuleLoader(config.precompiled_dir), env.loader])
+        else:
+            logger.warning("No precompiled templates in %s, compiling from source", config.precompiled_dir)
+
+
+def precompile_templates(env: Environment, target: str) -> None:
+    env.compile_templates(target, extensions=_EXTENSIONS, zip=None, ignore_errors=False)
+
+
+def warm_templates(env: Environment, directory: Path) -> int:
+    """Loads (compiles or fetches from cache) every template; returns how many."""
+    started = time.perf_counter()
+    names = [
+        name for name in FileSystemLoader(str(directory)).list_templates()
+        if name.rsplit(".", 1)[-1] in _EXTENSIONS
+    ]
+    for name in names:
+        env.get_template(name)
+    logger.info("Warmed %d templates in %.1f ms", len(names), (time.perf_counter() - started) * 1000)
+    return len(names)
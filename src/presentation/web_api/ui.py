@@ -1,38 +1,61 @@
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Any
-from uuid import uuid4
 
 from fastapi import APIRouter, Depends, Form, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from markupsafe import escape
 from typing_extensions import Annotated
 
-from application.common.id_provider import IdProvider
+from adapters.cache.fragment_cache import FragmentCache
+from application.append_chat_messages import AppendChatMessagesCommand
+from application.common.access_token import AccessClaims, AccessTokenIssuer
+from application.common.chat import NewChatMessage
+from application.common.chat_gateway import MessageCursor
+from application.common.content_version import chat_list_version_key, chat_version_key
+from application.common.id_provider import AsyncUserProvider
+from application.common.llm import CompletionRequest, LlmBackendError, LlmClient, LlmMessage
+from application.common.rate_limit import LoginThrottle
+from application.create_chat import CreateChatCommand
+from application.get_content_versions import GetContentVersionsQuery
+from application.list_chats import ChatSummary, ListChatsQuery
+from application.load_chat import ChatView, LoadChatQuery
 from application.login_student import LoginStudentCommand
+from application.logout_student import LogoutStudentCommand
 from application.register_student import RegisterStudentCommand
-from domain.exceptions.auth import AuthenticationError, RegistrationError
+from domain.exceptions.auth import (
+    AuthenticationError, PasswordHashingBusyError, RegistrationError, TooManyAttemptsError,
+)
+from domain.exceptions.chat import ChatNotFoundError, InvalidChatActionError
+from domain.models.chat import ChatMessage
+from domain.models.enums import MessageRole
 from domain.models.user import User
-from presentation.interactor_factory import InteractorFactory
+from presentation.interactor_factory import AsyncInteractorFactory
+from presentation.web_api.auth_cookies import SESSION_COOKIE, delete_auth_cookies, set_auth_cookies
+from presentation.web_api.conditional import (
+    caching_headers, etag_matches, not_modified, template_revision, weak_etag,
+)
 from presentation.web_api.dependencies.depends_stub import Stub
-from presentation.web_api.dependencies.id_provider import session_id_provider
+from presentation.web_api.sse import SSE_HEADERS, sse_event
 
 BASE_DIR = Path(__file__).resolve().parent
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+TEMPLATES_DIR = BASE_DIR / "templates"
+STATIC_DIR = BASE_DIR / "static"
+# tuned by main.web.setup_templates
+templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
+# part of every partial's ETag
+TEMPLATE_REVISION = template_revision(TEMPLATES_DIR)
 
 router = APIRouter(include_in_schema=False)
 
 
 # ----------------------------
-# In-memory demo storage (replace with DB/interactors)
+# View models / demo flow (buttons-only)
 # ----------------------------
-@dataclass
-class ChatSummary:
-    id: str
-    title: str
-
 @dataclass
 class ChoiceVM:
     id: str
@@ -45,63 +68,243 @@ class MessageVM:
     text: str
 
 
-_SESSIONS: dict[str, dict[str, Any]] = {}
-_CHATS: dict[str, dict[str, Any]] = {}
+# flow_step stored on the chat -> buttons offered at that step
+_FLOW_CHOICES: dict[str, list[ChoiceVM]] = {
+    "choose_topic": [
+        ChoiceVM(id="topic_fractions", label="Fractions"),
+        ChoiceVM(id="topic_equations", label="Equations"),
+        ChoiceVM(id="topic_geometry", label="Geometry"),
+    ],
+    "confirm_start": [
+        ChoiceVM(id="start_test_yes", label="Yes"),
+        ChoiceVM(id="start_test_no", label="No"),
+    ],
+    "question_1": [
+        ChoiceVM(id="a", label="3/4"),
+        ChoiceVM(id="b", label="2/6"),
+        ChoiceVM(id="c", label="1/6"),
+    ],
+    "explain": [],
+    "finished": [],
+}
+
+# messages rendered per page of chat history
+CHAT_PAGE_SIZE = 30
+
+_INITIAL_STEP = "choose_topic"
+# assistant reply is being streamed; no buttons until it is stored
+_STREAMING_STEP = "explain"
+# history sent to the model with each streamed reply
+_PROMPT_HISTORY = 20
+_TUTOR_PROMPT = (
+    "You are a patient math tutor for school students. "
+    "Explain the solution briefly and clearly, in at most five short sentences."
+)
+_INITIAL_MESSAGES = [
+    NewChatMessage(role=MessageRole.ASSISTANT, kind="question", content="Choose a topic:"),
+]
+
+
+def _choices(flow_step: str | None) -> list[ChoiceVM]:
+    return _FLOW_CHOICES.get(flow_step or "", [])
+
+
+def _next_turn(
+    flow_step: str | None, picked: ChoiceVM,
+) -> tuple[list[NewChatMessage], str | None]:
+    messages = [
+        NewChatMessage(role=MessageRole.USER, kind="user_choice", content=picked.label),
+    ]
+
+    # demo next step (replace with your application interactor)
+    if picked.id.startswith("topic_"):
+        messages.append(NewChatMessage(
+            role=MessageRole.ASSISTANT,
+            kind="question",
+            content=f"Great. Start the test for “{picked.label}”?",
+        ))
+        return messages, "confirm_start"
+    if picked.id == "start_test_yes":
+        messages.append(NewChatMessage(
+            role=MessageRole.ASSISTANT,
+            kind="question",
+            content="Q1) 1/2 + 1/4 = ?",
+        ))
+        return messages, "question_1"
+    if picked.id in {"a", "b", "c"}:
+        is_correct = (picked.id == "a")
+        messages.append(NewChatMessage(
+            role=MessageRole.ASSISTANT,
+            kind="feedback",
+            content=("✅ Correct!" if is_correct else "❌ Incorrect. The answer is 3/4."),
+        ))
+        # the explanation is streamed from the LLM by /chat/{id}/stream
+        return messages, _STREAMING_STEP
+    return messages, flow_step
+
+
+def _explanation_request(history: list[ChatMessage]) -> CompletionRequest:
+    prompt = [LlmMessage(role="system", content=_TUTOR_PROMPT)]
+    prompt.extend(
+        LlmMessage(role=MessageRole(m.role).value, content=m.content)
+        for m in history
+    )
+    prompt.append(LlmMessage(
+        role="user",
+        content="Explain step by step how to solve the last question.",
+    ))
+    return CompletionRequest(messages=tuple(prompt), max_tokens=300)
+
+
+def _explanation_messages(text: str) -> list[NewChatMessage]:
+    return [
+        NewChatMessage(role=MessageRole.ASSISTANT, kind="feedback", content=text),
+        NewChatMessage(
+            role=MessageRole.ASSISTANT,
+            kind="info",
+            content="(Demo) Test finished. Chat deactivated.",
+        ),
+    ]
+
+
+def _message_vm(message: ChatMessage | NewChatMessage) -> MessageVM:
+    role = MessageRole(message.role)
+    return MessageVM(
+        role=role.value,
+        kind=message.kind or ("user_choice" if role == MessageRole.USER else "info"),
+        text=message.content,
+    )
+
+
+def _client_ip(request: Request) -> str | None:
+    # the peer address; behind a proxy run uvicorn with --proxy-headers
+    return request.client.host if request.client else None
 
 
 def _get_session_key(request: Request) -> str | None:
-    return request.cookies.get("session_key")
+    return request.cookies.get(SESSION_COOKIE)
 
 
-def _require_session_key(request: Request) -> str:
-    sk = _get_session_key(request)
-    if not sk:
-        raise RuntimeError("NO_SESSION")
-    return sk
+def _access_token(token_issuer: AccessTokenIssuer | None, claims: AccessClaims) -> str | None:
+    # None: session-only auth mode
+    return token_issuer.issue_access_token(claims) if token_issuer is not None else None
 
 
-def _ensure_chat_state(session_key: str, user: User) -> None:
-    grade = user.student_profile.grade if user.student_profile else None
-    _SESSIONS.setdefault(
-        session_key,
-        {
-            "name": user.full_name or user.email,
-            "grade": grade,
-            "chat_ids": [],
-        },
+async def _require_user(
+    user_provider: AsyncUserProvider,
+    ioc: AsyncInteractorFactory,
+) -> User:
+    async with ioc.authenticate_current_user(user_provider) as authenticate:
+        return await authenticate(None)
+
+
+async def _list_chats(ioc: AsyncInteractorFactory, user: User) -> list[ChatSummary]:
+    async with ioc.list_chats() as list_chats:
+        return await list_chats(ListChatsQuery(user_id=user.id))
+
+
+async def _load_chat(
+    ioc: AsyncInteractorFactory,
+    user: User,
+    chat_id: int,
+    limit: int = CHAT_PAGE_SIZE,
+    before: MessageCursor | None = None,
+) -> ChatView:
+    async with ioc.load_chat() as load_chat:
+        return await load_chat(LoadChatQuery(
+            user_id=user.id, chat_id=chat_id, limit=limit, before=before,
+        ))
+
+
+async def _content_versions(
+        ioc: AsyncInteractorFactory, keys: list[str], user: User | None = None, chat_id: int | None = None,
+) -> dict[str, int]:
+    async with ioc.get_content_versions() as get_content_versions:
+        return await get_content_versions(GetContentVersionsQuery(
+            keys=keys,
+            chat_id=chat_id,
+            user_id=user.id if user is not None else None,
+        ))
+
+
+# The partials below don't use `request`, so a rendered fragment only
+# depends on its cache key: template, user, selected chat and the
+# version of the content shown.
+def _render_chats_list(chats: list[ChatSummary], current_chat_id: int | None) -> str:
+    return templates.get_template("partials/chats_list.html").render(
+        chats=chats,
+        current_chat_id=current_chat_id,
     )
 
 
-def _require_authenticated_session(
-    request: Request,
-    id_provider: IdProvider,
-    ioc: InteractorFactory,
-) -> tuple[str, User]:
-    session_key = _require_session_key(request)
-    with ioc.authenticate(id_provider) as authenticate:
-        user = authenticate(None)
-    _ensure_chat_state(session_key, user)
-    return session_key, user
+def _render_chat_view(
+    chat_id: int,
+    messages: list[MessageVM],
+    flow_step: str | None,
+    older_cursor: MessageCursor | None = None,
+) -> str:
+    return templates.get_template("partials/chat_view.html").render(
+        chat_id=chat_id,
+        messages=messages,
+        choices=_choices(flow_step),
+        streaming=flow_step == _STREAMING_STEP,
+        older_cursor=older_cursor,
+    )
+
+
+async def _chats_list_html(
+    ioc: AsyncInteractorFactory,
+    fragments: FragmentCache,
+    user: User,
+    current_chat_id: int | None,
+    version: int,
+) -> str:
+    key = ("chats_list", user.id, current_chat_id, version)
+    html = fragments.get(key)
+    if html is None:
+        chats = await _list_chats(ioc, user)
+        html = fragments.render(key, lambda: _render_chats_list(chats, current_chat_id))
+    return html
+
+
+# password hashing is saturated: ask the browser to come back shortly
+_BUSY_HEADERS = {"Retry-After": "2"}
+
 
+def _retry_headers(retry_after: float) -> dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(retry_after)))}
 
-def _render_login(request: Request, error: str | None = None) -> HTMLResponse:
+
+def _render_login(
+        request: Request,
+        error: str | None = None,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+) -> HTMLResponse:
     return templates.TemplateResponse(
         "login.html",
         {"request": request, "error": error},
-        status_code=200,
+        status_code=status_code,
+        headers=_BUSY_HEADERS if status_code == 503 else headers,
     )
 
 
-def _render_register(request: Request, error: str | None = None) -> HTMLResponse:
+def _render_register(
+        request: Request,
+        error: str | None = None,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+) -> HTMLResponse:
     return templates.TemplateResponse(
         "register.html",
         {"request": request, "error": error},
-        status_code=200,
+        status_code=status_code,
+        headers=_BUSY_HEADERS if status_code == 503 else headers,
     )
 
 
 @router.get("/login", response_class=HTMLResponse)
-def login_page(request: Request):
+async def login_page(request: Request):
     # If already logged in => go to app
     sk = _get_session_key(request)
     if sk:
@@ -110,15 +313,25 @@ def login_page(request: Request):
 
 
 @router.post("/login")
-def login_submit(
+async def login_submit(
     request: Request,
-    ioc: Annotated[InteractorFactory, Depends(Stub(InteractorFactory))],
+    ioc: Annotated[AsyncInteractorFactory, Depends(Stub(AsyncInteractorFactory))],
+    throttle: Annotated[LoginThrottle, Depends(Stub(LoginThrottle))],
+    token_issuer: Annotated[AccessTokenIssuer | None, Depends(Stub(AccessTokenIssuer))],
     email: str = Form(...),
     password: str = Form(...),
 ):
+    # before any database or hashing work
+    try:
+        await throttle.check(_client_ip(request), email)
+    except TooManyAttemptsError as exc:
+        return _render_login(
+            request, error=str(exc), status_code=429, headers=_retry_headers(exc.retry_after),
+        )
+
     try:
-        with ioc.login_student() as login_student:
-            result = login_student(
+        async with ioc.login_student() as login_student:
+            result = await login_student(
                 LoginStudentCommand(
                     email=email,
                     password=password,
@@ -126,27 +339,16 @@ def login_submit(
             )
     except AuthenticationError as exc:
         return _render_login(request, error=str(exc))
-
-    _SESSIONS[result.session_key] = {
-        "name": result.full_name,
-        "grade": result.grade,
-        "chat_ids": [],
-    }
+    except PasswordHashingBusyError as exc:
+        return _render_login(request, error=str(exc), status_code=503)
 
     resp = RedirectResponse("/app", status_code=303)
-    resp.set_cookie(
-        "session_key",
-        result.session_key,
-        httponly=True,
-        samesite="lax",
-        secure=False,  # set True behind HTTPS
-        max_age=60 * 60 * 24 * 30,  # 30 days
-    )
+    set_auth_cookies(resp, result.session_key, _access_token(token_issuer, result.claims))
     return resp
 
 
 @router.get("/students/register", response_class=HTMLResponse)
-def student_register_page(request: Request):
+async def student_register_page(request: Request):
     sk = _get_session_key(request)
     if sk:
         return RedirectResponse("/app", status_code=303)
@@ -154,17 +356,26 @@ def student_register_page(request: Request):
 
 
 @router.post("/students/register")
-def student_register_submit(
+async def student_register_submit(
     request: Request,
-    ioc: Annotated[InteractorFactory, Depends(Stub(InteractorFactory))],
+    ioc: Annotated[AsyncInteractorFactory, Depends(Stub(AsyncInteractorFactory))],
+    throttle: Annotated[LoginThrottle, Depends(Stub(LoginThrottle))],
+    token_issuer: Annotated[AccessTokenIssuer | None, Depends(Stub(AccessTokenIssuer))],
     name: str = Form(...),
     email: str = Form(...),
     password: str = Form(...),
     grade: int = Form(...),
 ):
     try:
-        with ioc.register_student() as register_student:
-            result = register_student(
+        await throttle.check(_client_ip(request), email)
+    except TooManyAttemptsError as exc:
+        return _render_register(
+            request, error=str(exc), status_code=429, headers=_retry_headers(exc.retry_after),
+        )
+
+    try:
+        async with ioc.register_student() as register_student:
+            result = await register_student(
                 RegisterStudentCommand(
                     full_name=name,
                     email=email,
@@ -174,57 +385,53 @@ def student_register_submit(
             )
     except RegistrationError as exc:
         return _render_register(request, error=str(exc))
-
-    _SESSIONS[result.session_key] = {
-        "name": result.full_name,
-        "grade": result.grade,
-        "chat_ids": [],
-    }
+    except PasswordHashingBusyError as exc:
+        return _render_register(request, error=str(exc), status_code=503)
 
     resp = RedirectResponse("/app", status_code=303)
-    resp.set_cookie(
-        "session_key",
-        result.session_key,
-        httponly=True,
-        samesite="lax",
-        secure=False,  # set True behind HTTPS
-        max_age=60 * 60 * 24 * 30,  # 30 days
-    )
+    set_auth_cookies(resp, result.session_key, _access_token(token_issuer, result.claims))
     return resp
 
 
 @router.get("/logout")
-def logout(request: Request):
+async def logout(
+    request: Request,
+    ioc: Annotated[AsyncInteractorFactory, Depends(Stub(AsyncInteractorFactory))],
+):
     sk = _get_session_key(request)
     if sk:
-        _SESSIONS.pop(sk, None)
+        async with ioc.logout_student() as logout_student:
+            await logout_student(LogoutStudentCommand(session_key=sk))
     resp = RedirectResponse("/login", status_code=303)
-    resp.delete_cookie("session_key")
+    delete_auth_cookies(resp)
     return resp
 
 
 @router.get("/app", response_class=HTMLResponse)
-def app_shell(
+async def app_shell(
     request: Request,
-    id_provider: Annotated[IdProvider, Depends(session_id_provider)],
-    ioc: Annotated[InteractorFactory, Depends(Stub(InteractorFactory))],
-    chat_id: str | None = None,
+    user_provider: Annotated[AsyncUserProvider, Depends(Stub(AsyncUserProvider))],
+    ioc: Annotated[AsyncInteractorFactory, Depends(Stub(AsyncInteractorFactory))],
+    chat_id: int | None = None,
 ):
     try:
-        sk, _user = _require_authenticated_session(request, id_provider, ioc)
-    except (RuntimeError, AuthenticationError):
+        user = await _require_user(user_provider, ioc)
+    except AuthenticationError:
         return RedirectResponse("/login", status_code=303)
 
     # pick current chat
-    chat_ids = _SESSIONS[sk]["chat_ids"]
-    current_chat_id = chat_id or (chat_ids[0] if chat_ids else None)
+    current_chat_id = chat_id
+    if current_chat_id is None:
+        async with ioc.list_chats() as list_chats:
+            latest = await list_chats(ListChatsQuery(user_id=user.id, limit=1))
+        current_chat_id = latest[0].id if latest else None
 
     return templates.TemplateResponse(
         "app.html",
         {
             "request": request,
-            "student_name": _SESSIONS[sk]["name"],
-            "grade": _SESSIONS[sk]["grade"],
+            "student_name": user.full_name or user.email,
+            "grade": user.student_profile.grade if user.student_profile else None,
             "current_chat_id": current_chat_id,
         },
     )
@@ -234,76 +441,58 @@ def app_shell(
 # Partials (HTMX)
 # ----------------------------
 @router.get("/partials/chats", response_class=HTMLResponse)
-def partial_chats_list(
+async def partial_chats_list(
     request: Request,
-    id_provider: Annotated[IdProvider, Depends(session_id_provider)],
-    ioc: Annotated[InteractorFactory, Depends(Stub(InteractorFactory))],
-    current_chat_id: str | None = None,
+    user_provider: Annotated[AsyncUserProvider, Depends(Stub(AsyncUserProvider))],
+    ioc: Annotated[AsyncInteractorFactory, Depends(Stub(AsyncInteractorFactory))],
+    fragments: Annotated[FragmentCache, Depends(Stub(FragmentCache))],
+    current_chat_id: int | None = None,
 ):
     try:
-        sk, _user = _require_authenticated_session(request, id_provider, ioc)
-    except (RuntimeError, AuthenticationError):
+        user = await _require_user(user_provider, ioc)
+    except AuthenticationError:
         return RedirectResponse("/login", status_code=303)
 
-    chats = []
-    for cid in _SESSIONS[sk]["chat_ids"]:
-        chat = _CHATS[cid]
-        chats.append(ChatSummary(id=cid, title=chat["title"]))
+    list_key = chat_list_version_key(user.id)
+    versions = await _content_versions(ioc, [list_key])
+    etag = weak_etag(TEMPLATE_REVISION, user.id, current_chat_id, versions[list_key])
+    if etag_matches(request, etag):
+        return not_modified(etag)
 
-    return templates.TemplateResponse(
-        "partials/chats_list.html",
-        {
-            "request": request,
-            "chats": chats,
-            "current_chat_id": current_chat_id,
-        },
+    return HTMLResponse(
+        await _chats_list_html(ioc, fragments, user, current_chat_id, versions[list_key]),
+        headers=caching_headers(etag),
     )
 
 
 @router.post("/chat/new", response_class=HTMLResponse)
-def create_chat(
-    request: Request,
-    id_provider: Annotated[IdProvider, Depends(session_id_provider)],
-    ioc: Annotated[InteractorFactory, Depends(Stub(InteractorFactory))],
+async def create_chat(
+    user_provider: Annotated[AsyncUserProvider, Depends(Stub(AsyncUserProvider))],
+    ioc: Annotated[AsyncInteractorFactory, Depends(Stub(AsyncInteractorFactory))],
+    fragments: Annotated[FragmentCache, Depends(Stub(FragmentCache))],
 ):
     try:
-        sk, _user = _require_authenticated_session(request, id_provider, ioc)
-    except (RuntimeError, AuthenticationError):
+        user = await _require_user(user_provider, ioc)
+    except AuthenticationError:
         return RedirectResponse("/login", status_code=303)
 
-    cid = str(uuid4())
-    title = f"Chat #{len(_SESSIONS[sk]['chat_ids']) + 1}"
-
-    _CHATS[cid] = {
-        "title": title,
-        "messages": [
-            MessageVM(role="assistant", kind="question", text="Choose a topic:"),
-        ],
-        "choices": [
-            ChoiceVM(id="topic_fractions", label="Fractions"),
-            ChoiceVM(id="topic_equations", label="Equations"),
-            ChoiceVM(id="topic_geometry", label="Geometry"),
-        ],
-    }
-    _SESSIONS[sk]["chat_ids"].insert(0, cid)
-
-    # Build chats list data
-    chats = [
-        ChatSummary(id=xid, title=_CHATS[xid]["title"])
-        for xid in _SESSIONS[sk]["chat_ids"]
-    ]
-
-    # Render partials to strings
-    chats_html = templates.get_template("partials/chats_list.html").render(
-        request=request,
-        chats=chats,
-        current_chat_id=cid,
-    )
-    chat_html = templates.get_template("partials/chat_view.html").render(
-        request=request,
-        chat_id=cid,
-        messages=_CHATS[cid]["messages"],
-        choices=_CHATS[cid]["choices"],
+    async with ioc.create_chat() as create_chat_:
+        created = await create_chat_(CreateChatCommand(
+            user_id=user.id,
+            messages=_INITIAL_MESSAGES,
+            flow_step=_INITIAL_STEP,
+        ))
+    cid = created.chat_id
+
+    # Render partials to strings; the sidebar is cached under the version
+    # the new chat bumped it to, for the clicks that follow
+    list_key = chat_list_version_key(user.id)
+    versions = await _content_versions(ioc, [list_key])
+    chats_html = await _chats_list_html(ioc, fragments, user, cid, versions[list_key])
+    chat_html = _render_chat_view(
+        cid,
+        [_message_vm(m) for m in _INITIAL_MESSAGES],
+        _INITIAL_STEP,
     )
 
     # OOB swaps: update sidebar + main chat pane without reload
@@ -326,39 +515,48 @@ def create_chat(
 
 
 @router.get("/partials/chat/{chat_id}", response_class=HTMLResponse)
-def partial_chat_view(
+async def partial_chat_view(
     request: Request,
-    chat_id: str,
-    id_provider: Annotated[IdProvider, Depends(session_id_provider)],
-    ioc: Annotated[InteractorFactory, Depends(Stub(InteractorFactory))],
+    chat_id: int,
+    user_provider: Annotated[AsyncUserProvider, Depends(Stub(AsyncUserProvider))],
+    ioc: Annotated[AsyncInteractorFactory, Depends(Stub(AsyncInteractorFactory))],
+    fragments: Annotated[FragmentCache, Depends(Stub(FragmentCache))],
 ):
     try:
-        sk, _user = _require_authenticated_session(request, id_provider, ioc)
-    except (RuntimeError, AuthenticationError):
+        user = await _require_user(user_provider, ioc)
+    except AuthenticationError:
         return RedirectResponse("/login", status_code=303)
 
-    if chat_id not in _SESSIONS[sk]["chat_ids"]:
+    # The chat version is only read for a chat of this user, so neither a
+    # 304 nor the cached fragments below can answer for someone else's chat
+    list_key, chat_key = chat_list_version_key(user.id), chat_version_key(chat_id)
+    try:
+        versions = await _content_versions(ioc, [list_key], user=user, chat_id=chat_id)
+    except ChatNotFoundError:
         return HTMLResponse("Not found", status_code=404)
 
-    # Chat view
-    chat = _CHATS[chat_id]
-    chat_html = templates.get_template("partials/chat_view.html").render(
-        request=request,
-        chat_id=chat_id,
-        messages=chat["messages"],
-        choices=chat["choices"],
-    )
+    etag = weak_etag(TEMPLATE_REVISION, user.id, chat_id, versions[list_key], versions[chat_key])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    # Chat view. Only ever cached after the chat loaded for this user,
+    # so a hit needs no ownership check.
+    view_key = ("chat_view", user.id, chat_id, versions[chat_key])
+    chat_html = fragments.get(view_key)
+    if chat_html is None:
+        try:
+            chat = await _load_chat(ioc, user, chat_id)
+        except ChatNotFoundError:
+            return HTMLResponse("Not found", status_code=404)
+        chat_html = fragments.render(view_key, lambda: _render_chat_view(
+            chat.chat_id,
+            [_message_vm(m) for m in chat.messages],
+            chat.flow_step,
+            chat.older_cursor,
+        ))
 
     # Sidebar (re-render with selected chat)
-    chats = [
-        ChatSummary(id=cid, title=_CHATS[cid]["title"])
-        for cid in _SESSIONS[sk]["chat_ids"]
-    ]
-    chats_html = templates.get_template("partials/chats_list.html").render(
-        request=request,
-        chats=chats,
-        current_chat_id=chat_id,
-    )
+    chats_html = await _chats_list_html(ioc, fragments, user, chat_id, versions[list_key])
 
     # Return chat html + OOB update for sidebar
     body = f"""
@@ -369,77 +567,170 @@ def partial_chat_view(
     </div>
     """
 
-    return HTMLResponse(body)
+    return HTMLResponse(body, headers=caching_headers(etag))
 
 
 @router.post("/chat/{chat_id}/choose", response_class=HTMLResponse)
-def choose(
+async def choose(
     request: Request,
-    chat_id: str,
-    id_provider: Annotated[IdProvider, Depends(session_id_provider)],
-    ioc: Annotated[InteractorFactory, Depends(Stub(InteractorFactory))],
+    chat_id: int,
+    user_provider: Annotated[AsyncUserProvider, Depends(Stub(AsyncUserProvider))],
+    ioc: Annotated[AsyncInteractorFactory, Depends(Stub(AsyncInteractorFactory))],
     choice_id: str = Form(...),
 ):
     try:
-        sk, _user = _require_authenticated_session(request, id_provider, ioc)
-    except (RuntimeError, AuthenticationError):
+        user = await _require_user(user_provider, ioc)
+    except AuthenticationError:
         return RedirectResponse("/login", status_code=303)
 
-    if chat_id not in _SESSIONS[sk]["chat_ids"]:
+    try:
+        chat = await _load_chat(ioc, user, chat_id, limit=0)
+    except ChatNotFoundError:
         return HTMLResponse("Not found", status_code=404)
 
-    chat = _CHATS[chat_id]
-
-    allowed = {c.id: c for c in chat["choices"]}
+    allowed = {c.id: c for c in _choices(chat.flow_step)}
     if choice_id not in allowed:
         return HTMLResponse("Invalid choice", status_code=400)
 
-    picked = allowed[choice_id]
-    chat["messages"].append(MessageVM(role="user", kind="user_choice", text=picked.label))
+    messages, flow_step = _next_turn(chat.flow_step, allowed[choice_id])
+    try:
+        async with ioc.append_chat_messages() as append_chat_messages:
+            appended = await append_chat_messages(AppendChatMessagesCommand(
+                user_id=user.id,
+                chat_id=chat_id,
+                messages=messages,
+                flow_step=flow_step,
+                expected_flow_step=chat.flow_step,
+            ))
+    except InvalidChatActionError:
+        # a double click or a retried POST: the first one already took this
+        # turn, and htmx leaves the page alone on a 4xx
+        return HTMLResponse("Chat has moved on", status_code=409)
+
+    # Only the new turn goes over the wire: buttons replace #chat-actions,
+    # messages are appended to the history already on the page
+    actions_html = templates.get_template("partials/chat_actions.html").render(
+        request=request,
+        chat_id=chat_id,
+        choices=_choices(flow_step),
+        streaming=flow_step == _STREAMING_STEP,
+    )
+    messages_html = templates.get_template("partials/chat_messages.html").render(
+        request=request,
+        messages=[_message_vm(m) for m in appended.messages],
+    )
+    if flow_step == _STREAMING_STEP:
+        messages_html += templates.get_template("partials/assistant_stream.html").render(
+            request=request,
+            chat_id=chat_id,
+        )
+
+    body = f"""
+    {actions_html}
 
-    # demo next step (replace with your application interactor)
-    if choice_id.startswith("topic_"):
-        chat["messages"].append(MessageVM(
-            role="assistant",
-            kind="question",
-            text=f"Great. Start the test for “{picked.label}”?"
-        ))
-        chat["choices"] = [
-            ChoiceVM(id="start_test_yes", label="Yes"),
-            ChoiceVM(id="start_test_no", label="No"),
-        ]
-    elif choice_id == "start_test_yes":
-        chat["messages"].append(MessageVM(
-            role="assistant",
-            kind="question",
-            text="Q1) 1/2 + 1/4 = ?"
-        ))
-        chat["choices"] = [
-            ChoiceVM(id="a", label="3/4"),
-            ChoiceVM(id="b", label="2/6"),
-            ChoiceVM(id="c", label="1/6"),
-        ]
-    elif choice_id in {"a", "b", "c"}:
-        is_correct = (choice_id == "a")
-        chat["messages"].append(MessageVM(
-            role="assistant",
-            kind="feedback",
-            text=("✅ Correct!" if is_correct else "❌ Incorrect. The answer is 3/4.")
-        ))
-        chat["messages"].append(MessageVM(
-            role="assistant",
-            kind="info",
-            text="(Demo) Test finished. Chat deactivated."
-        ))
-        chat["choices"] = []  # no more buttons
+    <div hx-swap-oob="beforeend:#chat-messages">
+      {messages_html}
+    </div>
+    """
+
+    return HTMLResponse(body)
 
+
+@router.get("/partials/chat/{chat_id}/messages", response_class=HTMLResponse)
+async def partial_older_messages(
+    request: Request,
+    chat_id: int,
+    before_created_at: datetime,
+    before_id: int,
+    user_provider: Annotated[AsyncUserProvider, Depends(Stub(AsyncUserProvider))],
+    ioc: Annotated[AsyncInteractorFactory, Depends(Stub(AsyncInteractorFactory))],
+):
+    try:
+        user = await _require_user(user_provider, ioc)
+    except AuthenticationError:
+        return RedirectResponse("/login", status_code=303)
+
+    before = MessageCursor(created_at=before_created_at, id=before_id)
+    try:
+        chat = await _load_chat(ioc, user, chat_id, before=before)
+    except ChatNotFoundError:
+        return HTMLResponse("Not found", status_code=404)
+
+    # Replaces the loader it was triggered from: next loader + one older page
     return templates.TemplateResponse(
-        "partials/chat_view.html",
+        "partials/older_page.html",
         {
             "request": request,
             "chat_id": chat_id,
-            "messages": chat["messages"],
-            "choices": chat["choices"],
+            "messages": [_message_vm(m) for m in chat.messages],
+            "older_cursor": chat.older_cursor,
         },
-        headers={"HX-Trigger": "refresh-chats"},  # refresh sidebar if you want
     )
+
+
+@router.get("/chat/{chat_id}/stream")
+async def stream_reply(
+    request: Request,
+    chat_id: int,
+    user_provider: Annotated[AsyncUserProvider, Depends(Stub(AsyncUserProvider))],
+    ioc: Annotated[AsyncInteractorFactory, Depends(Stub(AsyncInteractorFactory))],
+    llm: Annotated[LlmClient, Depends(Stub(LlmClient))],
+):
+    # 204 tells EventSource not to reconnect
+    try:
+        user = await _require_user(user_provider, ioc)
+        chat = await _load_chat(ioc, user, chat_id, limit=_PROMPT_HISTORY)
+    except (AuthenticationError, ChatNotFoundError):
+        return Response(status_code=204)
+    if chat.flow_step != _STREAMING_STEP:
+        return Response(status_code=204)
+
+    completion = _explanation_request(chat.messages)
+
+    async def events():
+        parts: list[str] = []
+        try:
+            async for chunk in llm.stream(completion):
+                parts.append(chunk)
+                yield sse_event("token", str(escape(chunk)))
+        except LlmBackendError:
+            # nothing stored: the chat stays at the streaming step and
+            # reopening it retries
+            yield sse_event("done", templates.get_template("partials/chat_messages.html").render(
+                request=request,
+                messages=[MessageVM(
+                    role="assistant",
+                    kind="info",
+                    text="The assistant is unavailable right now. Reopen the chat to retry.",
+                )],
+            ))
+            return
+
+        # the whole reply is stored in one write once the stream is complete
+        try:
+            async with ioc.append_chat_messages() as append_chat_messages:
+                appended = await append_chat_messages(AppendChatMessagesCommand(
+                    user_id=user.id,
+                    chat_id=chat_id,
+                    messages=_explanation_messages("".join(parts)),
+                    flow_step="finished",
+                    expected_flow_step=_STREAMING_STEP,
+                ))
+            stored = appended.messages
+        except InvalidChatActionError:
+            # another stream for this chat finished first and stored its reply
+            stored = []
+
+        messages_html = templates.get_template("partials/chat_messages.html").render(
+            request=request,
+            messages=[_message_vm(m) for m in stored],
+        )
+        actions_html = templates.get_template("partials/chat_actions.html").render(
+            request=request,
+            chat_id=chat_id,
+            choices=_choices("finished"),
+            oob=True,
+        )
+        yield sse_event("done", messages_html + actions_html)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
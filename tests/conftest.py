@@ -0,0 +1,62 @@
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+
+from adapters.database.mappings import metadata
+from adapters.database.sqlalchemy import QueryMonitor, make_engine, make_session_factory
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture
+def sqlite_engine():
+    """In-memory sqlite with the full schema and the app's QueryMonitor installed."""
+    # sqlite:// keeps one connection per thread: every session sees the same database
+    engine = make_engine("sqlite://", query_monitor=QueryMonitor())
+    metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(sqlite_engine):
+    with make_session_factory(sqlite_engine)() as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    """
+    Postgres for tests that depend on the planner or on Postgres SQL.
+    Set TEST_POSTGRES_URI (postgresql+psycopg2://...) to run them.
+    """
+    uri = os.environ.get("TEST_POSTGRES_URI")
+    if not uri:
+        pytest.skip("TEST_POSTGRES_URI is not set")
+    engine = create_engine(uri)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def pg_schema(pg_engine):
+    """A connection with the full schema created in a throwaway Postgres schema."""
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    with pg_engine.connect() as conn:
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        conn.execute(text(f"SET search_path TO {schema}"))
+        metadata.create_all(conn)
+        conn.commit()
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            conn.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+            conn.commit()
@@ -0,0 +1,77 @@
+"""Rows for the test/spec/attempt graph, inserted through Core."""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Connection
+
+from adapters.database.mappings import (
+    attempt_answers_table, attempt_selected_options_table, chat_sessions_table,
+    open_answer_keys_table, question_options_table, test_attempts_table,
+    test_questions_table, test_specs_table, tests_table, users_table,
+)
+from domain.models.enums import AttemptStatus, ChatKind, Difficulty, QuestionType, UserRole
+
+PUBLISHED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class Seeded:
+    spec_id: int
+    test_id: int
+    attempt_id: int
+
+
+def _insert(conn: Connection, table, **values) -> int:
+    return conn.execute(insert(table).values(**values)).inserted_primary_key[0]
+
+
+def seed_test(
+        conn: Connection,
+        questions: int,
+        published: bool = True,
+        active: bool = True,
+        email: str = "teacher@example.com",
+) -> Seeded:
+    """
+    A spec and its test with `questions` questions, cycling single
+    choice, multi choice and open; plus a submitted attempt answering
+    all of them, with a review chat.
+    """
+    teacher_id = _insert(conn, users_table, email=email, password_hash="x", role=UserRole.TEACHER)
+    student_id = _insert(conn, users_table, email="s-" + email, password_hash="x", role=UserRole.STUDENT)
+    spec_id = _insert(
+        conn, test_specs_table,
+        teacher_id=teacher_id, name="Fractions", topic="fractions", grade=7, difficulty=Difficulty.EASY,
+    )
+    test_id = _insert(
+        conn, tests_table,
+        spec_id=spec_id, is_active=active, published_at=PUBLISHED_AT if published else None,
+    )
+    chat_id = _insert(conn, chat_sessions_table, user_id=student_id, kind=ChatKind.TEST_REVIEW)
+    attempt_id = _insert(
+        conn, test_attempts_table,
+        test_id=test_id, student_id=student_id, status=AttemptStatus.SUBMITTED, review_chat_session_id=chat_id,
+    )
+
+    kinds = [QuestionType.SINGLE_CHOICE, QuestionType.MULTI_CHOICE, QuestionType.OPEN]
+    for position in range(1, questions + 1):
+        kind = kinds[(position - 1) % len(kinds)]
+        question_id = _insert(
+            conn, test_questions_table,
+            spec_id=spec_id, test_id=test_id, type=kind, question_text=f"Q{position}", position=position,
+        )
+        answer_id = _insert(conn, attempt_answers_table, attempt_id=attempt_id, question_id=question_id)
+        if kind == QuestionType.OPEN:
+            _insert(conn, open_answer_keys_table, question_id=question_id, expected_answer="3/4")
+            continue
+        for option in range(1, 4):
+            option_id = _insert(
+                conn, question_options_table,
+                question_id=question_id, option_text=f"O{option}", is_correct=option == 1, position=option,
+            )
+            if option == 1:
+                conn.execute(insert(attempt_selected_options_table).values(
+                    attempt_answer_id=answer_id, option_id=option_id,
+                ))
+    return Seeded(spec_id=spec_id, test_id=test_id, attempt_id=attempt_id)
@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import select
+
+from adapters.database.content_version_db import ContentVersionGateway
+from adapters.database.mappings import chat_sessions_table
+from application.common.content_version import chat_list_version_key, chat_version_key
+from application.get_content_versions import GetContentVersions, GetContentVersionsQuery
+from domain.exceptions.chat import ChatNotFoundError
+from seed import seed_test
+
+
+@pytest.fixture
+def chat(db_session):
+    seed_test(db_session.connection(), questions=1)
+    db_session.commit()
+    return db_session.execute(select(chat_sessions_table.c.id, chat_sessions_table.c.user_id)).one()
+
+
+def test_chat_version_of_own_chat(db_session, chat):
+    gateway = ContentVersionGateway(db_session)
+    get_versions = GetContentVersions(gateway)
+    query = GetContentVersionsQuery(keys=[chat_list_version_key(chat.user_id)], chat_id=chat.id, user_id=chat.user_id)
+
+    assert get_versions(query)[chat_version_key(chat.id)] == 0
+    gateway.bump_versions([chat_version_key(chat.id)])
+    assert get_versions(query) == {chat_list_version_key(chat.user_id): 0, chat_version_key(chat.id): 1}
+
+
+@pytest.mark.parametrize("other", [
+    pytest.param(lambda chat: (chat.user_id + 1, chat.id), id="someone_elses"),
+    pytest.param(lambda chat: (chat.user_id, chat.id + 1), id="missing"),
+])
+def test_chat_version_needs_ownership(db_session, chat, other):
+    gateway = ContentVersionGateway(db_session)
+    # a bumped counter must not leak either
+    gateway.bump_versions([chat_version_key(chat.id)])
+    user_id, chat_id = other(chat)
+
+    with pytest.raises(ChatNotFoundError):
+        GetContentVersions(gateway)(GetContentVersionsQuery(keys=[], chat_id=chat_id, user_id=user_id))
@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import select
+
+from adapters.database.attempt_db import AttemptGateway
+from adapters.database.mappings import attempt_answers_table, test_attempts_table
+from adapters.database.sqlalchemy_uow import SqlAlchemyUoW
+from adapters.database.test_db import AnswerKeyGateway
+from adapters.grading.numpy_engine import NumpyGradingEngine
+from application.grade_test_attempts import GradeTestAttempts, GradeTestAttemptsCommand
+from domain.exceptions.test import TestNotFoundError as NotFoundError
+from domain.models.enums import AttemptStatus
+from seed import seed_test
+
+
+def _grade(session, command: GradeTestAttemptsCommand):
+    return GradeTestAttempts(
+        attempt_db_gateway=AttemptGateway(session),
+        test_reader=AnswerKeyGateway(session),
+        grading_engine=NumpyGradingEngine(),
+        uow=SqlAlchemyUoW(session),
+    )(command)
+
+
+def test_grades_submitted_attempts_in_batches(db_session):
+    # single and multi choice answered right, the open answer left blank
+    seeded = seed_test(db_session.connection(), questions=3)
+    db_session.commit()
+
+    first = _grade(db_session, GradeTestAttemptsCommand(test_id=seeded.test_id, batch_size=1))
+    second = _grade(db_session, GradeTestAttemptsCommand(test_id=seeded.test_id, batch_size=1))
+
+    assert (first.graded, first.has_more) == (1, True)
+    assert (second.graded, second.has_more) == (0, False)
+    attempt = db_session.execute(
+        select(test_attempts_table).where(test_attempts_table.c.id == seeded.attempt_id)
+    ).one()
+    assert (attempt.status, attempt.score, attempt.max_score) == (AttemptStatus.GRADED, 2.0, 3.0)
+    assert attempt.graded_at is not None
+    points = db_session.scalars(
+        select(attempt_answers_table.c.points_awarded)
+        .where(attempt_answers_table.c.attempt_id == seeded.attempt_id)
+        .order_by(attempt_answers_table.c.id)
+    ).all()
+    assert points == [1.0, 1.0, 0.0]
+
+
+def test_deactivated_test_still_grades_its_attempts(db_session):
+    # withdrawn after the students submitted
+    seeded = seed_test(db_session.connection(), questions=3, active=False)
+    db_session.commit()
+
+    result = _grade(db_session, GradeTestAttemptsCommand(test_id=seeded.test_id))
+
+    assert result.graded == 1
+    status = db_session.scalar(
+        select(test_attempts_table.c.status).where(test_attempts_table.c.id == seeded.attempt_id)
+    )
+    assert status == AttemptStatus.GRADED
+
+
+def test_draft_is_not_graded(db_session):
+    seeded = seed_test(db_session.connection(), questions=3, published=False)
+    db_session.commit()
+
+    with pytest.raises(NotFoundError):
+        _grade(db_session, GradeTestAttemptsCommand(test_id=seeded.test_id))
+
+
+def test_unknown_test_is_not_found(db_session):
+    with pytest.raises(NotFoundError):
+        _grade(db_session, GradeTestAttemptsCommand(test_id=404))
@@ -0,0 +1,109 @@
+import pytest
+
+from adapters.grading.numpy_engine import MAX_OPTIONS, NumpyGradingEngine, normalize_open_answer
+from application.common.grading import (
+    AnswerKey, KeyOption, KeyQuestion, MultiChoiceCredit, SubmittedAnswer,
+)
+from domain.exceptions.test import InvalidAnswerKeyError
+from domain.models.enums import QuestionType
+
+# single (2 points): 11 is right; multi (4 points): 21 and 22 are right;
+# open (1 point): "Three  Quarters"
+KEY = AnswerKey(test_id=1, questions=(
+    KeyQuestion(1, QuestionType.SINGLE_CHOICE, 2.0, options=(
+        KeyOption(11, True), KeyOption(12, False), KeyOption(13, False),
+    )),
+    KeyQuestion(2, QuestionType.MULTI_CHOICE, 4.0, options=(
+        KeyOption(21, True), KeyOption(22, True), KeyOption(23, False), KeyOption(24, False),
+    )),
+    KeyQuestion(3, QuestionType.OPEN, 1.0, expected_answer="Three  Quarters"),
+))
+
+ANSWERS = [
+    # 100: single right, one right and one wrong pick, open right modulo case/spaces
+    SubmittedAnswer(1, 100, 1, option_ids=(11,)),
+    SubmittedAnswer(2, 100, 2, option_ids=(21, 23)),
+    SubmittedAnswer(3, 100, 3, answer_text="  THREE quarters "),
+    # 101: single wrong, half the right set (plus an option of question 1,
+    # which is ignored), open wrong, an answer to a question outside the key
+    SubmittedAnswer(4, 101, 1, option_ids=(12,)),
+    SubmittedAnswer(5, 101, 2, option_ids=(21, 11)),
+    SubmittedAnswer(6, 101, 3, answer_text="half"),
+    SubmittedAnswer(7, 101, 99, option_ids=(21,)),
+    # 102: only wrong picks
+    SubmittedAnswer(8, 102, 2, option_ids=(23, 24)),
+    # 103: exactly the right set
+    SubmittedAnswer(9, 103, 2, option_ids=(22, 21)),
+    # not in the batch
+    SubmittedAnswer(10, 200, 1, option_ids=(11,)),
+]
+ATTEMPTS = [100, 101, 102, 103, 104]
+
+
+@pytest.mark.parametrize(("credit", "scores", "multi_points"), [
+    (MultiChoiceCredit.ALL_OR_NOTHING, [3.0, 0.0, 0.0, 4.0, 0.0], [0.0, 0.0, 0.0, 4.0]),
+    # (hits - wrong) / right options, clamped at zero
+    (MultiChoiceCredit.PROPORTIONAL, [3.0, 2.0, 0.0, 4.0, 0.0], [0.0, 2.0, 0.0, 4.0]),
+    # share of the four options judged right
+    (MultiChoiceCredit.PER_OPTION, [5.0, 3.0, 0.0, 4.0, 0.0], [2.0, 3.0, 0.0, 4.0]),
+])
+def test_scores_per_credit_mode(credit, scores, multi_points):
+    result = NumpyGradingEngine().grade(KEY, ATTEMPTS, ANSWERS, credit)
+
+    assert [a.attempt_id for a in result.attempts] == ATTEMPTS
+    assert [a.score for a in result.attempts] == scores
+    assert {a.max_score for a in result.attempts} == {7.0}
+    by_id = {a.answer_id: a for a in result.answers}
+    assert [by_id[i].points_awarded for i in (2, 5, 8, 9)] == multi_points
+    # partial credit is never "correct"
+    assert [by_id[i].is_correct for i in (2, 5, 8, 9)] == [False, False, False, True]
+
+
+def test_single_choice_and_open_answers():
+    result = NumpyGradingEngine().grade(KEY, ATTEMPTS, ANSWERS, MultiChoiceCredit.PROPORTIONAL)
+
+    by_id = {a.answer_id: a for a in result.answers}
+    assert (by_id[1].is_correct, by_id[1].points_awarded) == (True, 2.0)
+    assert (by_id[4].is_correct, by_id[4].points_awarded) == (False, 0.0)
+    assert (by_id[3].is_correct, by_id[3].points_awarded) == (True, 1.0)
+    assert (by_id[6].is_correct, by_id[6].points_awarded) == (False, 0.0)
+    # a question outside the key earns nothing, whatever was picked
+    assert (by_id[7].is_correct, by_id[7].points_awarded) == (False, 0.0)
+    # answers of attempts outside the batch are dropped
+    assert 10 not in by_id
+
+
+def test_open_question_without_a_key_never_matches():
+    key = AnswerKey(test_id=1, questions=(KeyQuestion(1, QuestionType.OPEN, 1.0),))
+    answers = [SubmittedAnswer(1, 100, 1, answer_text=""), SubmittedAnswer(2, 100, 1, answer_text=None)]
+
+    result = NumpyGradingEngine().grade(key, [100], answers, MultiChoiceCredit.PROPORTIONAL)
+
+    assert [a.is_correct for a in result.answers] == [False, False]
+    assert result.attempts[0].score == 0.0
+
+
+def test_all_64_option_bits_are_usable():
+    options = tuple(KeyOption(1000 + bit, bit in (0, MAX_OPTIONS - 1)) for bit in range(MAX_OPTIONS))
+    key = AnswerKey(test_id=1, questions=(KeyQuestion(1, QuestionType.MULTI_CHOICE, 1.0, options=options),))
+    answers = [
+        SubmittedAnswer(1, 100, 1, option_ids=(1000, 1000 + MAX_OPTIONS - 1)),
+        SubmittedAnswer(2, 101, 1, option_ids=(1000 + MAX_OPTIONS - 1,)),
+    ]
+
+    result = NumpyGradingEngine().grade(key, [100, 101], answers, MultiChoiceCredit.ALL_OR_NOTHING)
+
+    assert [a.is_correct for a in result.answers] == [True, False]
+
+
+def test_too_many_options_are_rejected():
+    options = tuple(KeyOption(bit, False) for bit in range(MAX_OPTIONS + 1))
+    key = AnswerKey(test_id=1, questions=(KeyQuestion(1, QuestionType.MULTI_CHOICE, 1.0, options=options),))
+
+    with pytest.raises(InvalidAnswerKeyError):
+        NumpyGradingEngine().compile(key)
+
+
+def test_normalize_open_answer():
+    assert normalize_open_answer("  Three\tQUARTERS \n") == "three quarters"
+    assert normalize_open_answer(None) == ""
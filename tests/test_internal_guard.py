@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from presentation.web_api.dependencies.internal import bearer_token_guard
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    router = APIRouter(prefix="/stats", dependencies=[Depends(bearer_token_guard("s3cret"))])
+
+    @router.get("/queries")
+    async def queries():
+        return {"ok": True}
+
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_stats_need_the_bearer_token():
+    client = _client()
+    assert client.get("/stats/queries").status_code == 401
+    assert client.get("/stats/queries", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/stats/queries", headers={"Authorization": "Bearer s3cret"}).json() == {"ok": True}
@@ -0,0 +1,28 @@
+from adapters.llm.cache import completion_cache_key
+from application.common.llm import CompletionRequest, LlmMessage
+from main.bootstrap import make_llm
+from main.config import load_web_config
+
+REQUEST = CompletionRequest(messages=(LlmMessage(role="user", content="What is 1/2 + 1/4?"),))
+
+
+def test_key_depends_on_backend():
+    openrouter = completion_cache_key(REQUEST, "openai/gpt-4o-mini", "openrouter:https://openrouter.ai/api/v1")
+    proxy = completion_cache_key(REQUEST, "openai/gpt-4o-mini", "openrouter:http://proxy.local/v1")
+    fake = completion_cache_key(REQUEST, "openai/gpt-4o-mini", "fake:https://openrouter.ai/api/v1")
+
+    assert len({openrouter, proxy, fake}) == 3
+    assert openrouter == completion_cache_key(REQUEST, "openai/gpt-4o-mini", "openrouter:https://openrouter.ai/api/v1")
+
+
+def test_fake_backend_is_never_cached(monkeypatch):
+    for key, value in {
+        "DB_URI": "sqlite://", "SECRET_KEY": "x", "ALGORITHM": "HS256", "WEB_LOGIN_URL": "x",
+        "ACCESS_TOKEN_EXPIRE_MINUTES": "5", "REFRESH_TOKEN_EXPIRE_DAYS": "5",
+        "LLM_BACKEND": "fake", "LLM_CACHE_ENABLED": "true",
+    }.items():
+        monkeypatch.setenv(key, value)
+
+    llm = make_llm(load_web_config(), db_ioc=None)
+
+    assert llm.cache is None
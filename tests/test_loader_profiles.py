@@ -0,0 +1,72 @@
+"""
+Statement counts per LoadProfile stay fixed as the graph grows: N and 2N
+questions must cost the same. A regression (a new lazy load, a dropped
+selectinload) shows up as a changed count.
+"""
+import pytest
+
+from adapters.database.attempt_db import AttemptGateway
+from adapters.database.sqlalchemy import QueryTrace, current_query_trace
+from adapters.database.test_db import PublishedTestGateway
+from adapters.database.test_spec_db import TestSpecGateway as SpecGateway
+from seed import seed_test
+
+QUESTIONS = 6
+
+
+def _walk_test(test):
+    for question in test.questions:
+        for option in question.options:
+            option.option_text
+
+
+def _walk_spec(spec):
+    _walk_test(spec)
+    for question in spec.questions:
+        question.open_key
+    spec.test
+
+
+def _walk_attempt(attempt):
+    for answer in attempt.answers:
+        answer.question.question_text
+        for selected in answer.selected_options:
+            selected.option_id
+    _walk_test(attempt.test)
+    for question in attempt.test.questions:
+        question.open_key
+
+
+def _walk_review(attempt):
+    _walk_attempt(attempt)
+    attempt.review_chat_session.kind
+
+
+PROFILES = [
+    pytest.param(lambda s, ids: PublishedTestGateway(s).get_test(ids.test_id), _walk_test, 3, id="take_test"),
+    pytest.param(lambda s, ids: AttemptGateway(s).get_attempt_for_grading(ids.attempt_id), _walk_attempt, 5, id="grade"),
+    pytest.param(lambda s, ids: AttemptGateway(s).get_attempt_for_review(ids.attempt_id), _walk_review, 5, id="review"),
+    pytest.param(lambda s, ids: SpecGateway(s).get_spec_with_questions(ids.spec_id), _walk_spec, 3, id="spec_editor"),
+]
+
+
+def _count_statements(session, load, walk, ids) -> int:
+    session.expunge_all()
+    trace = QueryTrace()
+    token = current_query_trace.set(trace)
+    try:
+        loaded = load(session, ids)
+        walk(loaded)
+    finally:
+        current_query_trace.reset(token)
+    return trace.statements
+
+
+@pytest.mark.parametrize(("load", "walk", "expected"), PROFILES)
+def test_statement_count_is_fixed(db_session, load, walk, expected):
+    small = seed_test(db_session.connection(), questions=QUESTIONS, email="n@example.com")
+    large = seed_test(db_session.connection(), questions=2 * QUESTIONS, email="2n@example.com")
+    db_session.commit()
+
+    assert _count_statements(db_session, load, walk, small) == expected
+    assert _count_statements(db_session, load, walk, large) == expected
@@ -0,0 +1,79 @@
+import hashlib
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import insert, select
+
+from adapters.auth.passwords import PasswordConfig, ScryptPasswordHasher
+from adapters.database.mappings import sessions_table, users_table
+from adapters.database.session_db import SessionGateway
+from adapters.database.sqlalchemy_uow import SqlAlchemyUoW
+from adapters.database.user_db import UserGateway
+from application.login_student import LoginStudent, LoginStudentCommand
+from application.register_student import RegisterStudent, RegisterStudentCommand
+from domain.models.enums import UserRole
+
+
+class RecordingHasher(ScryptPasswordHasher):
+    """Notes whether the session held a transaction while the KDF ran."""
+
+    def __init__(self, session):
+        super().__init__(PasswordConfig(scrypt_log_n=4))
+        self.session = session
+        self.in_transaction: list[bool] = []
+
+    def hash(self, password: str) -> str:
+        self.in_transaction.append(self.session.in_transaction())
+        return super().hash(password)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        self.in_transaction.append(self.session.in_transaction())
+        return super().verify(password, password_hash)
+
+
+def _interactor(cls, session, hasher):
+    return cls(
+        user_db_gateway=UserGateway(session),
+        session_db_gateway=SessionGateway(session),
+        password_hasher=hasher,
+        session_ttl=timedelta(days=1),
+        uow=SqlAlchemyUoW(session),
+    )
+
+
+def test_login_hashes_outside_the_transaction(db_session):
+    # a legacy SHA-256 hash: verified, then upgraded in the same call
+    db_session.execute(insert(users_table).values(
+        email="kid@example.com",
+        password_hash=hashlib.sha256(b"secret").hexdigest(),
+        role=UserRole.STUDENT,
+    ))
+    db_session.commit()
+    hasher = RecordingHasher(db_session)
+
+    result = _interactor(LoginStudent, db_session, hasher)(LoginStudentCommand("kid@example.com", "secret"))
+
+    assert hasher.in_transaction == [False, False]
+    stored = db_session.scalar(select(users_table.c.password_hash))
+    assert stored.startswith("scrypt$")
+    assert db_session.scalar(select(sessions_table.c.session_key)) == result.session_key
+
+
+def test_register_hashes_outside_the_transaction(db_session):
+    hasher = RecordingHasher(db_session)
+
+    result = _interactor(RegisterStudent, db_session, hasher)(
+        RegisterStudentCommand(full_name="Kid", email="kid@example.com", password="secret", grade=7)
+    )
+
+    assert hasher.in_transaction == [False]
+    assert db_session.scalar(select(users_table.c.id)) == result.user_id
+
+
+def test_release_refuses_pending_changes(db_session):
+    uow = SqlAlchemyUoW(db_session)
+    db_session.execute(insert(users_table).values(email="a@example.com", password_hash="x", role=UserRole.STUDENT))
+    UserGateway(db_session).get_user_by_email("a@example.com").full_name = "A"
+
+    with pytest.raises(RuntimeError):
+        uow.release()
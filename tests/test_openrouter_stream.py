@@ -0,0 +1,51 @@
+import asyncio
+
+import httpx
+import pytest
+
+from adapters.llm.openrouter import OpenRouterClient
+from application.common.llm import CompletionRequest, LlmBackendError, LlmMessage
+
+REQUEST = CompletionRequest(messages=(LlmMessage(role="user", content="hi"),))
+
+
+def _client(sse_body: str) -> OpenRouterClient:
+    client = OpenRouterClient(api_key="key", model="model")
+    client._client = httpx.AsyncClient(
+        base_url="https://llm.test",
+        transport=httpx.MockTransport(lambda request: httpx.Response(
+            200, text=sse_body, headers={"content-type": "text/event-stream"},
+        )),
+    )
+    return client
+
+
+async def _collect(client: OpenRouterClient) -> list[str]:
+    try:
+        return [chunk async for chunk in client.stream(REQUEST)]
+    finally:
+        await client.aclose()
+
+
+def test_stream_yields_content():
+    body = (
+        ': keep-alive\n\n'
+        'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n'
+        'data: {"choices": [{"delta": {}}]}\n\n'
+        'data: {"choices": [{"delta": {"content": "lo"}}]}\n\n'
+        'data: [DONE]\n\n'
+    )
+    assert asyncio.run(_collect(_client(body))) == ["Hel", "lo"]
+
+
+@pytest.mark.parametrize("line", [
+    "data: {not json",
+    'data: ["a list"]',
+    "data: 42",
+    'data: {"error": "plain string"}',
+    'data: {"error": {"message": "overloaded"}}',
+])
+def test_malformed_chunk_raises_backend_error(line):
+    body = f'data: {{"choices": [{{"delta": {{"content": "ok"}}}}]}}\n\n{line}\n\n'
+    with pytest.raises(LlmBackendError):
+        asyncio.run(_collect(_client(body)))
@@ -0,0 +1,41 @@
+import pytest
+
+from adapters.cache.compiled_test_cache import CachedCompiledTestGateway, CompiledTestCache
+from adapters.database.test_db import PublishedTestGateway
+from application.load_test import LoadTest, LoadTestQuery
+from domain.exceptions.test import TestNotFoundError as NotFoundError
+from seed import seed_test
+
+
+def _seed(db_session, **kwargs) -> int:
+    test_id = seed_test(db_session.connection(), questions=3, **kwargs).test_id
+    db_session.commit()
+    return test_id
+
+
+def test_published_test_is_compiled_and_cached(db_session):
+    test_id = _seed(db_session)
+    cache = CompiledTestCache(max_size=10)
+    gateway = CachedCompiledTestGateway(PublishedTestGateway(db_session), cache)
+
+    test = LoadTest(gateway)(LoadTestQuery(test_id=test_id))
+
+    assert [q.text for q in test.questions] == ["Q1", "Q2", "Q3"]
+    assert cache.get(test_id, test.version) is test
+
+
+@pytest.mark.parametrize("state", [
+    pytest.param(dict(published=False), id="draft"),
+    pytest.param(dict(active=False), id="deactivated"),
+])
+def test_unpublished_test_is_not_served_or_cached(db_session, state):
+    test_id = _seed(db_session, **state)
+    gateway = PublishedTestGateway(db_session)
+    cache = CompiledTestCache(max_size=10)
+
+    assert gateway.get_test_version(test_id) is None
+    assert gateway.get_compiled_test(test_id) is None
+    assert gateway.get_test(test_id) is None
+    with pytest.raises(NotFoundError):
+        LoadTest(CachedCompiledTestGateway(gateway, cache))(LoadTestQuery(test_id=test_id))
+    assert cache.stats().size == 0
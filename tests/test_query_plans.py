@@ -0,0 +1,111 @@
+"""
+The lookup indexes of migration 3126c3fca852 (and later ones) are used
+by the queries they were added for.
+
+Tables are empty, so sequential scans are disabled: the question is
+whether the planner *can* answer the query from the index, not which
+plan is cheapest on no data.
+"""
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+from adapters.database.mappings import (
+    chat_messages_table, chat_sessions_table, jobs_table, question_options_table,
+    sessions_table, test_attempts_table, test_questions_table,
+)
+from domain.models.enums import JobStatus
+
+NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+CASES = [
+    pytest.param(
+        select(chat_messages_table.c.id)
+        .where(chat_messages_table.c.session_id == 1)
+        .order_by(chat_messages_table.c.created_at.desc(), chat_messages_table.c.id.desc())
+        .limit(30),
+        "ix_chat_messages_session_id_created_at",
+        id="chat history page",
+    ),
+    pytest.param(
+        select(chat_sessions_table.c.id)
+        .where(chat_sessions_table.c.user_id == 1)
+        .order_by(chat_sessions_table.c.created_at.desc())
+        .limit(50),
+        "ix_chat_sessions_user_id_created_at",
+        id="chat list",
+    ),
+    pytest.param(
+        select(test_attempts_table.c.id)
+        .where(test_attempts_table.c.student_id == 1)
+        .order_by(test_attempts_table.c.started_at.desc())
+        .limit(20),
+        "ix_test_attempts_student_id_started_at",
+        id="attempt history",
+    ),
+    pytest.param(
+        select(test_questions_table.c.id)
+        .where(test_questions_table.c.test_id == 1)
+        .order_by(test_questions_table.c.position),
+        "ix_test_questions_test_id_position",
+        id="questions of a test",
+    ),
+    pytest.param(
+        select(test_questions_table.c.id)
+        .where(test_questions_table.c.spec_id == 1)
+        .order_by(test_questions_table.c.position),
+        "ix_test_questions_spec_id_position",
+        id="questions of a spec",
+    ),
+    pytest.param(
+        select(question_options_table.c.id)
+        .where(question_options_table.c.question_id.in_([1, 2, 3]))
+        .order_by(question_options_table.c.question_id, question_options_table.c.position),
+        "ix_question_options_question_id_position",
+        id="options of questions",
+    ),
+    pytest.param(
+        select(sessions_table.c.id).where(sessions_table.c.user_id == 1),
+        "ix_user_sessions_user_id",
+        id="sessions of a user",
+    ),
+    pytest.param(
+        select(sessions_table.c.id).where(sessions_table.c.expires_at < NOW).limit(1000),
+        "ix_user_sessions_expires_at",
+        id="expired sessions",
+    ),
+    pytest.param(
+        select(sessions_table.c.id).where(sessions_table.c.revoked_at < NOW).limit(1000),
+        "ix_user_sessions_revoked_at",
+        id="revoked sessions",
+    ),
+    pytest.param(
+        select(jobs_table.c.id)
+        .where(
+            jobs_table.c.kind == "generate_test",
+            jobs_table.c.status == JobStatus.QUEUED,
+            jobs_table.c.run_after <= NOW,
+        )
+        .order_by(jobs_table.c.run_after)
+        .limit(1),
+        "ix_jobs_kind_status_run_after",
+        id="job claim",
+    ),
+]
+
+
+def _index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        names |= _index_names(child)
+    return names
+
+
+@pytest.mark.parametrize(("stmt", "index"), CASES)
+def test_query_uses_index(pg_schema, stmt, index):
+    sql = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    pg_schema.execute(text("SET LOCAL enable_seqscan = off"))
+    [plan] = pg_schema.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+    assert index in _index_names(plan["Plan"]), plan